@@ -10,13 +10,20 @@ from pathlib import Path
 import csv
 import io
 
+from dotenv import load_dotenv
+
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
+# Before the src imports: their settings are read from the environment at import.
+load_dotenv()
 
-from ingestion.chunker import chunk_text
+from ingestion.chunk_table import ChunkTable
+from retrieval.embedding_cache import EmbeddingCache
 from retrieval.pathway_store import PathwayStore
+from retrieval.store_file import chunks_fingerprint, prune_stores
 from reasoning.claim_extractor import extract_claims
-from reasoning.claim_validator import validate_claim
+from reasoning.claim_validator import CascadeBackend, get_cache, make_backend, run
+from reasoning.evidence_compressor import compress_evidence
 from reasoning.contradiction_score import contradiction_score
 from reasoning.decision_engine import final_decision
 from reasoning.timeline_builder import build_timeline
@@ -48,6 +55,51 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+@st.cache_resource
+def get_embedding_cache():
+    """Process-wide embedding cache shared by every session and rerun."""
+    return EmbeddingCache()
+
+
+def make_chunks(text, chunking, chunk_size, overlap):
+    if chunking == "sentences":
+        return ChunkTable.from_structure(text, chunk_size=chunk_size, overlap=overlap)
+    return ChunkTable.from_text(text, chunk_size=chunk_size, overlap=overlap)
+
+
+# Each story and chunking setting saves its own store; only this many of the
+# most recently used are kept.
+MAX_SAVED_STORES = int(os.getenv("CHRONOREASON_APP_STORES", "8"))
+
+
+def build_store(chunks, precision="float32", rerank=0):
+    """Memory-map a saved store for these chunks, indexing them on first use."""
+    directory = os.path.join(".cache", "stores", "app")  # main.py and ingest.py stores stay put
+    path = os.path.join(directory, f"{chunks_fingerprint(chunks)}.store")
+    store = PathwayStore.load_or_build(
+        path, chunks, cache=get_embedding_cache(),
+        index_options={"precision": precision, "rerank": rerank},
+    )
+    os.utime(path)  # mark it recently used, so pruning keeps it
+    prune_stores(directory, MAX_SAVED_STORES)
+    return store
+
+
+@st.cache_resource
+def get_nli_backend():
+    """Local NLI model, loaded once per process."""
+    return make_backend("nli")
+
+
+def get_validator(kind, claims_per_request, store):
+    if kind == "nli":
+        return get_nli_backend()
+    openai_backend = make_backend("openai", batch_size=claims_per_request)
+    if kind == "cascade":
+        return CascadeBackend(screen=get_nli_backend(), escalate=openai_backend, embed=store.embed)
+    return openai_backend
+
+
 # Initialize session state
 if "processed" not in st.session_state:
     st.session_state.processed = False
@@ -82,6 +134,59 @@ with st.sidebar:
         step=50
     )
     
+    chunking = st.selectbox(
+        "Chunking",
+        ["words", "sentences"],
+        help="Words cuts every chunk size words; sentences packs whole sentences up to the "
+             "chunk size and never crosses a chapter"
+    )
+    
+    retrieval_mode = st.selectbox(
+        "Retrieval Mode",
+        ["dense", "hybrid", "lexical"],
+        help="Hybrid adds BM25 keyword matching, which helps with proper nouns"
+    )
+    
+    index_precision = st.selectbox(
+        "Index Precision",
+        ["float32", "float16", "int8"],
+        help="Compressed copies of the embeddings to scan; float16 halves and int8 quarters "
+             "the index's memory at a small cost in ranking accuracy"
+    )
+    
+    index_rerank = st.number_input(
+        "Index Rerank",
+        min_value=0,
+        max_value=16,
+        value=0,
+        help="Re-score this many times the top results with the full-precision embeddings "
+             "(0 = rank by the compressed scores alone)"
+    )
+    
+    validator_backend = st.selectbox(
+        "Validator",
+        ["openai", "nli", "cascade"],
+        help="OpenAI chat model, a local NLI cross-encoder that needs no API key, "
+             "or the NLI model with OpenAI only for claims it is unsure about"
+    )
+    
+    claims_per_request = st.number_input(
+        "Claims per Request",
+        min_value=1,
+        max_value=20,
+        value=1,
+        help="Above 1, claims that retrieved the same chunks are validated in one LLM request"
+    )
+    
+    evidence_budget = st.number_input(
+        "Evidence Token Budget",
+        min_value=0,
+        max_value=4000,
+        value=0,
+        step=64,
+        help="Keep only the sentences most relevant to each claim, up to this many tokens (0 = whole chunks)"
+    )
+    
     threshold = st.slider(
         "Consistency Threshold",
         min_value=0.0,
@@ -97,6 +202,14 @@ with st.sidebar:
         "💡 **Tip:** Higher threshold = stricter consistency check"
     )
 
+    validation_cache = get_cache()
+    if validation_cache is not None:
+        cache_stats = validation_cache.stats()
+        st.caption(
+            f"Validation cache: {cache_stats['entries']} labels, "
+            f"{cache_stats['hit_rate']:.0%} hit rate"
+        )
+
 # Main content
 col1, col2 = st.columns([3, 1])
 with col1:
@@ -166,18 +279,27 @@ if mode == "Quick Analysis":
         if backstory and story_content:
             with st.spinner("Processing..."):
                 try:
-                    chunks = chunk_text(story_content, chunk_size=chunk_size, overlap=overlap)
-                    store = PathwayStore(chunks)
+                    chunks = make_chunks(story_content, chunking, chunk_size, overlap)
+                    store = build_store(chunks, index_precision, index_rerank)
                     claims = extract_claims(backstory)
                     
-                    validations = []
-                    evidence_list = []
-                    
-                    for claim in claims:
-                        evidence = store.search(claim, top_k=3)
-                        evidence_list.append(evidence)
-                        result = validate_claim(claim, " ".join(evidence))
-                        validations.append(result)
+                    evidence_ids = [
+                        ids for ids, _ in store.search_ids(claims, top_k=3, mode=retrieval_mode)
+                    ]
+                    evidence_list = [[chunks[i] for i in ids] for ids in evidence_ids]
+                    prompt_evidence = evidence_list
+                    if evidence_budget:
+                        prompt_evidence = compress_evidence(
+                            claims, evidence_list, store.embed, evidence_budget
+                        )
+                    validator = get_validator(validator_backend, claims_per_request, store)
+                    validations = run(validator.validate(claims, prompt_evidence))
+                    if isinstance(validator, CascadeBackend):
+                        cascade_stats = validator.stats()
+                        st.caption(
+                            f"Cascade: {cascade_stats['calls_avoided']} of "
+                            f"{cascade_stats['claims']} claims needed no LLM call"
+                        )
                     
                     score = contradiction_score(validations)
                     decision = final_decision(score, threshold=threshold)
@@ -188,6 +310,8 @@ if mode == "Quick Analysis":
                         "claims": claims,
                         "validations": validations,
                         "evidence": evidence_list,
+                        "evidence_spans": [[chunks.span(i) for i in ids] for ids in evidence_ids],
+                        "story_length": len(story_content),
                     }
                     st.session_state.processed = True
                     st.rerun()
@@ -223,18 +347,27 @@ elif mode == "Detailed Analysis":
         if backstory and story_content:
             with st.spinner("Processing..."):
                 try:
-                    chunks = chunk_text(story_content, chunk_size=chunk_size, overlap=overlap)
-                    store = PathwayStore(chunks)
+                    chunks = make_chunks(story_content, chunking, chunk_size, overlap)
+                    store = build_store(chunks, index_precision, index_rerank)
                     claims = extract_claims(backstory)
                     
-                    validations = []
-                    evidence_list = []
-                    
-                    for claim in claims:
-                        evidence = store.search(claim, top_k=3)
-                        evidence_list.append(evidence)
-                        result = validate_claim(claim, " ".join(evidence))
-                        validations.append(result)
+                    evidence_ids = [
+                        ids for ids, _ in store.search_ids(claims, top_k=3, mode=retrieval_mode)
+                    ]
+                    evidence_list = [[chunks[i] for i in ids] for ids in evidence_ids]
+                    prompt_evidence = evidence_list
+                    if evidence_budget:
+                        prompt_evidence = compress_evidence(
+                            claims, evidence_list, store.embed, evidence_budget
+                        )
+                    validator = get_validator(validator_backend, claims_per_request, store)
+                    validations = run(validator.validate(claims, prompt_evidence))
+                    if isinstance(validator, CascadeBackend):
+                        cascade_stats = validator.stats()
+                        st.caption(
+                            f"Cascade: {cascade_stats['calls_avoided']} of "
+                            f"{cascade_stats['claims']} claims needed no LLM call"
+                        )
                     
                     score = contradiction_score(validations)
                     decision = final_decision(score, threshold=threshold)
@@ -245,6 +378,8 @@ elif mode == "Detailed Analysis":
                         "claims": claims,
                         "validations": validations,
                         "evidence": evidence_list,
+                        "evidence_spans": [[chunks.span(i) for i in ids] for ids in evidence_ids],
+                        "story_length": len(story_content),
                     }
                     st.session_state.processed = True
                     st.rerun()
@@ -276,18 +411,27 @@ else:
         if backstory and story_content:
             with st.spinner("Processing..."):
                 try:
-                    chunks = chunk_text(story_content, chunk_size=chunk_size, overlap=overlap)
-                    store = PathwayStore(chunks)
+                    chunks = make_chunks(story_content, chunking, chunk_size, overlap)
+                    store = build_store(chunks, index_precision, index_rerank)
                     claims = extract_claims(backstory)
                     
-                    validations = []
-                    evidence_list = []
-                    
-                    for claim in claims:
-                        evidence = store.search(claim, top_k=3)
-                        evidence_list.append(evidence)
-                        result = validate_claim(claim, " ".join(evidence))
-                        validations.append(result)
+                    evidence_ids = [
+                        ids for ids, _ in store.search_ids(claims, top_k=3, mode=retrieval_mode)
+                    ]
+                    evidence_list = [[chunks[i] for i in ids] for ids in evidence_ids]
+                    prompt_evidence = evidence_list
+                    if evidence_budget:
+                        prompt_evidence = compress_evidence(
+                            claims, evidence_list, store.embed, evidence_budget
+                        )
+                    validator = get_validator(validator_backend, claims_per_request, store)
+                    validations = run(validator.validate(claims, prompt_evidence))
+                    if isinstance(validator, CascadeBackend):
+                        cascade_stats = validator.stats()
+                        st.caption(
+                            f"Cascade: {cascade_stats['calls_avoided']} of "
+                            f"{cascade_stats['claims']} claims needed no LLM call"
+                        )
                     
                     score = contradiction_score(validations)
                     decision = final_decision(score, threshold=threshold)
@@ -298,6 +442,8 @@ else:
                         "claims": claims,
                         "validations": validations,
                         "evidence": evidence_list,
+                        "evidence_spans": [[chunks.span(i) for i in ids] for ids in evidence_ids],
+                        "story_length": len(story_content),
                     }
                     st.session_state.processed = True
                     st.rerun()
@@ -346,8 +492,13 @@ if st.session_state.processed and st.session_state.results:
                 st.write(f"**Claim:** {claim}")
                 if "evidence" in results and i-1 < len(results["evidence"]):
                     st.write("**Evidence:**")
-                    for ev in results["evidence"][i-1]:
-                        st.caption(f"• {ev[:100]}...")
+                    spans = results.get("evidence_spans", [[]] * len(claims))[i-1]
+                    for j, ev in enumerate(results["evidence"][i-1]):
+                        location = ""
+                        if j < len(spans) and results.get("story_length"):
+                            start, end = spans[j]
+                            location = f" _(story chars {start:,}–{end:,}, {start / results['story_length']:.0%} in)_"
+                        st.caption(f"• {ev[:100]}...{location}")
             
             with col2:
                 if validation == "support":
@@ -356,9 +507,31 @@ if st.session_state.processed and st.session_state.results:
                     st.error(f"❌ {validation.upper()}")
                 else:
                     st.warning(f"⚠️ {validation.upper()}")
+                confidence = getattr(validation, "confidence", None)
+                if confidence is not None:
+                    st.caption(f"Confidence: {confidence:.0%}")
     
     st.divider()
     
+    # Evidence in story order
+    if results.get("evidence_spans") and results.get("story_length"):
+        st.subheader("🕰️ Evidence Timeline")
+        # Each retrieved chunk once, keyed by its span in the story.
+        located = {}
+        for texts, spans in zip(results["evidence"], results["evidence_spans"]):
+            for text, span in zip(texts, spans):
+                located.setdefault(tuple(span), text)
+        timeline = build_timeline(list(located.values()), [start for start, _ in located])
+        st.table([
+            {
+                "Story position": f"{entry['position'] / results['story_length']:.0%}",
+                "Evidence": entry["event"][:200],
+            }
+            for entry in timeline
+        ])
+        
+        st.divider()
+    
     # Statistics
     col1, col2 = st.columns(2)
     
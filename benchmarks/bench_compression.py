@@ -0,0 +1,82 @@
+"""
+Evidence tokens and verdict agreement of compressed evidence against whole chunks.
+
+Retrieves top-k chunks for every claim of the sample backstories, compresses
+them to each token budget and reports evidence size per claim. With
+--validate (needs OPENAI_API_KEY) every configuration is also sent to the
+model, bypassing the validation cache, and its labels compared with the
+uncompressed baseline:
+
+    python benchmarks/bench_compression.py --budgets 1024,512,256 --validate
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from dotenv import load_dotenv
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+load_dotenv()
+
+from ingestion.chunker import chunk_text
+from reasoning.claim_extractor import extract_claims
+from reasoning.claim_validator import run, set_cache, validate_claims
+from reasoning.evidence_compressor import compress_evidence
+from reasoning.token_counter import count_tokens
+from retrieval.embedding_cache import EmbeddingCache
+from retrieval.pathway_store import PathwayStore
+
+SAMPLE = ROOT / "data" / "sample"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--story", default=str(SAMPLE / "In_search_of_the_castaways.txt"))
+    parser.add_argument("--chunk-size", type=int, default=800)
+    parser.add_argument("--overlap", type=int, default=100)
+    parser.add_argument("--top-k", type=int, default=3)
+    parser.add_argument("--budgets", default="1024,512,256,128")
+    parser.add_argument("--validate", action="store_true", help="call the API and compare labels")
+    args = parser.parse_args()
+
+    chunks = chunk_text(Path(args.story).read_text(), chunk_size=args.chunk_size, overlap=args.overlap)
+    store = PathwayStore(chunks, cache=EmbeddingCache(":memory:"))
+    claims = []
+    for path in sorted(SAMPLE.glob("backstory*.txt")):
+        claims.extend(extract_claims(path.read_text()))
+    evidence = [[chunk for chunk, _ in hits] for hits in store.search_many(claims, top_k=args.top_k)]
+    print(f"chunks={len(chunks)} claims={len(claims)} top_k={args.top_k}")
+
+    configs = [("whole chunks", evidence, 0.0)]
+    for budget in (int(b) for b in args.budgets.split(",")):
+        start = time.perf_counter()
+        compressed = compress_evidence(claims, evidence, store.embed, budget)
+        configs.append((f"budget {budget}", compressed, time.perf_counter() - start))
+
+    if args.validate:
+        set_cache(None)
+
+    baseline = None
+    whole_tokens = np.mean([count_tokens(" ".join(e)) for e in evidence])
+    header = f"{'evidence':<16}{'tokens':>12}{'vs whole':>10}{'compress ms':>13}"
+    print(header + (f"{'agree':>8}{'api s':>8}" if args.validate else ""))
+    for label, config_evidence, seconds in configs:
+        tokens = np.mean([count_tokens(" ".join(e)) for e in config_evidence])
+        row = f"{label:<16}{tokens:>12.0f}{tokens / whole_tokens:>10.2f}{seconds * 1000:>13.1f}"
+        if args.validate:
+            start = time.perf_counter()
+            labels = run(validate_claims(claims, config_evidence))
+            api_s = time.perf_counter() - start
+            if baseline is None:
+                baseline = labels
+            agree = np.mean([a == b for a, b in zip(labels, baseline)])
+            row += f"{agree:>8.3f}{api_s:>8.1f}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Corpus embedding throughput (chunks/sec) against worker processes.
+
+Embeds the chunks of the sample novel serially and with growing process
+pools, checking that every parallel result matches the serial one:
+
+    python benchmarks/bench_embedding.py --workers 1,2,4,8 --batch-size 32
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from ingestion.chunker import chunk_text
+from retrieval.embedder import EmbeddingProvider
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--story", default=str(ROOT / "data" / "sample" / "In_search_of_the_castaways.txt"))
+    parser.add_argument("--chunk-size", type=int, default=800)
+    parser.add_argument("--overlap", type=int, default=100)
+    parser.add_argument("--workers", default="1,2,4")
+    parser.add_argument("--batch-size", type=int, default=32)
+    args = parser.parse_args()
+
+    chunks = chunk_text(Path(args.story).read_text(), chunk_size=args.chunk_size, overlap=args.overlap)
+    print(f"chunks={len(chunks)} batch_size={args.batch_size}")
+    print(f"{'workers':>8}{'seconds':>10}{'chunks/s':>11}{'speedup':>9}{'max |diff|':>13}")
+
+    serial = None
+    serial_s = None
+    for workers in (int(w) for w in args.workers.split(",")):
+        provider = EmbeddingProvider(batch_size=args.batch_size, workers=workers)
+        # Warm up model loading (and the pool's workers) outside the timing.
+        provider.encode(chunks[:provider.batch_size * workers * 3])
+        start = time.perf_counter()
+        vectors = provider.encode(chunks)
+        seconds = time.perf_counter() - start
+        provider.close()
+        if serial is None:
+            serial, serial_s = vectors, seconds
+        diff = float(np.max(np.abs(vectors - serial)))
+        print(
+            f"{workers:>8}{seconds:>10.2f}{len(chunks) / seconds:>11.1f}"
+            f"{serial_s / seconds:>9.2f}{diff:>13.2e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Recall@k vs. latency of the approximate IVF index against the exact scan.
+
+Uses synthetic clustered unit vectors so library-scale corpora can be
+simulated without encoding any text:
+
+    python benchmarks/bench_index.py --rows 1000000 --probes 1,4,16,64
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from retrieval.vector_index import ExactIndex, IVFIndex
+
+
+def synthetic_embeddings(rows, dim, clusters, seed=0):
+    """Unit vectors drawn around random topic centres, like chunk embeddings."""
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((clusters, dim)).astype(np.float32)
+    labels = rng.integers(0, clusters, size=rows)
+    data = centres[labels] + 0.8 * rng.standard_normal((rows, dim)).astype(np.float32)
+    data /= np.linalg.norm(data, axis=1, keepdims=True)
+    return data
+
+
+def timed_search(index, queries, top_k):
+    start = time.perf_counter()
+    results = index.search(queries, top_k)
+    return results, (time.perf_counter() - start) / len(queries)
+
+
+def recall(exact_results, approx_results, top_k):
+    hits = sum(
+        len(set(e_ids.tolist()) & set(a_ids.tolist()))
+        for (e_ids, _), (a_ids, _) in zip(exact_results, approx_results)
+    )
+    return hits / (len(exact_results) * top_k)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--lists", type=int, default=None, help="IVF lists (default sqrt(rows))")
+    parser.add_argument("--probes", default="1,4,16,64")
+    args = parser.parse_args()
+
+    data = synthetic_embeddings(args.rows + args.queries, args.dim, clusters=max(16, args.rows // 2000))
+    data, queries = data[:args.rows], data[args.rows:]
+
+    exact = ExactIndex()
+    exact.build(data)
+    exact_results, exact_latency = timed_search(exact, queries, args.top_k)
+    print(f"rows={args.rows} dim={args.dim} queries={args.queries} top_k={args.top_k}")
+    print(f"{'backend':<20}{'recall@k':>10}{'ms/query':>12}{'speedup':>10}")
+    print(f"{'exact':<20}{1.0:>10.3f}{exact_latency * 1e3:>12.3f}{1.0:>10.1f}")
+
+    for n_probe in (int(p) for p in args.probes.split(",")):
+        ivf = IVFIndex(n_lists=args.lists, n_probe=n_probe)
+        start = time.perf_counter()
+        ivf.build(data)
+        build_s = time.perf_counter() - start
+        results, latency = timed_search(ivf, queries, args.top_k)
+        label = f"ivf(probe={n_probe})"
+        print(
+            f"{label:<20}{recall(exact_results, results, args.top_k):>10.3f}"
+            f"{latency * 1e3:>12.3f}{exact_latency / latency:>10.1f}"
+            f"   build {build_s:.1f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Memory, scan throughput and top-k agreement of float16 / int8 embedding
+storage against float32 on the sample novel.
+
+Queries are the claims of the sample backstories plus sentences sampled from
+the novel itself. "resident MiB" is what the index keeps in RAM: its codes,
+plus the float32 matrix when it re-ranks from one held in memory. By default
+the matrix is memory-mapped from a store file, as after PathwayStore.load(),
+so re-ranking only reads the candidate rows ("f32 KiB/q"); --in-ram keeps it
+in memory, as a store built in-process does. The store itself always owns
+the float32 matrix, printed first:
+
+    python benchmarks/bench_precision.py --chunk-size 200 --top-k 5
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from ingestion.chunker import chunk_text
+from reasoning.claim_extractor import extract_claims
+from retrieval.embedder import get_provider
+from retrieval.store_file import read_store, write_store
+from retrieval.vector_index import ExactIndex
+
+SAMPLE = ROOT / "data" / "sample"
+
+
+def load_queries(story, n_sentences, seed=0):
+    queries = []
+    for path in sorted(SAMPLE.glob("backstory*.txt")):
+        queries.extend(extract_claims(path.read_text()))
+    sentences = extract_claims(story)
+    rng = np.random.default_rng(seed)
+    picks = rng.choice(len(sentences), size=min(n_sentences, len(sentences)), replace=False)
+    queries.extend(sentences[i] for i in picks)
+    return queries
+
+
+def resident_bytes(index):
+    """RAM held by the index: codes, plus a float32 matrix kept in memory for re-ranking."""
+    total = index.codes.nbytes
+    matrix = index.embeddings
+    if (matrix is not None and not isinstance(matrix, np.memmap)
+            and not np.shares_memory(matrix, index.codes)):
+        total += matrix.nbytes
+    return total
+
+
+def agreement(reference, results):
+    """Mean fraction of the float32 top-k also returned by the candidate."""
+    overlaps = [
+        len(set(ref_ids.tolist()) & set(ids.tolist())) / max(1, len(ref_ids))
+        for (ref_ids, _), (ids, _) in zip(reference, results)
+    ]
+    return float(np.mean(overlaps))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--story", default=str(SAMPLE / "In_search_of_the_castaways.txt"))
+    parser.add_argument("--chunk-size", type=int, default=200)
+    parser.add_argument("--overlap", type=int, default=20)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--sentences", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=20, help="scans timed per configuration")
+    parser.add_argument("--in-ram", action="store_true", help="re-rank from an in-memory matrix")
+    args = parser.parse_args()
+
+    story = Path(args.story).read_text()
+    chunks = chunk_text(story, chunk_size=args.chunk_size, overlap=args.overlap)
+    provider = get_provider()
+    embeddings = provider.encode(chunks)
+    queries = provider.encode(load_queries(story, args.sentences))
+    print(
+        f"model={provider.model_name} chunks={len(chunks)} dim={embeddings.shape[1]}"
+        f" queries={len(queries)} top_k={args.top_k}"
+    )
+    workdir = tempfile.TemporaryDirectory()
+    if not args.in_ram:
+        path = str(Path(workdir.name) / "bench.store")
+        write_store(path, chunks, embeddings, provider.model_name)
+        _, embeddings, _ = read_store(path)
+    where = "in RAM" if args.in_ram else "memory-mapped"
+    print(f"store float32 matrix: {embeddings.nbytes / 2**20:.2f} MiB, {where}")
+
+    configs = [
+        ("float32", 0), ("float16", 0), ("int8", 0), ("float16", 4), ("int8", 4),
+    ]
+    reference = None
+    row_kib = embeddings.shape[1] * 4 / 1024
+    print(f"{'storage':<16}{'resident MiB':>14}{'f32 KiB/q':>11}{'queries/s':>12}{'top-k agree':>13}")
+    for precision, rerank in configs:
+        index = ExactIndex(precision=precision, rerank=rerank)
+        index.build(embeddings)
+        index.search(queries, args.top_k)  # warm-up
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            results = index.search(queries, args.top_k)
+        qps = args.repeat * len(queries) / (time.perf_counter() - start)
+        if reference is None:
+            reference = results
+        label = precision + (f"+rerank{rerank}" if rerank else "")
+        print(
+            f"{label:<16}{resident_bytes(index) / 2**20:>14.2f}"
+            f"{rerank * args.top_k * row_kib:>11.1f}{qps:>12.0f}"
+            f"{agreement(reference, results):>13.3f}"
+        )
+    workdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Cost of editing a few rows of the indexes against rebuilding them.
+
+Each backend indexes --rows rows, then --delta rows are appended, one row
+is replaced and --delta rows are removed. Every edit is timed as the
+incremental refresh PathwayStore calls and as a full build over the same
+rows. Vector backends use synthetic unit vectors; BM25 indexes word chunks
+of the sample novel, repeated up to --rows:
+
+    python benchmarks/bench_updates.py --rows 200000 --delta 10
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from ingestion.chunker import chunk_text
+from retrieval.lexical_index import BM25Index
+from retrieval.vector_index import ExactIndex, IVFIndex
+
+SAMPLE = ROOT / "data" / "sample"
+
+
+def synthetic_embeddings(rows, dim, clusters, seed=0):
+    """Unit vectors drawn around random topic centres, like chunk embeddings."""
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((clusters, dim)).astype(np.float32)
+    labels = rng.integers(0, clusters, size=rows)
+    data = centres[labels] + 0.8 * rng.standard_normal((rows, dim)).astype(np.float32)
+    data /= np.linalg.norm(data, axis=1, keepdims=True)
+    return data
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    fn(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def vector_edits(make, data, extra, delta):
+    """(edit, incremental s, rebuild s) for append, replace and remove."""
+    index = make()
+    index.build(data)
+    grown = np.vstack([data, extra])
+    timings = [("add", timed(index.refresh, grown), timed(make().build, grown))]
+    replaced = grown.copy()
+    replaced[0] = extra[0]
+    timings.append((
+        "update", timed(index.refresh, replaced, changed=np.array([0])), timed(make().build, replaced)
+    ))
+    removed = np.arange(1, 1 + delta)
+    kept = np.delete(replaced, removed, axis=0)
+    timings.append((
+        "remove", timed(index.refresh, kept, removed=removed), timed(make().build, kept)
+    ))
+    return timings
+
+
+def lexical_edits(chunks, delta):
+    index = BM25Index()
+    index.build(chunks)
+    new = chunks[:delta]
+    grown = chunks + new
+    timings = [("add", timed(index.add, new), timed(BM25Index().build, grown))]
+    replaced = [new[-1]] + grown[1:]
+    timings.append(("update", timed(index.update, 0, new[-1]), timed(BM25Index().build, replaced)))
+    removed = np.arange(1, 1 + delta)
+    kept = replaced[:1] + replaced[1 + delta:]
+    timings.append(("remove", timed(index.remove, removed), timed(BM25Index().build, kept)))
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--delta", type=int, default=10, help="rows added, then removed")
+    parser.add_argument("--story", default=str(SAMPLE / "In_search_of_the_castaways.txt"))
+    args = parser.parse_args()
+
+    data = synthetic_embeddings(args.rows + args.delta, args.dim, clusters=max(16, args.rows // 2000))
+    data, extra = data[:args.rows], data[args.rows:]
+    words = chunk_text(Path(args.story).read_text(encoding="utf-8"), 100, 0)
+    chunks = [words[i % len(words)] for i in range(args.rows)]
+
+    backends = {
+        "exact/float16": lambda: ExactIndex(precision="float16"),
+        "exact/int8": lambda: ExactIndex(precision="int8"),
+        "ivf/float32": lambda: IVFIndex(),
+        "ivf/int8": lambda: IVFIndex(precision="int8"),
+    }
+    print(f"rows={args.rows} dim={args.dim} delta={args.delta}")
+    print(f"{'backend':<16}{'edit':<8}{'refresh ms':>12}{'rebuild ms':>12}{'speedup':>10}")
+    results = [(name, vector_edits(make, data, extra, args.delta)) for name, make in backends.items()]
+    results.append(("bm25", lexical_edits(chunks, args.delta)))
+    for name, timings in results:
+        for edit, incremental, rebuild in timings:
+            print(
+                f"{name:<16}{edit:<8}{incremental * 1e3:>12.2f}{rebuild * 1e3:>12.1f}"
+                f"{rebuild / max(incremental, 1e-9):>10.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
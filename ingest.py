@@ -0,0 +1,63 @@
+"""
+Ingest a directory of books into one persisted store, tagged by source file.
+
+Reading, normalizing and chunking run in a process pool; embedding follows
+through a bounded queue. The saved store can then be searched as a whole or
+narrowed to some books (see CHRONOREASON_STORE / CHRONOREASON_SOURCES in main.py).
+The file always holds float32 embeddings; the index precision is chosen where
+it is loaded (CHRONOREASON_INDEX_PRECISION / CHRONOREASON_INDEX_RERANK):
+
+    python ingest.py data/library --out .cache/stores/library.store --workers 8
+"""
+import argparse
+
+from dotenv import load_dotenv
+
+# Before the src imports: their settings are read from the environment at import.
+load_dotenv()
+
+from src.ingestion.corpus_ingest import ingest_corpus
+from src.retrieval.embedding_cache import EmbeddingCache
+from src.retrieval.pathway_store import PathwayStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("directory")
+    parser.add_argument("--out", default=".cache/stores/corpus.store")
+    parser.add_argument("--pattern", default="*.txt")
+    parser.add_argument("--chunking", choices=("sentences", "words"), default="sentences")
+    parser.add_argument("--chunk-size", type=int, default=800)
+    parser.add_argument("--overlap", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=None, help="default: CPU count")
+    parser.add_argument("--queue", type=int, default=8, help="files chunked ahead of embedding")
+    args = parser.parse_args()
+
+    cache = EmbeddingCache()
+    report = ingest_corpus(
+        args.directory,
+        PathwayStore([], cache=cache),
+        out=args.out,
+        chunk_size=args.chunk_size,
+        overlap=args.overlap,
+        structured=args.chunking == "sentences",
+        pattern=args.pattern,
+        workers=args.workers,
+        queue_size=args.queue,
+    )
+    print(
+        f"{report['files']} files, {report['chunks']} chunks -> {args.out}"
+        f" in {report['wall_s']:.1f}s"
+    )
+    print(f"{'stage':<12}{'busy s':>9}{'amount':>12}{'throughput':>14}")
+    for stage, stats in report["stages"].items():
+        print(
+            f"{stage:<12}{stats['busy_s']:>9.2f}{stats['amount']:>12.1f}"
+            f"{stats['throughput']:>9.1f} {stats['unit']}"
+        )
+    print(f"Embedding waited {report['embed_wait_s']:.2f}s for chunks")
+    print("Embedding cache:", cache.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,29 +1,106 @@
-from src.ingestion.chunker import chunk_text
+import os
+
+from dotenv import load_dotenv
+
+# Before the src imports: their settings are read from the environment at import.
+load_dotenv()
+
+from src.ingestion.chunk_table import ChunkTable
+from src.retrieval.embedding_cache import EmbeddingCache
 from src.retrieval.pathway_store import PathwayStore
+from src.retrieval.vector_index import HierarchicalIndex
 from src.reasoning.claim_extractor import extract_claims
-from src.reasoning.claim_validator import validate_claim
+from src.reasoning.claim_validator import (
+    CascadeBackend,
+    get_cache,
+    get_scheduler,
+    make_backend,
+    run,
+    stream_validations,
+)
 from src.reasoning.contradiction_score import contradiction_score
-from src.reasoning.decision_engine import final_decision
+from src.reasoning.decision_engine import decide_streaming, final_decision
+from src.reasoning.evidence_compressor import compress_evidence
+
+
+def build_store(cache: EmbeddingCache) -> PathwayStore:
+    """The sample novel's store, or a multi-book store written by ingest.py."""
+    # Precision and rerank of the exact index (the hierarchical one is float32).
+    index_options = {
+        "precision": os.getenv("CHRONOREASON_INDEX_PRECISION", "float32"),
+        "rerank": int(os.getenv("CHRONOREASON_INDEX_RERANK", "0")),
+    }
+    if os.getenv("CHRONOREASON_STORE"):
+        return PathwayStore.load(os.environ["CHRONOREASON_STORE"], index_options=index_options)
+    story_path = "data/sample/In_search_of_the_castaways.txt"
+    store_path = ".cache/stores/In_search_of_the_castaways.store"
+    index = "exact"
+    if os.getenv("CHRONOREASON_INDEX", "exact") == "hierarchical":
+        # Sentence-sized chunks, searched chapters first, then paragraphs.
+        chunks = ChunkTable.from_file(story_path, chunk_size=60, overlap=0, structured=True)
+        beams = [int(b) for b in os.getenv("CHRONOREASON_INDEX_BEAMS", "20,200").split(",")]
+        index = HierarchicalIndex([chunks.chapters, chunks.paragraphs], beams)
+        store_path = ".cache/stores/In_search_of_the_castaways.sentences.store"
+    else:
+        # The book is held once; chunks are offsets into it, joined on read.
+        # Sentence chunking also finds chapters and paragraphs in that pass.
+        sentences = os.getenv("CHRONOREASON_CHUNKING", "words") == "sentences"
+        chunks = ChunkTable.from_file(story_path, structured=sentences)
+    return PathwayStore.load_or_build(
+        store_path, chunks, cache=cache, index=index, index_options=index_options
+    )
 
-with open("data/sample/In_search_of_the_castaways.txt") as f:
-    story = f.read()
 
-with open("data/sample/backstory1.txt") as f:
-    backstory = f.read()
+def main():
+    with open("data/sample/backstory1.txt") as f:
+        backstory = f.read()
 
-chunks = chunk_text(story)
-store = PathwayStore(chunks)
-claims = extract_claims(backstory)
+    cache = EmbeddingCache()
+    store = build_store(cache)
+    # Optionally narrow a multi-book store to some of its books.
+    sources = [s.strip() for s in os.getenv("CHRONOREASON_SOURCES", "").split(",") if s.strip()]
+    sources = sources or None
+    claims = extract_claims(backstory)
 
-validations = []
+    evidence_lists = [
+        [chunk for chunk, _ in hits] for hits in store.search_many(claims, sources=sources)
+    ]
+    evidence_budget = int(os.getenv("CLAIM_VALIDATOR_EVIDENCE_TOKENS", "0"))
+    if evidence_budget > 0:
+        evidence_lists = compress_evidence(claims, evidence_lists, store.embed, evidence_budget)
+    backend = make_backend()
+    if isinstance(backend, CascadeBackend):
+        backend.embed = store.embed
+    early_exit = os.getenv("CHRONOREASON_EARLY_EXIT", "off").lower()
+    if early_exit in ("on", "report"):
+        tracker = run(decide_streaming(
+            stream_validations(backend, claims, evidence_lists),
+            len(claims),
+            finish=early_exit == "report",
+        ))
+        decision = tracker.decision
+        print(f"Decided after {tracker.decided_after}/{len(claims)} claims")
+        if tracker.complete:
+            print("Contradiction Score:", tracker.score())
+        else:
+            low, high = tracker.bounds()
+            print(f"Contradiction Score: between {low:.3f} and {high:.3f}")
+    else:
+        validations = run(backend.validate(claims, evidence_lists))
+        score = contradiction_score(validations)
+        decision = final_decision(score)
+        print("Contradiction Score:", score)
 
-for claim in claims:
-    evidence = store.search(claim)
-    result = validate_claim(claim, evidence)
-    validations.append(result)
+    print("Final Decision:", "CONSISTENT" if decision == 1 else "INCONSISTENT")
+    print("Embedding cache:", cache.stats())
+    if get_cache() is not None:
+        print("Validation cache:", get_cache().stats())
+    print("API requests:", get_scheduler().stats())
+    if isinstance(backend, CascadeBackend):
+        print("Cascade:", backend.stats())
 
-score = contradiction_score(validations)
-decision = final_decision(score)
 
-print("Contradiction Score:", score)
-print("Final Decision:", "CONSISTENT" if decision == 1 else "INCONSISTENT")
+# Embedding workers are spawned processes that re-import this module, so the
+# pipeline must only run when executed as a script.
+if __name__ == "__main__":
+    main()
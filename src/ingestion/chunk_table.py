@@ -0,0 +1,124 @@
+"""Chunks as offsets into one shared source text.
+
+chunk_text returns a freshly joined string per chunk, so overlapping chunks
+hold their shared words several times over (100-word chunks with 50 words of
+overlap double the corpus). A ChunkTable keeps the source once plus two
+int64 offset arrays and builds a chunk's text only when it is read. It is a
+read-only sequence of strings, so it can be passed wherever a chunk list is
+expected, and a chunk id (its position) maps back to its place in the source.
+"""
+import re
+from collections.abc import Sequence
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+from .structured_chunker import chunk_structured
+
+_WORD = re.compile(r"\S+")
+
+
+class ChunkTable(Sequence):
+    def __init__(self, source: str, starts, ends, chapters=None, paragraphs=None):
+        """Chunk i is the words of source[starts[i]:ends[i]], joined by single spaces.
+
+        chapters, paragraphs: optional chapter and first-paragraph index per
+            chunk (see from_structure)
+        """
+        self.source = source
+        self.starts = np.asarray(starts, dtype=np.int64)
+        self.ends = np.asarray(ends, dtype=np.int64)
+        self.chapters = None if chapters is None else np.asarray(chapters, dtype=np.int32)
+        self.paragraphs = None if paragraphs is None else np.asarray(paragraphs, dtype=np.int32)
+        if self.starts.shape != self.ends.shape or self.starts.ndim != 1:
+            raise ValueError("starts and ends must be 1-d arrays of equal length")
+        if self.chapters is not None and self.chapters.shape != self.starts.shape:
+            raise ValueError("chapters must align with starts and ends")
+        if self.paragraphs is not None and self.paragraphs.shape != self.starts.shape:
+            raise ValueError("paragraphs must align with starts and ends")
+
+    @classmethod
+    def from_text(cls, text: str, chunk_size: int = 800, overlap: int = 100) -> "ChunkTable":
+        """Chunk text exactly as chunk_text does, storing offsets instead of strings."""
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        spans = np.fromiter(
+            (offset for match in _WORD.finditer(text or "") for offset in match.span()),
+            dtype=np.int64,
+        ).reshape(-1, 2)
+        n = len(spans)
+        effective_overlap = max(0, min(overlap, chunk_size - 1))
+        step = max(1, chunk_size - effective_overlap)
+        first = np.arange(0, n, step, dtype=np.int64)
+        last = np.minimum(first + chunk_size, n) - 1
+        return cls(text or "", spans[first, 0], spans[last, 1])
+
+    @classmethod
+    def from_structure(
+        cls,
+        text: str,
+        chunk_size: int = 800,
+        overlap: int = 100,
+        count: Optional[Callable[[str], int]] = None,
+    ) -> "ChunkTable":
+        """Sentence-aligned chunks within chapters; arguments as for chunk_structured."""
+        chunks = chunk_structured(text or "", chunk_size, overlap, count)
+        return cls(
+            text or "",
+            [c.start for c in chunks],
+            [c.end for c in chunks],
+            chapters=[c.chapter for c in chunks],
+            paragraphs=[c.paragraph for c in chunks],
+        )
+
+    @classmethod
+    def from_file(
+        cls, path: str, chunk_size: int = 800, overlap: int = 100, structured: bool = False
+    ) -> "ChunkTable":
+        """Chunk a UTF-8 file; offsets index its text with newlines untranslated."""
+        with open(path, encoding="utf-8", newline="") as f:
+            text = f.read()
+        if structured:
+            return cls.from_structure(text, chunk_size, overlap)
+        return cls.from_text(text, chunk_size, overlap)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            chapters = None if self.chapters is None else self.chapters[index]
+            paragraphs = None if self.paragraphs is None else self.paragraphs[index]
+            return ChunkTable(self.source, self.starts[index], self.ends[index], chapters, paragraphs)
+        start, end = self.span(index)
+        return " ".join(self.source[start:end].split())
+
+    def span(self, index: int) -> Tuple[int, int]:
+        """(start, end) character offsets of chunk index in the source."""
+        if not -len(self) <= index < len(self):
+            raise IndexError(f"chunk index {index} out of range")
+        return int(self.starts[index]), int(self.ends[index])
+
+    def raw(self, index: int) -> str:
+        """Chunk index as it appears in the source, line breaks and all."""
+        start, end = self.span(index)
+        return self.source[start:end]
+
+    def chapter(self, index: int) -> Optional[int]:
+        """Chapter of chunk index, or None for tables built without structure."""
+        self.span(index)
+        return None if self.chapters is None else int(self.chapters[index])
+
+    def paragraph(self, index: int) -> Optional[int]:
+        """Paragraph chunk index starts in, or None for tables built without structure."""
+        self.span(index)
+        return None if self.paragraphs is None else int(self.paragraphs[index])
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the offset arrays (the source is shared, not copied)."""
+        extra = sum(a.nbytes for a in (self.chapters, self.paragraphs) if a is not None)
+        return self.starts.nbytes + self.ends.nbytes + extra
+
+    def __repr__(self) -> str:
+        return f"ChunkTable({len(self)} chunks over {len(self.source)} characters)"
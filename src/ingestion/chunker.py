@@ -1,3 +1,9 @@
+import codecs
+import re
+from collections import deque
+from typing import NamedTuple
+
+
 def chunk_text(text, chunk_size=800, overlap=100):
     """Split text into overlapping chunks of words.
     
@@ -34,3 +40,84 @@ def chunk_text(text, chunk_size=800, overlap=100):
             break
 
     return chunks
+
+
+class Chunk(NamedTuple):
+    """A chunk and the character offsets of its first and last word in the source."""
+
+    text: str
+    start: int
+    end: int
+
+
+_WORD = re.compile(r"\S+")
+
+
+def _iter_words(handle, block_size):
+    """(word, start, end) for every whitespace-separated word, read block by block."""
+    decoder = None
+    carry, base = "", 0  # unfinished word at the end of the last block, and its offset
+    while True:
+        raw = block = handle.read(block_size)
+        if isinstance(raw, bytes):
+            if decoder is None:
+                decoder = codecs.getincrementaldecoder("utf-8")()
+            # May be empty mid-file while a multi-byte character is split.
+            block = decoder.decode(raw, final=not raw)
+        if not raw:
+            break
+        buffer = carry + block
+        carry = ""
+        for match in _WORD.finditer(buffer):
+            if match.end() == len(buffer):
+                # The word may continue in the next block.
+                carry = match.group()
+                break
+            yield match.group(), base + match.start(), base + match.end()
+        base += len(buffer) - len(carry)
+    if carry:
+        yield carry, base, base + len(carry)
+
+
+def iter_chunks(source, chunk_size=800, overlap=100, block_size=1 << 16):
+    """Stream overlapping word chunks from a file without loading it whole.
+
+    Yields the same chunks as chunk_text(source_text, chunk_size, overlap),
+    keeping at most chunk_size words in memory.
+
+    Args:
+        source: Path of a UTF-8 text file, or an open text or binary handle
+        chunk_size: Number of words per chunk (default 800)
+        overlap: Number of overlapping words between chunks (default 100)
+        block_size: Characters (or bytes) read at a time
+
+    Yields:
+        Chunk(text, start, end), with start/end character offsets into the
+        source (newlines are not translated, so offsets index the file's text)
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    if not hasattr(source, "read"):
+        with open(source, encoding="utf-8", newline="") as handle:
+            yield from iter_chunks(handle, chunk_size, overlap, block_size)
+        return
+
+    effective_overlap = max(0, min(overlap, chunk_size - 1))
+    step = max(1, chunk_size - effective_overlap)
+
+    def emit():
+        return Chunk(" ".join(w for w, _, _ in window), window[0][1], window[-1][2])
+
+    window = deque()  # words from the start of the next chunk onwards
+    for word in _iter_words(source, block_size):
+        window.append(word)
+        if len(window) == chunk_size:
+            yield emit()
+            for _ in range(step):
+                window.popleft()
+    # Like chunk_text, every chunk start before the last word is emitted,
+    # including the shorter tail chunks.
+    while window:
+        yield emit()
+        for _ in range(min(step, len(window))):
+            window.popleft()
@@ -0,0 +1,192 @@
+"""Batch ingestion of a directory of books into one tagged store.
+
+Files are read, normalized and chunked in a process pool, since that work is
+CPU-bound and independent per file. The main thread embeds and indexes each
+file's chunks as they arrive, so chunking runs ahead on later files while
+earlier ones are encoded. A bounded queue of pending results sits between
+the two stages: when embedding falls behind, no new files are read, which
+keeps memory flat however large the corpus. Every chunk is tagged with its
+file's path relative to the directory, so search can be narrowed to some
+of the books.
+"""
+import fnmatch
+import multiprocessing
+import os
+import queue
+import threading
+import time
+import unicodedata
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from .chunker import chunk_text
+from .structured_chunker import chunk_structured
+
+STAGES = ("read", "normalize", "chunk", "embed", "write")
+
+
+def normalize_text(text: str) -> str:
+    """Drop a byte-order mark, compose Unicode (NFC) and use \\n line endings."""
+    text = text.lstrip("\ufeff")
+    text = unicodedata.normalize("NFC", text)
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def find_files(directory: str, pattern: str = "*.txt") -> List[str]:
+    """Files under directory matching pattern, as sorted relative paths."""
+    found = []
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for name in files:
+            if fnmatch.fnmatch(name, pattern):
+                path = os.path.relpath(os.path.join(root, name), directory)
+                found.append(path.replace(os.sep, "/"))
+    return sorted(found)
+
+
+def prepare_file(
+    path: str, chunk_size: int = 800, overlap: int = 100, structured: bool = True
+) -> Tuple[List[str], Dict[str, Tuple[float, float]]]:
+    """Read, normalize and chunk one file.
+
+    Returns (chunks, timings), where timings maps each stage to (seconds,
+    megabytes processed). Runs in the worker processes.
+    """
+    start = time.perf_counter()
+    with open(path, "rb") as f:
+        raw = f.read()
+    text = raw.decode("utf-8", errors="replace")
+    read = time.perf_counter()
+    text = normalize_text(text)
+    normalized = time.perf_counter()
+    if structured:
+        chunks = [chunk.text for chunk in chunk_structured(text, chunk_size, overlap)]
+    else:
+        chunks = chunk_text(text, chunk_size, overlap)
+    done = time.perf_counter()
+    megabytes = len(raw) / 1e6
+    return chunks, {
+        "read": (read - start, megabytes),
+        "normalize": (normalized - read, megabytes),
+        "chunk": (done - normalized, megabytes),
+    }
+
+
+def ingest_corpus(
+    directory: str,
+    store,
+    out: Optional[str] = None,
+    chunk_size: int = 800,
+    overlap: int = 100,
+    structured: bool = True,
+    pattern: str = "*.txt",
+    workers: Optional[int] = None,
+    queue_size: int = 8,
+) -> Dict:
+    """Add every matching file under directory to store, tagged by its relative path.
+
+    store: a PathwayStore (anything with add_chunks(chunks, source=...) and,
+        if out is given, save(path))
+    out: if set, the store is saved there once every file is indexed
+    chunk_size, overlap, structured: how files are chunked (chunk_structured
+        when structured, else chunk_text)
+    workers: processes reading and chunking files (default
+        CHRONOREASON_INGEST_WORKERS, else the CPU count); 1 chunks on a
+        background thread instead
+    queue_size: files chunked ahead of the embedding stage at most
+
+    Returns a report: files, chunks, wall seconds, and per stage the busy
+    seconds (summed over workers), amount processed and throughput.
+    """
+    if queue_size <= 0:
+        raise ValueError("queue_size must be positive")
+    workers = workers or int(os.getenv("CHRONOREASON_INGEST_WORKERS", "0")) or os.cpu_count() or 1
+    paths = find_files(directory, pattern)
+    busy = {stage: 0.0 for stage in STAGES}
+    amount = {stage: 0.0 for stage in STAGES}
+    started = time.perf_counter()
+    waited = 0.0
+    n_chunks = 0
+
+    if workers > 1:
+        # spawn, not fork: the parent may already run torch or other threads.
+        pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+    else:
+        pool = ThreadPoolExecutor(1)
+    pending: "queue.Queue[Tuple[str, Optional[Future]]]" = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+
+    def offer(item) -> bool:
+        # Blocks while queue_size files wait for the embedding stage.
+        while not stop.is_set():
+            try:
+                pending.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        for path in paths:
+            future = pool.submit(
+                prepare_file, os.path.join(directory, path), chunk_size, overlap, structured
+            )
+            if not offer((path, future)):
+                future.cancel()
+                return
+        offer(("", None))
+
+    producer = threading.Thread(target=produce, name="corpus-ingest", daemon=True)
+    producer.start()
+    try:
+        while True:
+            wait_start = time.perf_counter()
+            path, future = pending.get()
+            if future is None:
+                break
+            chunks, timings = future.result()
+            waited += time.perf_counter() - wait_start
+            for stage, (seconds, megabytes) in timings.items():
+                busy[stage] += seconds
+                amount[stage] += megabytes
+            embed_start = time.perf_counter()
+            if chunks:
+                store.add_chunks(chunks, source=path)
+            busy["embed"] += time.perf_counter() - embed_start
+            amount["embed"] += len(chunks)
+            n_chunks += len(chunks)
+    finally:
+        stop.set()
+        while True:
+            try:
+                _, future = pending.get_nowait()
+            except queue.Empty:
+                break
+            if future is not None:
+                future.cancel()
+        producer.join()
+        pool.shutdown(cancel_futures=True)
+
+    if out is not None:
+        write_start = time.perf_counter()
+        store.save(out)
+        busy["write"] = time.perf_counter() - write_start
+        amount["write"] = os.path.getsize(out) / 1e6
+
+    units = {"embed": "chunks/s"}
+    return {
+        "files": len(paths),
+        "chunks": n_chunks,
+        "wall_s": time.perf_counter() - started,
+        "embed_wait_s": waited,  # embedding stage starved for chunks
+        "stages": {
+            stage: {
+                "busy_s": busy[stage],
+                "amount": amount[stage],
+                "throughput": amount[stage] / busy[stage] if busy[stage] else 0.0,
+                "unit": units.get(stage, "MB/s"),
+            }
+            for stage in STAGES
+            if stage != "write" or out is not None
+        },
+    }
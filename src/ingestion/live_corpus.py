@@ -0,0 +1,121 @@
+"""Live ingestion of a directory of .txt books through a Pathway dataflow.
+
+Pathway watches the directory and re-reads files as they appear, change or
+disappear. Chunking runs inside the dataflow; each minibatch of changed
+files is then embedded in one batch and applied to a PathwayStore, so search
+results follow the directory without a restart. Everything is local files.
+"""
+import os
+import threading
+from typing import List, Tuple
+
+from .chunker import chunk_text
+
+
+class LiveCorpus:
+    def __init__(
+        self,
+        directory: str,
+        store,
+        chunk_size: int = 800,
+        overlap: int = 100,
+        pattern: str = "*.txt",
+        commit_ms: int = 500,
+    ):
+        """Keep store in sync with the text files under directory.
+
+        store: a PathwayStore (anything with add_chunks(chunks, source=...),
+            remove_source(source) and search_many())
+        chunk_size, overlap: passed to chunk_text for every file
+        pattern: glob of files to ingest
+        commit_ms: how often Pathway flushes file changes into a minibatch
+        """
+        self.directory = directory
+        self.store = store
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+        self.pattern = pattern
+        self.commit_ms = commit_ms
+        self.version = 0
+        self._lock = threading.RLock()
+        self._updated = threading.Condition(self._lock)
+        self._pending: List[Tuple[str, Tuple[str, ...], bool]] = []
+        self._thread = None
+
+    def _build(self, mode: str) -> None:
+        import pathway as pw
+
+        files = pw.io.fs.read(
+            os.path.join(self.directory, self.pattern),
+            format="plaintext_by_file",
+            mode=mode,
+            with_metadata=True,
+            autocommit_duration_ms=self.commit_ms,
+        )
+        chunk_size, overlap = self.chunk_size, self.overlap
+        chunked = files.select(
+            path=pw.this._metadata["path"].as_str(),
+            chunks=pw.apply(
+                lambda text: tuple(chunk_text(text, chunk_size=chunk_size, overlap=overlap)),
+                pw.this.data,
+            ),
+        )
+        pw.io.subscribe(chunked, on_change=self._on_change, on_time_end=self._on_time_end)
+
+    def _on_change(self, key, row, time, is_addition) -> None:
+        self._pending.append((row["path"], row["chunks"], is_addition))
+
+    def _on_time_end(self, time) -> None:
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        with self._updated:
+            # An edited file arrives as a retraction plus an addition in the
+            # same minibatch; drop old chunks before indexing the new ones.
+            for path, _, is_addition in pending:
+                if not is_addition:
+                    self.store.remove_source(path)
+            for path, chunks, is_addition in pending:
+                if is_addition and chunks:
+                    self.store.add_chunks(list(chunks), source=path)
+            self.version += 1
+            self._updated.notify_all()
+
+    def run(self) -> None:
+        """Ingest the directory once and return (no watching)."""
+        import pathway as pw
+
+        self._build("static")
+        pw.run(monitoring_level=pw.MonitoringLevel.NONE)
+
+    def start(self) -> None:
+        """Start watching the directory on a background thread.
+
+        Pathway runs one dataflow per process, so start at most one
+        LiveCorpus per process.
+        """
+        import pathway as pw
+
+        if self._thread is not None:
+            raise RuntimeError("LiveCorpus already started")
+        self._build("streaming")
+        self._thread = threading.Thread(
+            target=pw.run,
+            kwargs={"monitoring_level": pw.MonitoringLevel.NONE},
+            name="live-corpus",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def wait_for_update(self, after_version: int, timeout: float = None) -> bool:
+        """Block until a minibatch newer than after_version has been indexed."""
+        with self._updated:
+            return self._updated.wait_for(lambda: self.version > after_version, timeout)
+
+    def search(self, query: str, top_k: int = 3, **options) -> List[str]:
+        with self._lock:
+            return self.store.search(query, top_k=top_k, **options)
+
+    def search_many(self, queries: List[str], top_k: int = 3, **options):
+        with self._lock:
+            return self.store.search_many(queries, top_k=top_k, **options)
@@ -0,0 +1,152 @@
+"""Chunking along the text's own structure.
+
+chunk_text cuts every chunk_size words wherever that lands, often mid-sentence
+and across chapter breaks. chunk_structured makes one linear pass over the
+text instead: paragraphs are separated by blank lines, a paragraph that is a
+lone "CHAPTER IV." style heading starts a new chapter, and paragraphs are
+split into sentences. Whole sentences are packed into chunks of at most
+chunk_size tokens, never across a chapter boundary, and each chunk records
+its chapter and first paragraph.
+"""
+import re
+from typing import Callable, Iterator, List, NamedTuple, Optional, Tuple
+
+_PARAGRAPH_BREAK = re.compile(r"\n[ \t\r\f\v]*\n\s*")
+# A heading is its whole line: "CHAPTER IV.", "Chapter 4", "Part II: The Voyage" or
+# "BOOK 3 - Home". The keyword is capitalized or upper case, the numeral an upper
+# case roman or arabic one, and a short title follows only after a separator, so
+# prose such as "Part I did not go well." stays text.
+_HEADING = re.compile(
+    r"(?:CHAPTER|BOOK|PART|VOLUME|Chapter|Book|Part|Volume)[ \t]+(?:[IVXLCDM]+|\d+)"
+    r"(?:[.:]?|(?:[.:]|[ \t]*[-\u2013\u2014])[ \t]*[^\n.!?]{1,60}\.?)[ \t]*"
+)
+# Terminal punctuation (plus closing quotes/brackets) and whitespace, before
+# something that can start a sentence.
+_SENTENCE_END = re.compile(r"[.!?][\"')\]]*(\s+)(?=[\"'(\[]*[A-Z0-9])")
+# Periods that end an abbreviation or initial, not a sentence ("E. G.", "Mr.").
+_ABBREVIATION = re.compile(r"(?:\b[A-Z]|\bMrs?|\bDr|\bSt|\bMessrs)\.$")
+
+
+class StructuredChunk(NamedTuple):
+    """A chunk, its character offsets in the source, and where it sits in the book."""
+
+    text: str
+    start: int
+    end: int
+    chapter: int  # 0 until the first chapter heading
+    paragraph: int  # index of the paragraph the chunk starts in
+
+
+def _trimmed(text: str, start: int, end: int) -> Iterator[Tuple[int, int]]:
+    piece = text[start:end]
+    stripped = piece.strip()
+    if stripped:
+        start += len(piece) - len(piece.lstrip())
+        yield start, start + len(stripped)
+
+
+def _paragraphs(text: str) -> Iterator[Tuple[int, int]]:
+    pos = 0
+    for match in _PARAGRAPH_BREAK.finditer(text):
+        yield from _trimmed(text, pos, match.start())
+        pos = match.end()
+    yield from _trimmed(text, pos, len(text))
+
+
+def _sentences(text: str, start: int, end: int) -> Iterator[Tuple[int, int]]:
+    pos = start
+    for match in _SENTENCE_END.finditer(text, start, end):
+        if _ABBREVIATION.search(text, max(pos, match.start() - 8), match.start() + 1):
+            continue
+        yield from _trimmed(text, pos, match.start(1))
+        pos = match.end()
+    yield from _trimmed(text, pos, end)
+
+
+def _words(text: str) -> int:
+    return len(text.split())
+
+
+def chunk_structured(
+    text: str,
+    chunk_size: int = 800,
+    overlap: int = 100,
+    count: Optional[Callable[[str], int]] = None,
+) -> List[StructuredChunk]:
+    """Split text into chunks of whole sentences within one chapter.
+
+    Args:
+        text: Input text
+        chunk_size: Max tokens per chunk (default 800)
+        overlap: Up to this many tokens of whole trailing sentences are
+            repeated at the start of the next chunk in the same chapter
+        count: Token counter (default: whitespace-separated words, matching
+            chunk_text's units)
+
+    Returns:
+        StructuredChunks in reading order. Chunk text has its whitespace
+        collapsed, like chunk_text's; a sentence longer than chunk_size is
+        split between words.
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    count = count or _words
+    chunks: List[StructuredChunk] = []
+    current: List[Tuple[int, int, int, int]] = []  # (start, end, tokens, paragraph)
+    state = {"tokens": 0, "fresh": 0}  # tokens in current; sentences not carried over
+
+    def flush(carry: bool) -> None:
+        if state["fresh"]:
+            chunks.append(StructuredChunk(
+                " ".join(text[current[0][0]:current[-1][1]].split()),
+                current[0][0], current[-1][1], chapter, current[0][3],
+            ))
+        kept = []
+        if carry and overlap > 0:
+            tokens = 0
+            for sentence in reversed(current[1:]):  # never carry the whole chunk
+                tokens += sentence[2]
+                if tokens > overlap:
+                    break
+                kept.insert(0, sentence)
+        current[:] = kept
+        state["tokens"] = sum(s[2] for s in kept)
+        state["fresh"] = 0
+
+    def add(start: int, end: int, tokens: int, paragraph: int) -> None:
+        if state["tokens"] + tokens > chunk_size:
+            if state["fresh"]:
+                flush(carry=True)
+            # Carried sentences give way when they leave no room.
+            while current and state["tokens"] + tokens > chunk_size:
+                state["tokens"] -= current.pop(0)[2]
+        current.append((start, end, tokens, paragraph))
+        state["tokens"] += tokens
+        state["fresh"] += 1
+
+    chapter = 0
+    for paragraph, (p_start, p_end) in enumerate(_paragraphs(text)):
+        if "\n" not in text[p_start:p_end] and _HEADING.fullmatch(text, p_start, p_end):
+            flush(carry=False)
+            chapter += 1
+            continue
+        for start, end in _sentences(text, p_start, p_end):
+            tokens = count(text[start:end])
+            if tokens <= chunk_size:
+                add(start, end, tokens, paragraph)
+                continue
+            # Oversized sentence: cut between words.
+            piece_start = piece_end = None
+            piece_tokens = 0
+            for word in re.finditer(r"\S+", text[start:end]):
+                word_tokens = count(word.group())
+                if piece_start is not None and piece_tokens + word_tokens > chunk_size:
+                    add(piece_start, piece_end, piece_tokens, paragraph)
+                    piece_start, piece_tokens = None, 0
+                if piece_start is None:
+                    piece_start = start + word.start()
+                piece_end = start + word.end()
+                piece_tokens += word_tokens
+            add(piece_start, piece_end, piece_tokens, paragraph)
+    flush(carry=False)
+    return chunks
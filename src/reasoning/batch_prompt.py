@@ -0,0 +1,148 @@
+"""Validate several claims in one LLM request.
+
+Claims whose retrieved evidence overlaps are grouped so each shared chunk is
+sent once, and the model is asked for a JSON verdict list. The reply is
+parsed leniently: JSON (bare, fenced, wrapped in an object or keyed by claim
+number) first, then "<n>: <label>" lines. Claims the reply does not cover
+come back as None so the caller can validate them one by one.
+"""
+import json
+import re
+from typing import List, Optional, Sequence, Union
+
+from .verdict import Verdict, parse_confidence, parse_label
+
+_NUMBERED_LINE = re.compile(
+    r"^\W*(?:claim\s*)?(\d+)\W+.*?\b(support|contradict|neutral)", re.IGNORECASE | re.MULTILINE
+)
+_FENCE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL | re.IGNORECASE)
+
+Evidence = Union[str, Sequence[str]]
+
+
+def as_chunks(evidence: Evidence) -> List[str]:
+    """Evidence for one claim as a list of chunks (a string is one chunk)."""
+    if isinstance(evidence, str):
+        return [evidence]
+    return [str(chunk) for chunk in evidence]
+
+
+def group_claims(evidence: Sequence[Evidence], max_claims: int, max_chunks: int) -> List[List[int]]:
+    """Group claim indices that share at least one evidence chunk.
+
+    Connected claims are packed in input order into groups of at most
+    max_claims claims and max_chunks distinct chunks; claims with nothing in
+    common with any other come back as singleton groups.
+    """
+    chunk_lists = [as_chunks(e) for e in evidence]
+    parent = list(range(len(chunk_lists)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    owner = {}
+    for i, chunks in enumerate(chunk_lists):
+        for chunk in chunks:
+            j = owner.setdefault(chunk, i)
+            if j != i:
+                parent[find(i)] = find(j)
+
+    components = {}
+    for i in range(len(chunk_lists)):
+        components.setdefault(find(i), []).append(i)
+
+    groups = []
+    for members in components.values():
+        group, seen = [], set()
+        for i in members:
+            new = set(chunk_lists[i]) - seen
+            if group and (len(group) >= max_claims or len(seen) + len(new) > max_chunks):
+                groups.append(group)
+                group, seen = [], set()
+                new = set(chunk_lists[i])
+            group.append(i)
+            seen |= new
+        groups.append(group)
+    groups.sort(key=lambda g: g[0])
+    return groups
+
+
+def build_batch_prompt(claims: Sequence[str], evidence: Sequence[Evidence]) -> str:
+    """One prompt asking for a verdict on every claim against their pooled evidence."""
+    chunks = list(dict.fromkeys(chunk for e in evidence for chunk in as_chunks(e)))
+    evidence_text = "\n\n".join(f"[{n}] {chunk}" for n, chunk in enumerate(chunks, 1))
+    claims_text = "\n".join(f"{n}. {claim}" for n, claim in enumerate(claims, 1))
+    return f"""
+Evidence:
+{evidence_text}
+
+Claims:
+{claims_text}
+
+For each claim, does the evidence SUPPORT, CONTRADICT, or is it NEUTRAL?
+Answer with only a JSON object holding one verdict per claim, in order, each
+with your confidence from 0 to 1:
+{{"verdicts": [{{"claim": 1, "label": "support", "confidence": 0.9}},
+              {{"claim": 2, "label": "neutral", "confidence": 0.6}}]}}
+"""
+
+
+def _load_json(text: str):
+    candidates = [m.group(1) for m in _FENCE.finditer(text)] + [text]
+    for candidate in candidates:
+        for opener, closer in (("[", "]"), ("{", "}")):
+            start, end = candidate.find(opener), candidate.rfind(closer)
+            if start != -1 and end > start:
+                try:
+                    return json.loads(candidate[start:end + 1])
+                except ValueError:
+                    continue
+    return None
+
+
+def _verdict(label, confidence=None) -> Optional[Verdict]:
+    label = parse_label(label)
+    return Verdict(label, parse_confidence(confidence)) if label else None
+
+
+def _from_json(data, n: int) -> List[Optional[Verdict]]:
+    verdicts: List[Optional[Verdict]] = [None] * n
+    if isinstance(data, dict):
+        for key in ("verdicts", "results", "labels", "claims"):
+            if isinstance(data.get(key), list):
+                data = data[key]
+                break
+        else:
+            # {"1": "support", "2": "neutral"}
+            for key, value in data.items():
+                if str(key).strip().isdigit() and 1 <= int(key) <= n:
+                    verdicts[int(key) - 1] = _verdict(value)
+            return verdicts
+    if not isinstance(data, list):
+        return verdicts
+    for position, item in enumerate(data):
+        index = position
+        if isinstance(item, dict):
+            number = item.get("claim", item.get("id", item.get("index")))
+            if isinstance(number, (int, str)) and str(number).strip().isdigit():
+                index = int(number) - 1
+            verdict = _verdict(item.get("label", item.get("verdict")), item.get("confidence"))
+        else:
+            verdict = _verdict(item)
+        if 0 <= index < n and verdicts[index] is None:
+            verdicts[index] = verdict
+    return verdicts
+
+
+def parse_verdicts(text: str, n: int) -> List[Optional[Verdict]]:
+    """Verdicts for n claims from a batch reply; None where the reply is silent."""
+    verdicts = _from_json(_load_json(text), n) if text else [None] * n
+    if any(verdict is None for verdict in verdicts):
+        for number, label in _NUMBERED_LINE.findall(text or ""):
+            index = int(number) - 1
+            if 0 <= index < n and verdicts[index] is None:
+                verdicts[index] = Verdict(label.lower())
+    return verdicts
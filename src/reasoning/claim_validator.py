@@ -1,14 +1,33 @@
+import asyncio
+import contextlib
 import os
 import sys
-from dotenv import load_dotenv
-from openai import APIError, OpenAI, RateLimitError
+import threading
+import numpy as np
+from openai import APIError, OpenAIError, RateLimitError
 
-load_dotenv()
-client = OpenAI()
+from .batch_prompt import as_chunks, build_batch_prompt, group_claims, parse_verdicts
+from .openai_client import EventLoopThread, build_async_client, build_client
+from .rate_limiter import RequestScheduler, completion_tokens, estimate_tokens
+from .validation_cache import DEFAULT_CACHE_PATH, ValidationCache, validation_key
+from .verdict import LABELS, Verdict, parse_verdict
+
+# Created on first API call, so the local backends work without an API key.
+client = None
 FALLBACK_LABEL = os.getenv("CLAIM_VALIDATOR_FALLBACK_LABEL", "neutral").lower()
+CONCURRENCY = int(os.getenv("CLAIM_VALIDATOR_CONCURRENCY", "8"))
+# Claims per request in batch mode (1 = one request per claim), and the most
+# distinct evidence chunks pooled into one batch prompt.
+BATCH_SIZE = int(os.getenv("CLAIM_VALIDATOR_BATCH_SIZE", "1"))
+BATCH_MAX_CHUNKS = int(os.getenv("CLAIM_VALIDATOR_BATCH_MAX_CHUNKS", "8"))
+MODEL = os.getenv("CLAIM_VALIDATOR_MODEL", "gpt-3.5-turbo")
+TEMPERATURE = 0
 
-def validate_claim(claim, evidence_list):
-    prompt = f"""
+
+def _build_prompt(claim, evidence_list):
+    if not isinstance(evidence_list, str):
+        evidence_list = " ".join(evidence_list)
+    return f"""
 Claim:
 {claim}
 
@@ -16,19 +35,614 @@ Evidence:
 {evidence_list}
 
 Does the evidence SUPPORT, CONTRADICT, or is it NEUTRAL?
-Answer in one word.
+Answer with only a JSON object giving the label and your confidence from 0 to 1:
+{{"label": "support" | "contradict" | "neutral", "confidence": 0.0-1.0}}
 """
 
-    try:
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0,
-        )
-        return response.choices[0].message.content.strip().lower()
-    except RateLimitError:
+
+def _report_error(err):
+    if isinstance(err, RateLimitError):
         print("OpenAI rate limit/quota hit; returning fallback label", file=sys.stderr)
-    except APIError as err:
+    elif not isinstance(err, APIError):
+        # Raised before any request, e.g. building a client without an API key.
+        print(f"OpenAI client unavailable ({err}); returning fallback label", file=sys.stderr)
+    else:
         print(f"OpenAI API error ({getattr(err, 'status_code', 'unknown')}): {err}", file=sys.stderr)
 
-    return FALLBACK_LABEL
+
+_cache = None
+_state_lock = threading.Lock()
+_cache_configured = False
+
+
+def get_cache():
+    """Process-wide validation cache, or None when CLAIM_VALIDATOR_CACHE is empty.
+
+    CLAIM_VALIDATOR_CACHE_TTL (seconds) and CLAIM_VALIDATOR_CACHE_MAX_ENTRIES
+    bound how long and how many labels are kept.
+    """
+    global _cache, _cache_configured
+    if not _cache_configured:
+        with _state_lock:
+            if not _cache_configured:
+                if DEFAULT_CACHE_PATH:
+                    ttl = os.getenv("CLAIM_VALIDATOR_CACHE_TTL")
+                    max_entries = os.getenv("CLAIM_VALIDATOR_CACHE_MAX_ENTRIES")
+                    _cache = ValidationCache(
+                        DEFAULT_CACHE_PATH,
+                        max_entries=int(max_entries) if max_entries else None,
+                        ttl=float(ttl) if ttl else None,
+                    )
+                _cache_configured = True
+    return _cache
+
+
+def set_cache(cache):
+    """Replace the process-wide cache (None disables caching); returns the old one."""
+    global _cache, _cache_configured
+    with _state_lock:
+        previous, _cache = _cache, cache
+        _cache_configured = True
+    return previous
+
+
+_scheduler = None
+
+
+def get_scheduler():
+    """Process-wide request scheduler shared by sync and async validation.
+
+    Configured from CLAIM_VALIDATOR_RPM, CLAIM_VALIDATOR_TPM (pacing limits,
+    unset = unpaced), CLAIM_VALIDATOR_MAX_RETRIES and CLAIM_VALIDATOR_RETRY_BUDGET.
+    """
+    global _scheduler
+    if _scheduler is None:
+        with _state_lock:
+            if _scheduler is None:
+                rpm = os.getenv("CLAIM_VALIDATOR_RPM")
+                tpm = os.getenv("CLAIM_VALIDATOR_TPM")
+                budget = os.getenv("CLAIM_VALIDATOR_RETRY_BUDGET")
+                _scheduler = RequestScheduler(
+                    requests_per_minute=float(rpm) if rpm else None,
+                    tokens_per_minute=float(tpm) if tpm else None,
+                    max_retries=int(os.getenv("CLAIM_VALIDATOR_MAX_RETRIES", "6")),
+                    retry_budget=int(budget) if budget else None,
+                )
+    return _scheduler
+
+
+def set_scheduler(scheduler):
+    """Replace the process-wide scheduler (None resets it); returns the old one."""
+    global _scheduler
+    with _state_lock:
+        previous, _scheduler = _scheduler, scheduler
+    return previous
+
+
+def get_client():
+    """Process-wide sync OpenAI client, built on first use (see openai_client)."""
+    global client
+    if client is None:
+        with _state_lock:
+            if client is None:
+                client = build_client()
+    return client
+
+
+def set_client(new_client):
+    """Replace the process-wide sync client (None rebuilds it); returns the old one."""
+    global client
+    with _state_lock:
+        previous, client = client, new_client
+    return previous
+
+
+_loop_thread = None
+_async_client = None
+
+
+def _get_loop_thread():
+    global _loop_thread
+    if _loop_thread is None:
+        with _state_lock:
+            if _loop_thread is None:
+                _loop_thread = EventLoopThread()
+    return _loop_thread
+
+
+def run(coro):
+    """Run a validation coroutine to completion on the shared event loop.
+
+    Use instead of asyncio.run() from scripts and Streamlit: the shared async
+    client lives on this loop, so its pooled connections are reused by every
+    run instead of being reopened each time.
+    """
+    return _get_loop_thread().run(coro)
+
+
+def get_async_client():
+    """Shared AsyncOpenAI client, or None when not on run()'s event loop.
+
+    httpx connections cannot move between event loops, so the shared client
+    is only handed out to code running under run().
+    """
+    global _async_client
+    if _loop_thread is None or asyncio.get_running_loop() is not _loop_thread.loop:
+        return None
+    if _async_client is None:
+        _async_client = build_async_client()
+    return _async_client
+
+
+def set_async_client(new_client):
+    """Replace the shared async client (None rebuilds it); returns the old one.
+
+    The client is used from run()'s event loop only.
+    """
+    global _async_client
+    with _state_lock:
+        previous, _async_client = _async_client, new_client
+    return previous
+
+
+def _cache_key(prompt):
+    return validation_key(MODEL, TEMPERATURE, prompt)
+
+
+def _cached(prompt):
+    cache = get_cache()
+    return cache.get(_cache_key(prompt)) if cache is not None else None
+
+
+def _remember(prompt, label):
+    cache = get_cache()
+    if cache is not None:
+        cache.put(_cache_key(prompt), label)
+
+
+def _request(prompt, max_tokens):
+    return dict(
+        model=MODEL,
+        messages=[{"role": "user", "content": prompt}],
+        temperature=TEMPERATURE,
+        response_format={"type": "json_object"},
+        max_tokens=max_tokens,
+    )
+
+
+def validate_claim(claim, evidence_list):
+    """Validate one claim; returns a Verdict (a label string with .confidence)."""
+    prompt = _build_prompt(claim, evidence_list)
+    reply = _cached(prompt)
+    if reply is None:
+        max_tokens = completion_tokens(1)
+        try:
+            response = get_scheduler().call(
+                lambda: get_client().chat.completions.create(**_request(prompt, max_tokens)),
+                tokens=estimate_tokens(prompt, max_tokens),
+            )
+            reply = response.choices[0].message.content.strip()
+            _remember(prompt, reply)
+        except OpenAIError as err:  # API errors, and get_client() without an API key
+            _report_error(err)
+    return parse_verdict(reply, FALLBACK_LABEL)
+
+
+async def avalidate_claim(claim, evidence_list, client):
+    """Async counterpart of validate_claim using an AsyncOpenAI client."""
+    prompt = _build_prompt(claim, evidence_list)
+    reply = _cached(prompt)
+    if reply is None:
+        reply = await _acomplete(prompt, client)
+    return parse_verdict(reply, FALLBACK_LABEL)
+
+
+async def _acomplete(prompt, client, verdicts=1):
+    """Raw reply text for prompt (cached), or None if the request failed.
+
+    verdicts: claims the reply must label, which sizes its token budget
+    """
+    max_tokens = completion_tokens(verdicts)
+    try:
+        response = await get_scheduler().acall(
+            lambda: client.chat.completions.create(**_request(prompt, max_tokens)),
+            tokens=estimate_tokens(prompt, max_tokens),
+        )
+        reply = response.choices[0].message.content.strip()
+        _remember(prompt, reply)
+        return reply
+    except (RateLimitError, APIError) as err:
+        _report_error(err)
+
+    return None
+
+
+async def validate_claims(claims, evidence, concurrency=None, client=None, batch_size=None):
+    """Validate many claims concurrently, at most `concurrency` requests in flight.
+
+    Args:
+        claims: List of claim strings
+        evidence: Evidence for each claim, aligned with claims
+        concurrency: Max simultaneous requests (default CLAIM_VALIDATOR_CONCURRENCY)
+        client: Optional AsyncOpenAI client; by default the shared one under
+            run(), otherwise a client opened and closed for this call
+        batch_size: Max claims per request (default CLAIM_VALIDATOR_BATCH_SIZE);
+            above 1, claims sharing evidence chunks are validated together
+
+    Returns:
+        List of Verdicts (label strings with .confidence) in claim order
+
+    Cached prompts are answered without a request, and identical prompts in
+    one call are sent only once.
+    """
+    verdicts = [None] * len(claims)
+    async for i, verdict in stream_claims(claims, evidence, concurrency, client, batch_size):
+        verdicts[i] = verdict
+    return verdicts
+
+
+async def stream_claims(claims, evidence, concurrency=None, client=None, batch_size=None):
+    """Validate claims concurrently, yielding (index, Verdict) as each completes.
+
+    Arguments as for validate_claims. Cached claims come first. Closing the
+    generator early (e.g. once the decision is settled) cancels the requests
+    still outstanding.
+    """
+    if len(claims) != len(evidence):
+        raise ValueError("claims and evidence must have the same length")
+    batch_size = batch_size or BATCH_SIZE
+    if batch_size > 1:
+        groups = group_claims(evidence, batch_size, BATCH_MAX_CHUNKS)
+    else:
+        groups = [[i] for i in range(len(claims))]
+
+    def single_prompt(i):
+        return _build_prompt(claims[i], evidence[i])
+
+    # Identical prompts are sent once for every group that needs them.
+    # Singleton groups use the one-claim prompt, so they share cache entries
+    # with the unbatched mode.
+    jobs = {}
+    for group in groups:
+        prompt = (
+            build_batch_prompt([claims[i] for i in group], [evidence[i] for i in group])
+            if len(group) > 1 else single_prompt(group[0])
+        )
+        jobs.setdefault(prompt, []).append(group)
+
+    def resolve(prompt, reply):
+        """Verdicts a reply settles, and claims a batch reply left out (or that failed)."""
+        done, missing = [], []
+        for group in jobs[prompt]:
+            if len(group) > 1:
+                verdicts = parse_verdicts(reply, len(group))
+            else:
+                verdicts = [parse_verdict(reply, FALLBACK_LABEL)]
+            for i, verdict in zip(group, verdicts):
+                (done if verdict is not None else missing).append((i, verdict))
+        return done, [i for i, _ in missing]
+
+    pending, retry = [], []
+    for prompt in jobs:
+        reply = _cached(prompt)
+        if reply is None:
+            pending.append(prompt)
+            continue
+        done, missing = resolve(prompt, reply)
+        for pair in done:
+            yield pair
+        retry.extend(missing)
+    for i in retry:
+        prompt = single_prompt(i)
+        reply = _cached(prompt)
+        if reply is None:
+            jobs.setdefault(prompt, []).append([i])
+            pending.append(prompt)
+        else:
+            yield i, parse_verdict(reply, FALLBACK_LABEL)
+    if not pending:
+        return
+
+    own_client = None
+    try:
+        if client is None:
+            client = get_async_client()
+        if client is None:
+            # Not on the shared loop: httpx connections belong to the event loop
+            # that opened them, so a client we create here is closed before this
+            # loop goes away.
+            client = own_client = build_async_client()
+    except OpenAIError as err:  # e.g. no API key: every uncached claim falls back
+        _report_error(err)
+        for prompt in dict.fromkeys(pending):
+            for group in jobs[prompt]:
+                for i in group:
+                    yield i, parse_verdict(None, FALLBACK_LABEL)
+        return
+    limit = asyncio.Semaphore(concurrency or CONCURRENCY)
+
+    async def complete(prompt, lookup=True):
+        # lookup=False for prompts the first pass already missed in the cache,
+        # so each miss is counted once.
+        reply = _cached(prompt) if lookup else None
+        if reply is None:
+            groups = jobs.get(prompt)
+            async with limit:
+                reply = await _acomplete(prompt, client, len(groups[0]) if groups else 1)
+        return reply
+
+    async def job(prompt):
+        done, missing = resolve(prompt, await complete(prompt, lookup=False))
+        # Claims a batch reply left out are retried one by one.
+        replies = await asyncio.gather(*(complete(single_prompt(i)) for i in missing))
+        done.extend((i, parse_verdict(reply, FALLBACK_LABEL)) for i, reply in zip(missing, replies))
+        return done
+
+    tasks = [asyncio.ensure_future(job(prompt)) for prompt in dict.fromkeys(pending)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            for pair in await next_done:
+                yield pair
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if own_client is not None:
+            await own_client.close()
+
+
+# Validator backends
+#
+# A backend turns aligned claims and evidence into support / contradict /
+# neutral labels with one awaitable call:
+#
+#     labels = await backend.validate(claims, evidence)
+#
+# and may also stream (index, Verdict) pairs as they complete, so a caller
+# can stop (cancelling the remaining work) once it has seen enough:
+#
+#     async for i, verdict in stream_validations(backend, claims, evidence): ...
+#
+# "openai" asks the chat model; "nli" runs a local cross-encoder NLI model on
+# CPU, free and deterministic, for offline runs and bulk screening; "cascade"
+# screens with the local model and asks the chat model only when unsure.
+
+NLI_MODEL = os.getenv("CLAIM_VALIDATOR_NLI_MODEL", "cross-encoder/nli-deberta-v3-xsmall")
+# NLI class names as reported by the models' id2label, mapped to our labels.
+_NLI_LABELS = {"entailment": "support", "contradiction": "contradict", "neutral": "neutral"}
+# Output order of the cross-encoder/nli-* models, used when a model has no
+# id2label of its own.
+_NLI_DEFAULT_ORDER = ("contradiction", "entailment", "neutral")
+LABEL_ORDER = LABELS
+
+
+class OpenAIBackend:
+    name = "openai"
+
+    def __init__(self, concurrency=None, client=None, batch_size=None):
+        """Chat-model validation; arguments as for validate_claims."""
+        self.concurrency = concurrency
+        self.client = client
+        self.batch_size = batch_size
+
+    async def validate(self, claims, evidence):
+        return await validate_claims(
+            claims, evidence, self.concurrency, self.client, self.batch_size
+        )
+
+    def stream(self, claims, evidence):
+        return stream_claims(claims, evidence, self.concurrency, self.client, self.batch_size)
+
+
+class NLIBackend:
+    name = "nli"
+
+    def __init__(self, model_name=None, device=None, batch_size=32):
+        """Local cross-encoder NLI validation, loaded on first use.
+
+        The claim is the hypothesis and each evidence chunk a premise; every
+        claim-chunk pair of a call is scored in one batched predict. A claim
+        takes the verdict of its most decisive chunk (lowest neutral
+        probability), so one clearly contradicting passage is not averaged
+        away by unrelated ones.
+        """
+        self.model_name = model_name or NLI_MODEL
+        self.device = device
+        self.batch_size = batch_size
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def model(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    # Imported here so the API-only path never pulls in torch.
+                    from sentence_transformers import CrossEncoder
+                    self._model = CrossEncoder(self.model_name, device=self.device)
+        return self._model
+
+    def _class_order(self):
+        config = getattr(self.model, "config", None)
+        id2label = getattr(config, "id2label", None) or {}
+        names = [str(id2label[i]).lower() for i in sorted(id2label)]
+        if sorted(names) == sorted(_NLI_LABELS):
+            return names
+        return list(_NLI_DEFAULT_ORDER)
+
+    def _predict_logits(self, pairs):
+        return np.asarray(
+            self.model.predict(pairs, batch_size=self.batch_size, convert_to_numpy=True),
+            dtype=np.float32,
+        )
+
+    def probabilities(self, claims, evidence):
+        """(len(claims), 3) probabilities in LABEL_ORDER (support, contradict, neutral)."""
+        if len(claims) != len(evidence):
+            raise ValueError("claims and evidence must have the same length")
+        pairs, owners = [], []
+        for i, (claim, chunks) in enumerate(zip(claims, evidence)):
+            for chunk in as_chunks(chunks) or [""]:
+                pairs.append((chunk, claim))
+                owners.append(i)
+        probs = np.zeros((len(claims), len(LABEL_ORDER)), dtype=np.float32)
+        if not pairs:
+            return probs
+
+        logits = self._predict_logits(pairs)
+        logits = logits - logits.max(axis=1, keepdims=True)
+        pair_probs = np.exp(logits)
+        pair_probs /= pair_probs.sum(axis=1, keepdims=True)
+        columns = [LABEL_ORDER.index(_NLI_LABELS[name]) for name in self._class_order()]
+        pair_probs = pair_probs[:, np.argsort(columns)]
+
+        # Per claim, keep the pair with the lowest neutral probability.
+        owners = np.asarray(owners)
+        order = np.lexsort((pair_probs[:, LABEL_ORDER.index("neutral")], owners))
+        first = order[np.r_[True, owners[order][1:] != owners[order][:-1]]]
+        probs[owners[first]] = pair_probs[first]
+        return probs
+
+    async def validate(self, claims, evidence):
+        # CPU-bound; run it off the event loop so concurrent API work proceeds.
+        probs = await asyncio.to_thread(self.probabilities, claims, evidence)
+        return [Verdict(LABEL_ORDER[i], row[i]) for i, row in zip(probs.argmax(axis=1), probs)]
+
+    async def stream(self, claims, evidence):
+        """Verdicts batch_size claims at a time; closing stops before the next slice."""
+        if len(claims) != len(evidence):
+            raise ValueError("claims and evidence must have the same length")
+        for start in range(0, len(claims), self.batch_size):
+            stop = start + self.batch_size
+            verdicts = await self.validate(claims[start:stop], evidence[start:stop])
+            for i, verdict in enumerate(verdicts, start):
+                yield i, verdict
+
+
+# Screening confidence needed to skip the LLM, per label. Contradictions
+# decide the verdict, so they need the most certainty.
+CASCADE_THRESHOLDS = {
+    "support": float(os.getenv("CLAIM_VALIDATOR_CASCADE_SUPPORT", "0.9")),
+    "contradict": float(os.getenv("CLAIM_VALIDATOR_CASCADE_CONTRADICT", "0.97")),
+    "neutral": float(os.getenv("CLAIM_VALIDATOR_CASCADE_NEUTRAL", "0.9")),
+}
+# Claims whose best evidence cosine is below this are neutral without any
+# model call (unset = off); needs an embed function.
+_min_similarity = os.getenv("CLAIM_VALIDATOR_CASCADE_MIN_SIMILARITY")
+CASCADE_MIN_SIMILARITY = float(_min_similarity) if _min_similarity else None
+
+
+class CascadeBackend:
+    name = "cascade"
+
+    def __init__(self, screen=None, escalate=None, thresholds=None, embed=None, min_similarity=None):
+        """Label confident claims locally and send only the rest to the LLM.
+
+        screen: backend with probabilities(), by default NLIBackend()
+        escalate: backend for uncertain claims, by default OpenAIBackend()
+        thresholds: per-label screening probability needed to auto-label
+            (missing labels use CASCADE_THRESHOLDS; 1.0 or more never auto-labels)
+        embed: optional texts -> unit vectors (e.g. PathwayStore.embed); with
+            min_similarity (default CASCADE_MIN_SIMILARITY), claims whose best
+            evidence cosine falls below it are labelled neutral before any
+            model runs
+        """
+        self.screen = screen or NLIBackend()
+        self.escalate = escalate or OpenAIBackend()
+        self.thresholds = {**CASCADE_THRESHOLDS, **(thresholds or {})}
+        self.embed = embed
+        self.min_similarity = CASCADE_MIN_SIMILARITY if min_similarity is None else min_similarity
+        self.counts = {"claims": 0, "irrelevant": 0, "screened": 0, "escalated": 0}
+
+    def _similarity(self, claims, evidence):
+        chunk_lists = [as_chunks(e) for e in evidence]
+        texts = list(dict.fromkeys([*claims, *(c for chunks in chunk_lists for c in chunks)]))
+        vectors = dict(zip(texts, self.embed(texts)))
+        return np.array([
+            max((float(vectors[chunk] @ vectors[claim]) for chunk in chunks), default=0.0)
+            for claim, chunks in zip(claims, chunk_lists)
+        ])
+
+    async def validate(self, claims, evidence):
+        labels = [None] * len(claims)
+        async for i, verdict in self.stream(claims, evidence):
+            labels[i] = verdict
+        return labels
+
+    async def stream(self, claims, evidence):
+        """Screened verdicts first, then escalated ones as the LLM returns them."""
+        if len(claims) != len(evidence):
+            raise ValueError("claims and evidence must have the same length")
+        self.counts["claims"] += len(claims)
+        pending = list(range(len(claims)))
+
+        if self.embed is not None and self.min_similarity is not None and pending:
+            similarity = self._similarity(claims, evidence)
+            irrelevant = np.flatnonzero(similarity < self.min_similarity)
+            self.counts["irrelevant"] += len(irrelevant)
+            for i in irrelevant:
+                yield int(i), Verdict("neutral", 1.0 - max(similarity[i], 0.0))
+            pending = [i for i in pending if similarity[i] >= self.min_similarity]
+
+        uncertain = []
+        if pending:
+            probs = await asyncio.to_thread(
+                self.screen.probabilities,
+                [claims[i] for i in pending],
+                [evidence[i] for i in pending],
+            )
+            for i, row in zip(pending, probs):
+                label = LABEL_ORDER[int(row.argmax())]
+                if row.max() >= self.thresholds[label]:
+                    self.counts["screened"] += 1
+                    yield i, Verdict(label, row.max())
+                else:
+                    uncertain.append(i)
+
+        if uncertain:
+            stream = stream_validations(
+                self.escalate, [claims[i] for i in uncertain], [evidence[i] for i in uncertain]
+            )
+            async with contextlib.aclosing(stream):
+                async for j, verdict in stream:
+                    # Counted on arrival, so claims a caller stopped before
+                    # escalating count as calls avoided.
+                    self.counts["escalated"] += 1
+                    yield uncertain[j], verdict
+
+    def stats(self):
+        """Totals so far, including the share of claims that needed no LLM call."""
+        stats = dict(self.counts)
+        stats["calls_avoided"] = stats["claims"] - stats["escalated"]
+        stats["avoided_rate"] = stats["calls_avoided"] / stats["claims"] if stats["claims"] else 0.0
+        return stats
+
+
+BACKENDS = {
+    OpenAIBackend.name: OpenAIBackend,
+    NLIBackend.name: NLIBackend,
+    CascadeBackend.name: CascadeBackend,
+}
+
+
+async def stream_validations(backend, claims, evidence):
+    """(index, Verdict) pairs from backend as they complete.
+
+    Backends without a stream() method are awaited whole.
+    """
+    if hasattr(backend, "stream"):
+        stream = backend.stream(claims, evidence)
+        async with contextlib.aclosing(stream):
+            async for pair in stream:
+                yield pair
+        return
+    for pair in enumerate(await backend.validate(claims, evidence)):
+        yield pair
+
+
+def make_backend(kind=None, **params):
+    """Instantiate a backend by name (default CLAIM_VALIDATOR_BACKEND, else "openai")."""
+    kind = kind or os.getenv("CLAIM_VALIDATOR_BACKEND", "openai")
+    if kind not in BACKENDS:
+        raise ValueError(f"Unknown validator backend {kind!r}; choose from {tuple(BACKENDS)}")
+    return BACKENDS[kind](**params)
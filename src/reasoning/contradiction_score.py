@@ -1,20 +1,28 @@
+import numpy as np
+
+from .verdict import label_codes
+
+# Score contributed by each label code (support, contradict, neutral).
+_WEIGHTS = np.array([0.0, 1.0, 0.5])
+
+
+def claim_scores(validations):
+    """Per-claim contribution to the score: 0 support, 1 contradict, 0.5 neutral."""
+    return _WEIGHTS[label_codes(validations)]
+
+
 def contradiction_score(validations):
     """Calculate contradiction score from validation results.
     
     Args:
-        validations: List of validation results ('support', 'contradict', 'neutral')
+        validations: Labels ('support', 'contradict', 'neutral'), Verdicts, or
+            an integer array of verdict codes; unrecognised labels count as neutral
     
     Returns:
         Float between 0 and 1; higher = more contradictions found
     """
-    if not validations:
+    scores = claim_scores(validations)
+    if scores.size == 0:
         return 0.0
-    
-    score = 0
-    for v in validations:
-        if v == "contradict":
-            score += 1
-        elif v == "neutral":
-            score += 0.5
 
-    return min(score / len(validations), 1.0)
+    return float(min(scores.mean(), 1.0))
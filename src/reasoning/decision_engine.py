@@ -1,3 +1,8 @@
+import contextlib
+
+from .contradiction_score import claim_scores, contradiction_score
+
+
 def final_decision(score, threshold=0.6):
     """Determine narrative consistency based on contradiction score.
     
@@ -9,3 +14,77 @@ def final_decision(score, threshold=0.6):
         1 if consistent (score < threshold), 0 if inconsistent (score >= threshold)
     """
     return 1 if score < threshold else 0
+
+
+class StreamingDecision:
+    """Decision over `total` claims, updated as validations arrive in any order.
+
+    The final score lies between the score if every unvalidated claim turned
+    out to support and the score if every one contradicted; once both bounds
+    fall on the same side of the threshold, the decision can no longer change.
+    """
+
+    def __init__(self, total, threshold=0.6):
+        self.total = total
+        self.threshold = threshold
+        self.validations = [None] * total
+        self.seen = 0
+        self.decided_after = None  # claims validated when the decision settled
+        self._sum = 0.0
+
+    def add(self, index, verdict):
+        if self.validations[index] is not None:
+            raise ValueError(f"claim {index} was already validated")
+        self.validations[index] = verdict
+        self.seen += 1
+        self._sum += float(claim_scores([verdict])[0])
+        if self.decided_after is None and self.decision is not None:
+            self.decided_after = self.seen
+
+    def bounds(self):
+        """(lowest, highest) final contradiction score still possible."""
+        if self.total == 0:
+            return 0.0, 0.0
+        remaining = self.total - self.seen
+        return min(self._sum / self.total, 1.0), min((self._sum + remaining) / self.total, 1.0)
+
+    @property
+    def decision(self):
+        """1 consistent, 0 inconsistent, or None while still open."""
+        low, high = self.bounds()
+        if final_decision(high, self.threshold) == 1:
+            return 1
+        if final_decision(low, self.threshold) == 0:
+            return 0
+        return None
+
+    @property
+    def complete(self):
+        return self.seen == self.total
+
+    def score(self):
+        """Contradiction score once every claim is validated, else None."""
+        return contradiction_score(self.validations) if self.complete else None
+
+
+async def decide_streaming(validations, total, threshold=0.6, finish=False):
+    """Consume (index, verdict) pairs until the decision is settled.
+
+    Args:
+        validations: Async generator of (index, verdict) pairs, e.g.
+            claim_validator.stream_validations(backend, claims, evidence)
+        total: Number of claims being validated
+        threshold: As for final_decision
+        finish: Keep consuming after the decision settles (for a full report)
+
+    Returns:
+        The StreamingDecision. Stopping early closes the generator, which
+        cancels the validations still outstanding; their entries stay None.
+    """
+    tracker = StreamingDecision(total, threshold)
+    async with contextlib.aclosing(validations) as stream:
+        async for index, verdict in stream:
+            tracker.add(index, verdict)
+            if not finish and tracker.decision is not None:
+                break
+    return tracker
@@ -0,0 +1,89 @@
+"""Shrink retrieved evidence to the sentences most relevant to each claim.
+
+Every retrieved chunk is split into sentences. Claims whose evidence is over
+the token budget, and the sentences of that evidence, are embedded in one
+call (through the store's embedding cache, so claim vectors from retrieval
+and sentences seen on earlier runs are not re-encoded), and each such claim
+keeps its highest-scoring sentences until the budget is spent. Kept sentences are returned in their original reading order.
+"""
+import re
+from typing import Callable, List, Sequence
+
+import numpy as np
+
+from .batch_prompt import Evidence, as_chunks
+from .token_counter import count_tokens
+
+# Whitespace after terminal punctuation, optionally followed by a closing
+# quote or bracket that stays with its sentence.
+_SENTENCE_END = re.compile(r"(?:(?<=[.!?])|(?<=[.!?][\"')\]]))\s+")
+
+
+def split_sentences(text: str) -> List[str]:
+    return [s.strip() for s in _SENTENCE_END.split(text) if s.strip()]
+
+
+def compress_evidence(
+    claims: Sequence[str],
+    evidence: Sequence[Evidence],
+    embed: Callable[[List[str]], np.ndarray],
+    budget: int,
+    count: Callable[[str], int] = count_tokens,
+) -> List[List[str]]:
+    """Select claim-relevant sentences from each claim's evidence within budget tokens.
+
+    Args:
+        claims: Claim strings
+        evidence: Retrieved chunks for each claim (a string is one chunk)
+        embed: Maps texts to unit-normalized vectors, e.g. PathwayStore.embed
+        budget: Max evidence tokens per claim
+        count: Token counter
+
+    Returns:
+        Kept sentences per claim, in reading order. Evidence already within
+        budget is returned whole (as its chunks); the best sentence is always
+        kept, even when it alone exceeds the budget.
+    """
+    if budget <= 0:
+        raise ValueError("budget must be positive")
+    if len(claims) != len(evidence):
+        raise ValueError("claims and evidence must have the same length")
+
+    chunk_lists = [as_chunks(e) for e in evidence]
+    sentence_ids = {}
+    per_claim = []
+    for chunks in chunk_lists:
+        ids = []
+        for chunk in chunks:
+            for sentence in split_sentences(chunk):
+                ids.append(sentence_ids.setdefault(sentence, len(sentence_ids)))
+        per_claim.append(ids)
+    sentences = list(sentence_ids)
+    tokens = np.array([count(s) for s in sentences], dtype=np.int64)
+
+    over = [i for i, ids in enumerate(per_claim) if tokens[ids].sum() > budget]
+    if not over:
+        return [list(chunks) for chunks in chunk_lists]
+    # Only sentences some over-budget claim may keep are embedded.
+    needed = np.unique(np.concatenate([per_claim[i] for i in over]))
+    row = np.full(len(sentences), -1, dtype=np.int64)
+    row[needed] = np.arange(len(needed))
+    vectors = embed([claims[i] for i in over] + [sentences[j] for j in needed])
+    claim_vectors, sentence_vectors = vectors[:len(over)], vectors[len(over):]
+
+    compressed = [list(chunks) for chunks in chunk_lists]
+    for claim_vector, i in zip(claim_vectors, over):
+        # A sentence repeated across overlapping chunks is considered once.
+        ids = np.array(list(dict.fromkeys(per_claim[i])), dtype=np.int64)
+        scores = sentence_vectors[row[ids]] @ claim_vector
+        keep, spent = [], 0
+        for position in np.argsort(-scores, kind="stable"):
+            cost = tokens[ids[position]]
+            if keep and spent + cost > budget:
+                continue
+            keep.append(position)
+            spent += cost
+            if spent >= budget:
+                break
+        compressed[i] = [sentences[ids[position]] for position in sorted(keep)]
+    return compressed
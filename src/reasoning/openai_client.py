@@ -0,0 +1,102 @@
+"""Shared OpenAI clients with tunable connection pooling.
+
+A client owns an HTTP connection pool, so building one per call (or per
+Streamlit rerun) pays for a new TCP/TLS handshake each time. Clients are
+built from these settings, on first use:
+
+    CLAIM_VALIDATOR_BASE_URL          OpenAI-compatible endpoint, e.g. a local
+                                      server (default: OPENAI_BASE_URL / OpenAI)
+    CLAIM_VALIDATOR_TIMEOUT           seconds per request (default 60)
+    CLAIM_VALIDATOR_CONNECT_TIMEOUT   seconds to connect (default 10)
+    CLAIM_VALIDATOR_MAX_CONNECTIONS   pool size (default 16)
+    CLAIM_VALIDATOR_KEEPALIVE         idle connections kept open (default: pool size)
+    CLAIM_VALIDATOR_KEEPALIVE_EXPIRY  seconds an idle connection is kept (default 60)
+
+httpx async connections belong to the event loop that opened them, and every
+asyncio.run() starts a new loop. EventLoopThread keeps one loop alive in a
+background thread so an async client living on it keeps its connections
+across runs.
+"""
+import asyncio
+import os
+import threading
+from typing import Optional
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
+
+
+def client_options() -> dict:
+    """Client settings from the environment (see module docstring)."""
+    max_connections = int(os.getenv("CLAIM_VALIDATOR_MAX_CONNECTIONS", "16"))
+    keepalive = os.getenv("CLAIM_VALIDATOR_KEEPALIVE")
+    base_url = os.getenv("CLAIM_VALIDATOR_BASE_URL") or None
+    return {
+        "base_url": base_url,
+        # Local OpenAI-compatible servers usually ignore the key, but the SDK
+        # refuses to start without one.
+        "api_key": os.getenv("OPENAI_API_KEY") or ("unused" if base_url else None),
+        "timeout": httpx.Timeout(
+            float(os.getenv("CLAIM_VALIDATOR_TIMEOUT", "60")),
+            connect=float(os.getenv("CLAIM_VALIDATOR_CONNECT_TIMEOUT", "10")),
+        ),
+        "limits": httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=int(keepalive) if keepalive else max_connections,
+            keepalive_expiry=float(os.getenv("CLAIM_VALIDATOR_KEEPALIVE_EXPIRY", "60")),
+        ),
+    }
+
+
+def build_client(options: Optional[dict] = None) -> OpenAI:
+    """Sync client with the given (default: environment) options."""
+    options = dict(options or client_options())
+    limits = options.pop("limits")
+    # Retries are left to the RequestScheduler, which paces them across callers.
+    return OpenAI(
+        max_retries=0,
+        http_client=DefaultHttpxClient(limits=limits, timeout=options["timeout"]),
+        **options,
+    )
+
+
+def build_async_client(options: Optional[dict] = None) -> AsyncOpenAI:
+    """Async counterpart of build_client."""
+    options = dict(options or client_options())
+    limits = options.pop("limits")
+    return AsyncOpenAI(
+        max_retries=0,
+        http_client=DefaultAsyncHttpxClient(limits=limits, timeout=options["timeout"]),
+        **options,
+    )
+
+
+class EventLoopThread:
+    """An event loop running in a daemon thread for the life of the process."""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self.loop.run_forever, name="claim-validator-loop", daemon=True
+        )
+        self._thread.start()
+
+    def run(self, coro):
+        """Run coro on the loop and block until it returns (or raises)."""
+        if self.loop.is_closed():
+            raise RuntimeError("event loop thread is closed")
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self.loop:
+            coro.close()
+            raise RuntimeError("run() called from the loop it would block; await instead")
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def close(self):
+        if self.loop.is_closed():
+            return
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
@@ -0,0 +1,229 @@
+"""Client-side pacing and retries for LLM requests.
+
+Requests are paced by two token buckets (requests/min and tokens/min) so a
+burst of claims is spread out at the provider's limit instead of being
+rejected. Throttled or transiently failed requests are retried with
+exponential backoff and full jitter, never sooner than the server's
+Retry-After, and a 429 pauses every caller sharing the scheduler. A retry
+budget caps the total retries across all calls so an outage cannot turn into
+an unbounded retry storm.
+"""
+import asyncio
+import email.utils
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from openai import APIConnectionError, APIError, APIStatusError, RateLimitError
+
+from .token_counter import count_tokens
+
+# Replies are JSON: one {"claim": 12, "label": "contradict", "confidence":
+# 0.85} object per verdict (about 20 tokens, more with whitespace) inside a
+# small wrapper. Requests are capped at this size, so it is also what a
+# request can count against a tokens/min limit.
+_VERDICT_TOKENS = 40
+_REPLY_OVERHEAD_TOKENS = 16
+_RETRYABLE_STATUS = {408, 409, 429}
+
+
+def completion_tokens(verdicts: int = 1) -> int:
+    """max_tokens for a reply holding this many verdicts."""
+    return _REPLY_OVERHEAD_TOKENS + _VERDICT_TOKENS * max(1, verdicts)
+
+
+def estimate_tokens(prompt: str, max_tokens: Optional[int] = None) -> int:
+    """Tokens a request counts against a tokens/min limit (prompt + answer).
+
+    max_tokens: the request's completion cap (default: one verdict's worth)
+    """
+    return count_tokens(prompt) + (completion_tokens() if max_tokens is None else max_tokens)
+
+
+class TokenBucket:
+    def __init__(self, per_minute: float, capacity: Optional[float] = None, clock=time.monotonic):
+        """Refills at per_minute / 60 per second, holding at most capacity.
+
+        capacity defaults to one second's worth of refill, which keeps bursts
+        small enough that short-window limits are not tripped either.
+        """
+        if per_minute <= 0:
+            raise ValueError("per_minute must be positive")
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else max(1.0, self.rate)
+        self._clock = clock
+        self._level = self.capacity
+        self._stamp = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """Take amount now and return the seconds to wait before using it.
+
+        The level may go negative, so later callers queue behind earlier ones
+        instead of racing for the refill.
+        """
+        with self._lock:
+            now = self._clock()
+            self._level = min(self.capacity, self._level + (now - self._stamp) * self.rate)
+            self._stamp = now
+            self._level -= amount
+            return max(0.0, -self._level / self.rate)
+
+
+def retry_after(err: Exception) -> Optional[float]:
+    """Seconds the server asked us to wait, from retry-after(-ms) headers."""
+    response = getattr(err, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after-ms")
+    if value is not None:
+        try:
+            return float(value) / 1000.0
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        parsed = email.utils.parsedate_to_datetime(value) if value else None
+        if parsed is None:
+            return None
+        return max(0.0, parsed.timestamp() - time.time())
+
+
+def is_retryable(err: Exception) -> bool:
+    if isinstance(err, (RateLimitError, APIConnectionError)):
+        return True
+    if isinstance(err, APIStatusError):
+        return err.status_code in _RETRYABLE_STATUS or err.status_code >= 500
+    return False
+
+
+class RequestScheduler:
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_retries: int = 6,
+        retry_budget: Optional[int] = None,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        clock=time.monotonic,
+        seed: Optional[int] = None,
+    ):
+        """Paces and retries calls to a rate-limited API.
+
+        requests_per_minute / tokens_per_minute: pacing limits (None = unpaced)
+        max_retries: retries per call before giving up
+        retry_budget: retries allowed across all calls (None = unlimited)
+        base_delay / max_delay: backoff is uniform in [0, min(max, base * 2**n)]
+        """
+        if max_retries < 0:
+            raise ValueError("max_retries must be non-negative")
+        if retry_budget is not None and retry_budget < 0:
+            raise ValueError("retry_budget must be non-negative")
+        self.requests = TokenBucket(requests_per_minute, clock=clock) if requests_per_minute else None
+        self.tokens = (
+            TokenBucket(tokens_per_minute, capacity=tokens_per_minute / 60.0 * 5, clock=clock)
+            if tokens_per_minute else None
+        )
+        self.max_retries = max_retries
+        self.retry_budget = retry_budget
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._clock = clock
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._paused_until = 0.0
+        self.metrics: Dict[str, float] = {
+            "requests": 0,
+            "retries": 0,
+            "rate_limited": 0,
+            "fallbacks": 0,
+            "budget_exhausted": 0,
+            "pacing_wait_s": 0.0,
+            "backoff_wait_s": 0.0,
+        }
+
+    def _count(self, name: str, amount: float = 1) -> None:
+        with self._lock:
+            self.metrics[name] += amount
+
+    def _admission_delay(self, tokens: int) -> float:
+        wait = 0.0
+        if self.requests is not None:
+            wait = max(wait, self.requests.reserve(1))
+        if self.tokens is not None:
+            wait = max(wait, self.tokens.reserve(tokens))
+        with self._lock:
+            wait = max(wait, self._paused_until - self._clock())
+        return max(0.0, wait)
+
+    def _retry_delay(self, err: Exception, attempt: int) -> Optional[float]:
+        """Backoff before retry number attempt, or None to give up."""
+        if isinstance(err, RateLimitError):
+            self._count("rate_limited")
+        if not is_retryable(err) or attempt > self.max_retries:
+            return None
+        with self._lock:
+            if self.retry_budget is not None and self.metrics["retries"] >= self.retry_budget:
+                self.metrics["budget_exhausted"] += 1
+                return None
+            self.metrics["retries"] += 1
+        cap = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        delay = self._random.uniform(0, cap)
+        server = retry_after(err)
+        if server is not None:
+            delay = max(delay, server)
+        if isinstance(err, RateLimitError):
+            # Everyone sharing this quota holds off, not just this caller.
+            with self._lock:
+                self._paused_until = max(self._paused_until, self._clock() + delay)
+        self._count("backoff_wait_s", delay)
+        return delay
+
+    def call(self, fn: Callable, tokens: int = 0, sleep=time.sleep):
+        """Run fn() under pacing and retries; re-raises the last error on give-up."""
+        attempt = 0
+        while True:
+            wait = self._admission_delay(tokens)
+            if wait:
+                self._count("pacing_wait_s", wait)
+                sleep(wait)
+            self._count("requests")
+            try:
+                return fn()
+            except APIError as err:
+                attempt += 1
+                delay = self._retry_delay(err, attempt)
+                if delay is None:
+                    self._count("fallbacks")
+                    raise
+                sleep(delay)
+
+    async def acall(self, fn: Callable, tokens: int = 0):
+        """Async counterpart of call(); fn() returns an awaitable."""
+        attempt = 0
+        while True:
+            wait = self._admission_delay(tokens)
+            if wait:
+                self._count("pacing_wait_s", wait)
+                await asyncio.sleep(wait)
+            self._count("requests")
+            try:
+                return await fn()
+            except APIError as err:
+                attempt += 1
+                delay = self._retry_delay(err, attempt)
+                if delay is None:
+                    self._count("fallbacks")
+                    raise
+                await asyncio.sleep(delay)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(self.metrics)
@@ -1,22 +1,34 @@
-def build_timeline(evidence):
+def build_timeline(evidence, positions=None):
     """Build a structured timeline from evidence list.
     
     Args:
         evidence: List of evidence/event strings
+        positions: Optional story offset of each event (e.g. a ChunkTable
+            span start); events are then ordered by where they occur
     
     Returns:
-        List of timeline entries with event, time, and effect fields
+        List of timeline entries with event, time, and effect fields (plus
+        position when positions are given)
     """
     if not evidence:
         return []
-    
+    if positions is not None and len(positions) != len(evidence):
+        raise ValueError("positions must align with evidence")
+
+    order = range(len(evidence))
+    if positions is not None:
+        order = sorted(order, key=lambda i: positions[i])
+
     timeline = []
-    for i, e in enumerate(evidence):
+    for i, j in enumerate(order):
         # Keep full event text, not truncated
-        timeline.append({
-            "event": e,
+        entry = {
+            "event": evidence[j],
             "time": f"event_{i}",  # Placeholder for chronological ordering
             "effect": "under_review"  # Mark for further analysis
-        })
+        }
+        if positions is not None:
+            entry["position"] = positions[j]
+        timeline.append(entry)
 
     return timeline
@@ -0,0 +1,42 @@
+"""Prompt token counting.
+
+Counts are a heuristic: word and punctuation pieces, which track BPE token
+counts for English prose closely enough for budgeting and pacing. tiktoken is
+not a dependency of this project; if it happens to be installed, the model's
+exact encoding is used instead.
+"""
+import re
+from functools import lru_cache
+from typing import Optional
+
+_PIECE = re.compile(r"\w+|[^\w\s]")
+# BPE splits long or rare words; English prose averages ~1.3 tokens a word.
+_TOKENS_PER_WORD = 1.3
+
+
+@lru_cache(maxsize=None)
+def _encoding(model: str):
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def count_tokens(text: str, model: Optional[str] = "gpt-3.5-turbo") -> int:
+    """Tokens in text for model (None forces the heuristic)."""
+    if not text:
+        return 0
+    encoding = _encoding(model) if model else None
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    words = punctuation = 0
+    for piece in _PIECE.findall(text):
+        if piece[0].isalnum() or piece[0] == "_":
+            words += 1
+        else:
+            punctuation += 1
+    return int(round(words * _TOKENS_PER_WORD)) + punctuation
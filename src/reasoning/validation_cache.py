@@ -0,0 +1,87 @@
+import hashlib
+import os
+import time
+from typing import Optional
+
+try:
+    from ..retrieval.sqlite_cache import SQLiteCache
+except ImportError:  # imported as top-level "reasoning", with src on sys.path
+    from retrieval.sqlite_cache import SQLiteCache
+
+DEFAULT_CACHE_PATH = os.getenv(
+    "CLAIM_VALIDATOR_CACHE", os.path.join(".cache", "validations.sqlite")
+)
+
+
+def validation_key(model: str, temperature: float, prompt: str) -> str:
+    """Content address for one LLM verdict: model + temperature + rendered prompt."""
+    h = hashlib.sha256()
+    h.update(model.encode("utf-8"))
+    h.update(b"\0")
+    h.update(repr(float(temperature)).encode("ascii"))
+    h.update(b"\0")
+    h.update(prompt.encode("utf-8"))
+    return h.hexdigest()
+
+
+class ValidationCache(SQLiteCache):
+    table = "validations"
+    columns = "label TEXT NOT NULL, created REAL NOT NULL"
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        max_entries: Optional[int] = None,
+        ttl: Optional[float] = None,
+    ):
+        """On-disk cache of validation labels backed by SQLite.
+
+        path: SQLite file (":memory:" for a throwaway cache)
+        max_entries: evict least recently used labels beyond this many
+        ttl: seconds a label stays valid after it was stored (None = forever)
+        """
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be positive")
+        super().__init__(path, max_entries)
+        self.ttl = ttl
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached label for key, or None if absent or expired."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT label, created FROM validations WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self._expired(row[1]):
+                self._conn.execute("DELETE FROM validations WHERE key = ?", (key,))
+                self._conn.commit()
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE validations SET last_used = ? WHERE key = ?", (time.time_ns(), key)
+            )
+            self._conn.commit()
+            self.hits += 1
+        return row[0]
+
+    def put(self, key: str, label: str) -> None:
+        """Store a label, then drop expired entries and evict down to max_entries."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO validations (key, label, created, last_used)"
+                " VALUES (?, ?, ?, ?)",
+                (key, label, time.time(), time.time_ns()),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _expired(self, created: float) -> bool:
+        return self.ttl is not None and time.time() - created > self.ttl
+
+    def _evict(self) -> None:
+        if self.ttl is not None:
+            self._conn.execute(
+                "DELETE FROM validations WHERE created < ?", (time.time() - self.ttl,)
+            )
+        super()._evict()
@@ -0,0 +1,149 @@
+"""Normalized validator verdicts.
+
+Whatever a validator returns ("Supports.", '{"label": "CONTRADICT"}', "The
+evidence is insufficient") is mapped deterministically onto one of three
+labels, each with an integer code so scoring can run over numpy arrays
+instead of comparing strings.
+"""
+import json
+import re
+from typing import Optional, Sequence
+
+import numpy as np
+
+LABELS = ("support", "contradict", "neutral")
+SUPPORT, CONTRADICT, NEUTRAL = range(len(LABELS))
+_CODES = {label: code for code, label in enumerate(LABELS)}
+
+# Cues per label, matched against lowercased text; the earliest cue in the
+# text wins. A negated support or contradict cue ("not supported", "no
+# contradiction", "cannot support") is neutral instead.
+_CUES = [
+    (re.compile(r"\bcontradict|\brefut|\binconsistent\b"), "contradict"),
+    (re.compile(r"\bneutral\b|\binsufficient\b|\bnot enough\b|\bunknown\b|\bunclear\b"
+                r"|\bcannot be determined\b"), "neutral"),
+    (re.compile(r"\bsupport|\bentail|\bconsistent\b"), "support"),
+]
+_NEGATED = re.compile(r"(?:\b(?:not|no|neither|nor|cannot)|n't)\W+(?:\w+\W+){0,2}$")
+
+
+class Verdict(str):
+    """A label string that also carries the validator's confidence (0-1 or None).
+
+    It compares equal to its plain label, so code matching "contradict" keeps
+    working while scoring can read .code and .confidence.
+    """
+
+    def __new__(cls, label: str, confidence: Optional[float] = None):
+        if label not in _CODES:
+            raise ValueError(f"Unknown label {label!r}; choose from {LABELS}")
+        verdict = super().__new__(cls, label)
+        verdict.confidence = None if confidence is None else min(max(float(confidence), 0.0), 1.0)
+        return verdict
+
+    @property
+    def label(self) -> str:
+        return str(self)
+
+    @property
+    def code(self) -> int:
+        return _CODES[self]
+
+    def __repr__(self) -> str:
+        return f"Verdict({str(self)!r}, confidence={self.confidence!r})"
+
+    def __reduce__(self):
+        return (Verdict, (str(self), self.confidence))
+
+
+def parse_label(text) -> Optional[str]:
+    """Map free-text variants onto a label; None if the text names none.
+
+    "Supports.", "SUPPORTED" and "entailment" are support; "refuted" and
+    "inconsistent" are contradict. Negated cues, "does not support" or "no
+    contradiction", are neutral: absence of one is not evidence of the other.
+    """
+    if not isinstance(text, str):
+        return None
+    text = text.lower()
+    earliest = None
+    for pattern, label in _CUES:
+        match = pattern.search(text)
+        if match and (earliest is None or match.start() < earliest[0]):
+            earliest = (match.start(), label)
+    if earliest is None:
+        return None
+    start, label = earliest
+    if label in ("support", "contradict") and _NEGATED.search(text[:start]):
+        return "neutral"
+    return label
+
+
+def _json_object(text: str) -> Optional[dict]:
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end < start:
+        return None
+    try:
+        data = json.loads(text[start:end + 1])
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def parse_confidence(value) -> Optional[float]:
+    """A 0-1 confidence from a number, numeric string or percentage."""
+    if isinstance(value, str):
+        value = value.strip().rstrip("%")
+        try:
+            number = float(value)
+        except ValueError:
+            return None
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        number = float(value)
+    else:
+        return None
+    if number > 1:
+        number /= 100.0
+    return number if 0 <= number <= 1 else None
+
+
+def parse_verdict(text, fallback: str = "neutral") -> Verdict:
+    """Verdict from a validator reply: a JSON object with label/confidence or plain text.
+
+    Replies that name no label (or no reply at all) give the fallback label
+    with confidence 0.
+    """
+    if isinstance(text, Verdict):
+        return text
+    data = _json_object(text) if isinstance(text, str) else None
+    if data is not None:
+        label = parse_label(data.get("label", data.get("verdict")))
+        if label is not None:
+            return Verdict(label, parse_confidence(data.get("confidence")))
+    label = parse_label(text)
+    if label is None:
+        return Verdict(fallback, 0.0)
+    return Verdict(label)
+
+
+def label_codes(validations: Sequence) -> np.ndarray:
+    """int8 codes (SUPPORT, CONTRADICT, NEUTRAL) for labels, verdicts or codes.
+
+    Strings are parsed like validator replies; anything unrecognised is
+    NEUTRAL rather than silently counting as support.
+    """
+    if isinstance(validations, np.ndarray) and validations.dtype.kind in "iu":
+        return validations.astype(np.int8, copy=False)
+    codes = np.empty(len(validations), dtype=np.int8)
+    for i, v in enumerate(validations):
+        code = _CODES.get(v) if isinstance(v, str) else None
+        if code is None:
+            code = _CODES.get(parse_label(v), NEUTRAL)
+        codes[i] = code
+    return codes
+
+
+def confidences(validations: Sequence) -> np.ndarray:
+    """float32 confidences, NaN where a validation carries none."""
+    values = [getattr(v, "confidence", None) for v in validations]
+    return np.array([np.nan if c is None else c for c in values], dtype=np.float32)
@@ -0,0 +1,167 @@
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+import numpy as np
+
+DEFAULT_MODEL = "all-MiniLM-L6-v2"
+
+# Shards handed to each worker per encode call; more than one per worker
+# keeps the pool busy when chunk lengths (and so encode times) vary.
+_SHARDS_PER_WORKER = 4
+
+
+class EmbeddingProvider:
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        device: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        workers: Optional[int] = None,
+        threads: Optional[int] = None,
+    ):
+        """Sentence-transformers encoder that loads its model on first use.
+
+        Unset arguments fall back to CHRONOREASON_EMBEDDING_MODEL,
+        CHRONOREASON_EMBEDDING_DEVICE, CHRONOREASON_EMBEDDING_BATCH_SIZE and
+        CHRONOREASON_EMBEDDING_WORKERS.
+
+        workers: processes to shard large encode calls across (1 = serial).
+            Workers are spawned and re-import the main module, so scripts
+            must run their pipeline under if __name__ == "__main__".
+        threads: torch intra-op threads for this process (None = torch default)
+        """
+        self.model_name = model_name or os.getenv("CHRONOREASON_EMBEDDING_MODEL", DEFAULT_MODEL)
+        self.device = device or os.getenv("CHRONOREASON_EMBEDDING_DEVICE") or None
+        if batch_size is None:
+            batch_size = int(os.getenv("CHRONOREASON_EMBEDDING_BATCH_SIZE", "32"))
+        if workers is None:
+            workers = int(os.getenv("CHRONOREASON_EMBEDDING_WORKERS", "1"))
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
+        if workers < 1:
+            raise ValueError("workers must be positive")
+        self.batch_size = batch_size
+        self.workers = workers
+        self.threads = threads
+        self._model = None
+        self._lock = threading.Lock()
+        self._pool = None
+
+    def __getstate__(self):
+        # Workers receive the configuration only and load their own model.
+        state = self.__dict__.copy()
+        state.update(_model=None, _lock=None, _pool=None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @property
+    def model(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    # Imported here so importing the retrieval package never pulls in torch.
+                    from sentence_transformers import SentenceTransformer
+                    if self.threads:
+                        import torch
+                        torch.set_num_threads(self.threads)
+                    self._model = SentenceTransformer(self.model_name, device=self.device)
+        return self._model
+
+    @property
+    def loaded(self) -> bool:
+        return self._model is not None
+
+    def dimension(self) -> int:
+        return self.model.get_sentence_embedding_dimension()
+
+    def encode(self, texts: List[str], normalize: bool = True) -> np.ndarray:
+        """Encode texts into a (len(texts), dim) float32 matrix.
+
+        With workers > 1, calls larger than a couple of batches are split into
+        contiguous shards encoded in a process pool and stacked back in order.
+        """
+        if not texts:
+            return np.empty((0, self.dimension()), dtype=np.float32)
+        if self.workers > 1 and len(texts) > 2 * self.batch_size:
+            return self._encode_parallel(list(texts), normalize)
+        return self._encode_serial(texts, normalize)
+
+    def _encode_serial(self, texts: List[str], normalize: bool) -> np.ndarray:
+        return self.model.encode(
+            list(texts),
+            batch_size=self.batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=normalize,
+        ).astype(np.float32, copy=False)
+
+    def _encode_parallel(self, texts: List[str], normalize: bool) -> np.ndarray:
+        shard = max(self.batch_size, math.ceil(len(texts) / (self.workers * _SHARDS_PER_WORKER)))
+        shards = [texts[i:i + shard] for i in range(0, len(texts), shard)]
+        pool = self._get_pool()
+        parts = pool.map(_encode_shard, shards, [normalize] * len(shards))
+        return np.concatenate(list(parts), axis=0)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                worker = self.__class__.__new__(self.__class__)
+                worker.__setstate__(self.__getstate__())
+                worker.workers = 1
+                worker.threads = self.threads or max(1, (os.cpu_count() or 1) // self.workers)
+                # spawn, not fork: forking a process that already runs torch
+                # threads can deadlock the children.
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(worker,),
+                )
+        return self._pool
+
+    def close(self) -> None:
+        """Shut down the worker pool, if one was started."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
+
+
+_worker_provider = None
+
+
+def _init_worker(provider: EmbeddingProvider) -> None:
+    global _worker_provider
+    _worker_provider = provider
+
+
+def _encode_shard(texts: List[str], normalize: bool) -> np.ndarray:
+    return _worker_provider._encode_serial(texts, normalize)
+
+
+_default_provider = None
+_default_lock = threading.Lock()
+
+
+def get_provider() -> EmbeddingProvider:
+    """Process-wide provider shared by every store that is not given its own."""
+    global _default_provider
+    if _default_provider is None:
+        with _default_lock:
+            if _default_provider is None:
+                _default_provider = EmbeddingProvider()
+    return _default_provider
+
+
+def set_provider(provider: Optional[EmbeddingProvider]) -> Optional[EmbeddingProvider]:
+    """Replace the process-wide provider (None resets it); returns the old one."""
+    global _default_provider
+    with _default_lock:
+        previous, _default_provider = _default_provider, provider
+    return previous
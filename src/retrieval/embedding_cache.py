@@ -0,0 +1,84 @@
+import hashlib
+import os
+import time
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from .sqlite_cache import SQLiteCache
+
+DEFAULT_CACHE_PATH = os.getenv(
+    "CHRONOREASON_EMBEDDING_CACHE", os.path.join(".cache", "embeddings.sqlite")
+)
+
+# SQLite caps the number of bound parameters per statement.
+_BATCH = 500
+
+
+def embedding_key(model_name: str, normalize: bool, text: str) -> str:
+    """Content address for one embedding: model + normalization flag + text."""
+    h = hashlib.sha256()
+    h.update(model_name.encode("utf-8"))
+    h.update(b"\0")
+    h.update(b"1" if normalize else b"0")
+    h.update(b"\0")
+    h.update(text.encode("utf-8"))
+    return h.hexdigest()
+
+
+class EmbeddingCache(SQLiteCache):
+    table = "embeddings"
+    columns = "dim INTEGER NOT NULL, vector BLOB NOT NULL"
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_entries: Optional[int] = None):
+        """On-disk float32 embedding cache backed by SQLite.
+
+        path: SQLite file (":memory:" for a throwaway cache)
+        max_entries: evict least recently used vectors beyond this many
+        """
+        super().__init__(path, max_entries)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, np.ndarray]:
+        """Return cached vectors for the keys that are present."""
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        with self._lock:
+            for i in range(0, len(keys), _BATCH):
+                batch = keys[i:i + _BATCH]
+                marks = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, dim, vector FROM embeddings WHERE key IN ({marks})",
+                    batch,
+                ).fetchall()
+                for key, dim, blob in rows:
+                    vec = np.frombuffer(blob, dtype=np.float32)
+                    if vec.shape[0] == dim:
+                        found[key] = vec
+            if found:
+                now = time.time_ns()
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                    [(now, key) for key in found],
+                )
+                self._conn.commit()
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, items: Dict[str, np.ndarray]) -> None:
+        """Store vectors, then evict down to max_entries if needed."""
+        if not items:
+            return
+        now = time.time_ns()
+        rows = []
+        for key, vec in items.items():
+            vec = np.ascontiguousarray(vec, dtype=np.float32)
+            rows.append((key, vec.shape[0], vec.tobytes(), now))
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, dim, vector, last_used)"
+                " VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._evict()
+            self._conn.commit()
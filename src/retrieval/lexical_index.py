@@ -0,0 +1,178 @@
+"""BM25 inverted index over chunk texts.
+
+Postings are stored CSR-style in flat arrays: the postings of term t are
+doc_ids[term_offsets[t]:term_offsets[t + 1]] with matching term frequencies,
+so scoring a query is a handful of slice additions. Document frequencies and
+lengths enter the score at query time, which lets the index follow a
+changing store: added chunks are tokenized alone and their postings go to an
+unsorted tail, removed chunks' postings are only marked dead (doc id -1) and
+the rest renumbered, and both are folded back into the CSR arrays once they
+reach _MERGE_FRACTION of them. Scores always equal a fresh build's.
+"""
+import re
+from collections import Counter
+from typing import Dict, List
+
+import numpy as np
+
+from .vector_index import append_rows
+
+_TOKEN = re.compile(r"\w+")
+
+# Tail and dead postings are merged into the CSR arrays past this fraction.
+_MERGE_FRACTION = 0.25
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+class BM25Index:
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._reset()
+
+    def _reset(self) -> None:
+        self.vocabulary: Dict[str, int] = {}
+        self.term_offsets = np.zeros(1, dtype=np.int64)
+        self.doc_ids = np.empty(0, dtype=np.int32)
+        self.tfs = np.empty(0, dtype=np.float32)
+        self.n_docs = 0
+        self._lengths = np.empty(0, dtype=np.float32)  # with spare capacity
+        # Postings added since the last merge, with the tail positions of each term's.
+        self._tail_terms = np.empty(0, dtype=np.int64)
+        self._tail_docs = np.empty(0, dtype=np.int32)
+        self._tail_tfs = np.empty(0, dtype=np.float32)
+        self._tail_size = 0
+        self._tail_at: Dict[int, List[int]] = {}
+        self._dead = 0
+
+    @property
+    def doc_lengths(self) -> np.ndarray:
+        return self._lengths[:self.n_docs]
+
+    def build(self, chunks: List[str]) -> None:
+        self._reset()
+        self.add(chunks)
+        self._merge()
+
+    def add(self, chunks: List[str]) -> None:
+        """Index chunks appended after the current ones, tokenizing only them."""
+        lengths = self._post(chunks, self.n_docs)
+        self._lengths = append_rows(self._lengths, self.n_docs, lengths)
+        self.n_docs += len(chunks)
+        self._maybe_merge()
+
+    def remove(self, ids) -> None:
+        """Drop chunks by sorted position before the change; later chunks shift down."""
+        ids = np.asarray(ids, dtype=np.int64)
+        if not ids.size:
+            return
+        self.doc_ids = self._renumber(self.doc_ids, ids)
+        tail = self._tail_docs[:self._tail_size]
+        tail[:] = self._renumber(tail, ids)
+        self._lengths = np.delete(self.doc_lengths, ids)
+        self.n_docs = len(self._lengths)
+        self._maybe_merge()
+
+    def update(self, index: int, text: str) -> None:
+        """Replace one chunk's text, tokenizing only it."""
+        for docs in (self.doc_ids, self._tail_docs[:self._tail_size]):
+            dead = docs == index
+            docs[dead] = -1
+            self._dead += int(dead.sum())
+        self._lengths[index] = self._post([text], index)[0]
+        self._maybe_merge()
+
+    def _post(self, chunks: List[str], first: int) -> np.ndarray:
+        """Add the chunks' postings to the tail as docs first, first + 1, ...; returns lengths."""
+        term_ids, doc_ids, tfs = [], [], []
+        lengths = np.zeros(len(chunks), dtype=np.float32)
+        for i, chunk in enumerate(chunks):
+            counts = Counter(tokenize(chunk))
+            lengths[i] = sum(counts.values())
+            for term, tf in counts.items():
+                t = self.vocabulary.setdefault(term, len(self.vocabulary))
+                self._tail_at.setdefault(t, []).append(self._tail_size + len(term_ids))
+                term_ids.append(t)
+                doc_ids.append(first + i)
+                tfs.append(tf)
+        size = self._tail_size
+        self._tail_terms = append_rows(self._tail_terms, size, np.asarray(term_ids, dtype=np.int64))
+        self._tail_docs = append_rows(self._tail_docs, size, np.asarray(doc_ids, dtype=np.int32))
+        self._tail_tfs = append_rows(self._tail_tfs, size, np.asarray(tfs, dtype=np.float32))
+        self._tail_size += len(term_ids)
+        return lengths
+
+    def _renumber(self, docs: np.ndarray, removed: np.ndarray) -> np.ndarray:
+        gone = (docs >= 0) & np.isin(docs, removed)
+        self._dead += int(gone.sum())
+        shifted = (docs - np.searchsorted(removed, docs)).astype(np.int32)
+        shifted[gone | (docs < 0)] = -1
+        return shifted
+
+    def _maybe_merge(self) -> None:
+        if self._tail_size + self._dead > _MERGE_FRACTION * len(self.doc_ids):
+            self._merge()
+
+    def _merge(self) -> None:
+        """Sort the tail into the CSR arrays and drop dead postings; nothing is re-tokenized."""
+        size = self._tail_size
+        n_terms = len(self.vocabulary)
+        terms = np.concatenate([
+            np.repeat(np.arange(len(self.term_offsets) - 1), np.diff(self.term_offsets)),
+            self._tail_terms[:size],
+        ])
+        docs = np.concatenate([self.doc_ids, self._tail_docs[:size]])
+        tfs = np.concatenate([self.tfs, self._tail_tfs[:size]])
+        live = np.flatnonzero(docs >= 0)
+        order = live[np.argsort(terms[live], kind="stable")]
+        self.doc_ids = docs[order]
+        self.tfs = tfs[order]
+        self.term_offsets = np.zeros(n_terms + 1, dtype=np.int64)
+        np.cumsum(np.bincount(terms[order], minlength=n_terms), out=self.term_offsets[1:])
+        self._tail_size = 0
+        self._tail_at = {}
+        self._dead = 0
+
+    def _postings(self, t: int):
+        """Live (doc ids, term frequencies) of term t, from the CSR arrays and the tail."""
+        lo = hi = 0
+        if t + 1 < len(self.term_offsets):  # terms new since the last merge have none
+            lo, hi = self.term_offsets[t], self.term_offsets[t + 1]
+        docs, tfs = self.doc_ids[lo:hi], self.tfs[lo:hi]
+        at = self._tail_at.get(t)
+        if at:
+            docs = np.concatenate([docs, self._tail_docs[at]])
+            tfs = np.concatenate([tfs, self._tail_tfs[at]])
+        live = docs >= 0
+        return docs[live], tfs[live]
+
+    def scores(self, query: str) -> np.ndarray:
+        """BM25 score of every chunk for query (0 where no term matches)."""
+        scores = np.zeros(self.n_docs, dtype=np.float32)
+        if not self.n_docs:
+            return scores
+        avgdl = max(float(self.doc_lengths.mean()), 1e-9)
+        for term in tokenize(query):
+            t = self.vocabulary.get(term)
+            if t is None:
+                continue
+            docs, tfs = self._postings(t)
+            if not docs.size:
+                continue
+            # A term posts each document at most once, so plain fancy-index
+            # addition is safe here.
+            idf = np.log1p((self.n_docs - docs.size + 0.5) / (docs.size + 0.5))
+            norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[docs] / avgdl)
+            scores[docs] += (idf * tfs * (self.k1 + 1) / (tfs + norm)).astype(np.float32)
+        return scores
+
+    @property
+    def nbytes(self) -> int:
+        return (
+            self.term_offsets.nbytes + self.doc_ids.nbytes + self.tfs.nbytes
+            + self._lengths.nbytes + self._tail_docs.nbytes + self._tail_tfs.nbytes
+            + self._tail_terms.nbytes
+        )
@@ -1,34 +1,362 @@
-from typing import List
+import os
+from collections.abc import Sequence
+from typing import Collection, List, Optional, Tuple, Union
 import numpy as np
-from sentence_transformers import SentenceTransformer
 
-# Load embedding model
-model = SentenceTransformer("all-MiniLM-L6-v2")
+from .embedder import EmbeddingProvider, get_provider
+from .embedding_cache import EmbeddingCache, embedding_key
+from .lexical_index import BM25Index
+from .store_file import chunks_fingerprint, read_header, read_sources, read_store, write_store
+from .vector_index import make_index, top_k_indices
+
+SEARCH_MODES = ("dense", "lexical", "hybrid")
+
+# Hybrid search fuses dense and lexical scores over this many candidates per
+# requested result from each side.
+_HYBRID_OVERSAMPLE = 4
+
 
 class PathwayStore:
-    def __init__(self, chunks: List[str]):
+    def __init__(
+        self,
+        chunks: List[str],
+        cache: Optional[EmbeddingCache] = None,
+        index: Union[str, object] = "exact",
+        provider: Optional[EmbeddingProvider] = None,
+        index_options: Optional[dict] = None,
+    ):
         """Simple in-memory store with precomputed embeddings.
 
-        chunks: List[str]
+        chunks: List[str], or a read-only sequence of them such as a
+            ChunkTable, which is kept as is (copied to a list on first change)
+        cache: optional EmbeddingCache; only chunks missing from it are encoded
+        index: backend name ("exact", "ivf") or a vector_index instance
+        provider: embedding provider (defaults to the shared get_provider())
+        index_options: keyword arguments for a backend given by name, e.g.
+            {"precision": "int8", "rerank": 4}
         """
-        self.chunks = chunks
-        self.embeddings = self._embed_chunks(chunks)
+        if isinstance(chunks, Sequence) and not isinstance(chunks, (list, str)):
+            self.chunks = chunks
+        else:
+            self.chunks = list(chunks)
+        self.sources = [None] * len(self.chunks)
+        self.cache = cache
+        self.provider = provider or get_provider()
+        self.embeddings = self._embed_chunks(self.chunks)
+        self._set_index(index, index_options)
+        self._lexical = None
 
-    def _embed_chunks(self, chunks: List[str]) -> np.ndarray:
+    @property
+    def lexical(self) -> BM25Index:
+        """BM25 index over the chunks, built on first use by lexical, hybrid or
+        prefilter search, then updated with only the chunks that change.
+        """
+        if self._lexical is None:
+            self._lexical = BM25Index()
+            self._lexical.build(self.chunks)
+        return self._lexical
+
+    @property
+    def embeddings(self) -> np.ndarray:
+        """(len(chunks), dim) matrix; a view into a buffer with spare capacity."""
+        return self._buffer[:self._size]
+
+    @embeddings.setter
+    def embeddings(self, matrix: np.ndarray) -> None:
+        self._buffer = matrix
+        self._size = matrix.shape[0]
+
+    def _set_index(self, index: Union[str, object], options: Optional[dict] = None) -> None:
+        self.index = make_index(index, **(options or {})) if isinstance(index, str) else index
+        self.index.build(self.embeddings)
+
+    def _refresh_index(
+        self, removed: Optional[np.ndarray] = None, changed: Optional[np.ndarray] = None
+    ) -> None:
+        """Tell the index what changed: rows past those it holds are new, removed
+        are dropped positions (before the shift), changed were re-embedded in place.
+        """
+        refresh = getattr(self.index, "refresh", None)
+        if refresh is None:
+            self.index.build(self.embeddings)
+            return
+        delta = {}
+        if removed is not None:
+            delta["removed"] = removed
+        if changed is not None:
+            delta["changed"] = changed
+        refresh(self.embeddings, **delta)
+
+    def _reserve(self, extra: int) -> None:
+        """Make room for extra rows, doubling capacity instead of stacking per append.
+
+        Memory-mapped (read-only) matrices are copied into RAM on first write.
+        """
+        needed = self._size + extra
+        capacity = self._buffer.shape[0]
+        if needed <= capacity and self._buffer.flags.writeable:
+            return
+        if needed > capacity:
+            capacity = max(needed, 2 * capacity, 16)
+        buffer = np.empty((capacity, self._buffer.shape[1]), dtype=np.float32)
+        buffer[:self._size] = self._buffer[:self._size]
+        self._buffer = buffer
+
+    def _writable_chunks(self) -> List[str]:
+        if not isinstance(self.chunks, list):
+            self.chunks = list(self.chunks)
+        return self.chunks
+
+    def add_chunks(self, chunks: List[str], source: Optional[str] = None) -> List[int]:
+        """Append chunks, embedding only them; returns their new positions.
+
+        source: optional tag (e.g. file path) for later remove_source()
+        """
+        chunks = list(chunks)
         if not chunks:
-            dim = model.get_sentence_embedding_dimension()
-            return np.empty((0, dim), dtype=np.float32)
-        return model.encode(
-            chunks,
-            convert_to_numpy=True,
-            normalize_embeddings=True,
-        )
-
-    def search(self, query: str, top_k: int = 3) -> List[str]:
-        if not self.chunks:
             return []
-        q = model.encode(query, convert_to_numpy=True, normalize_embeddings=True)
-        scores = self.embeddings @ q
-        k = min(top_k, len(self.chunks))
-        top_indices = np.argsort(-scores)[:k]
-        return [self.chunks[i] for i in top_indices]
+        vectors = self._embed_chunks(chunks)
+        self._reserve(len(chunks))
+        start = self._size
+        self._buffer[start:start + len(chunks)] = vectors
+        self._size += len(chunks)
+        self._writable_chunks().extend(chunks)
+        self.sources.extend([source] * len(chunks))
+        self._refresh_index()
+        if self._lexical is not None:
+            self._lexical.add(chunks)
+        return list(range(start, self._size))
+
+    def remove_chunks(self, indices: List[int]) -> None:
+        """Drop chunks by position; later chunks shift down to fill the gaps."""
+        keep = np.ones(self._size, dtype=bool)
+        for i in indices:
+            if not -self._size <= i < self._size:
+                raise IndexError(f"chunk index {i} out of range")
+            keep[i] = False
+        if keep.all():
+            return
+        self._reserve(0)
+        remaining = int(keep.sum())
+        self._buffer[:remaining] = self._buffer[:self._size][keep]
+        self._size = remaining
+        self.chunks = [chunk for chunk, kept in zip(self.chunks, keep) if kept]
+        self.sources = [source for source, kept in zip(self.sources, keep) if kept]
+        removed = np.flatnonzero(~keep)
+        self._refresh_index(removed=removed)
+        if self._lexical is not None:
+            self._lexical.remove(removed)
+
+    def remove_source(self, source: str) -> int:
+        """Drop every chunk added with this source tag; returns how many."""
+        indices = [i for i, tag in enumerate(self.sources) if tag == source]
+        self.remove_chunks(indices)
+        return len(indices)
+
+    def update_chunk(self, index: int, text: str) -> None:
+        """Replace one chunk's text and re-embed just that chunk."""
+        if not -self._size <= index < self._size:
+            raise IndexError(f"chunk index {index} out of range")
+        vector = self._embed_chunks([text])
+        index %= self._size
+        self._reserve(0)
+        self._buffer[index] = vector[0]
+        self._writable_chunks()[index] = text
+        self._refresh_index(changed=np.array([index]))
+        if self._lexical is not None:
+            self._lexical.update(index, text)
+
+    def save(self, path: str) -> None:
+        """Write chunks, embeddings and source tags to a file that load() can memory-map."""
+        write_store(path, self.chunks, self.embeddings, self.provider.model_name, self.sources)
+
+    @classmethod
+    def load(
+        cls,
+        path: str,
+        index: Union[str, object] = "exact",
+        provider: Optional[EmbeddingProvider] = None,
+        index_options: Optional[dict] = None,
+    ) -> "PathwayStore":
+        """Open a saved store without re-encoding anything.
+
+        The embedding matrix is a read-only np.memmap, so processes serving
+        the same file share the operating system's page cache, and a
+        compressed index without rerank is the only copy held in RAM.
+        """
+        provider = provider or get_provider()
+        chunks, embeddings, header = read_store(path)
+        if header["model"] != provider.model_name:
+            raise ValueError(
+                f"{path} was built with {header['model']!r}, not {provider.model_name!r}"
+            )
+        store = cls.__new__(cls)
+        store.chunks = chunks
+        store.sources = read_sources(header)
+        store.cache = None
+        store.provider = provider
+        store.embeddings = embeddings
+        store._set_index(index, index_options)
+        store._lexical = None
+        return store
+
+    @classmethod
+    def load_or_build(
+        cls,
+        path: str,
+        chunks: List[str],
+        cache: Optional[EmbeddingCache] = None,
+        index: Union[str, object] = "exact",
+        provider: Optional[EmbeddingProvider] = None,
+        index_options: Optional[dict] = None,
+    ) -> "PathwayStore":
+        """Load path if it holds exactly these chunks, else build and save it first.
+
+        Either way the store is opened with load(), so a fresh build also
+        ends up with a memory-mapped matrix rather than a float32 copy in RAM.
+        """
+        provider = provider or get_provider()
+        try:
+            header = read_header(path) if os.path.exists(path) else {}
+            store = None
+            if (header.get("fingerprint") == chunks_fingerprint(chunks)
+                    and header.get("model") == provider.model_name):
+                store = cls.load(path, index=index, provider=provider, index_options=index_options)
+        except ValueError:
+            store = None  # corrupt or truncated file: rebuild it
+        if store is None:
+            # Plain exact search only references the matrix, so this index is free.
+            cls(chunks, cache=cache, provider=provider).save(path)
+            store = cls.load(path, index=index, provider=provider, index_options=index_options)
+        store.cache = cache
+        if isinstance(chunks, Sequence) and not isinstance(chunks, (list, str)):
+            # Same texts; keep the caller's compact sequence (e.g. a
+            # ChunkTable, whose spans locate chunks in the source).
+            store.chunks = chunks
+        return store
+
+    def _embed_chunks(self, chunks: List[str]) -> np.ndarray:
+        if not chunks or self.cache is None:
+            return self.provider.encode(chunks)
+
+        keys = [embedding_key(self.provider.model_name, True, chunk) for chunk in chunks]
+        cached = self.cache.get_many(keys)
+        # Encode each distinct missing text once, even if it repeats.
+        missing = {}
+        for key, chunk in zip(keys, chunks):
+            if key not in cached and key not in missing:
+                missing[key] = chunk
+        if missing:
+            fresh = self.provider.encode(list(missing.values()))
+            computed = dict(zip(missing.keys(), fresh))
+            self.cache.put_many(computed)
+            cached.update(computed)
+        return np.stack([cached[key] for key in keys]).astype(np.float32, copy=False)
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """Normalized embeddings of texts, served from the cache where possible."""
+        return self._embed_chunks(list(texts))
+
+    def search(self, query: str, top_k: int = 3, **options) -> List[str]:
+        """Top chunks for one query; options as for search_many."""
+        return [chunk for chunk, _ in self.search_many([query], top_k=top_k, **options)[0]]
+
+    def search_many(
+        self,
+        queries: List[str],
+        top_k: int = 3,
+        mode: str = "dense",
+        alpha: float = 0.5,
+        prefilter: Optional[int] = None,
+        sources: Optional[Collection[str]] = None,
+    ) -> List[List[Tuple[str, float]]]:
+        """Search for several queries with one batched encode and one index lookup.
+
+        mode: "dense" (embeddings), "lexical" (BM25) or "hybrid" (both,
+            scored alpha * cosine + (1 - alpha) * BM25 / best BM25)
+        prefilter: if set, only the best prefilter BM25 matches are scored
+            densely, skipping the full scan on large corpora
+        sources: if set, only chunks tagged with one of these sources (a
+            single tag may be passed as a string) are searched
+
+        Returns one list of (chunk, score) pairs per query, best first.
+        """
+        return [
+            [(self.chunks[i], float(score)) for i, score in zip(ids, scores)]
+            for ids, scores in self.search_ids(queries, top_k, mode, alpha, prefilter, sources)
+        ]
+
+    def search_ids(
+        self,
+        queries: List[str],
+        top_k: int = 3,
+        mode: str = "dense",
+        alpha: float = 0.5,
+        prefilter: Optional[int] = None,
+        sources: Optional[Collection[str]] = None,
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Like search_many, but (chunk positions, scores) arrays per query.
+
+        Positions index self.chunks, e.g. to look up a ChunkTable span.
+        """
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode {mode!r}; choose from {SEARCH_MODES}")
+        if not queries:
+            return []
+        rows = None if sources is None else self._source_rows(sources)
+        if not len(self.chunks) or top_k <= 0 or (rows is not None and rows.size == 0):
+            empty = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+            return [empty for _ in queries]
+
+        if mode == "lexical":
+            hits = []
+            for query in queries:
+                scores = self.lexical.scores(query)
+                ids = top_k_indices(scores, top_k) if rows is None else rows[
+                    top_k_indices(scores[rows], top_k)
+                ]
+                hits.append((ids, scores[ids]))
+            return hits
+        q = self.embed(queries)
+        if mode == "dense" and prefilter is None and rows is None:
+            return list(self.index.search(q, top_k))
+        return [
+            self._rank_candidates(query, vector, top_k, mode, alpha, prefilter, rows)
+            for query, vector in zip(queries, q)
+        ]
+
+    def _source_rows(self, sources: Collection[str]) -> np.ndarray:
+        wanted = {sources} if isinstance(sources, str) else set(sources)
+        return np.array([i for i, tag in enumerate(self.sources) if tag in wanted], dtype=np.int64)
+
+    def _rank_candidates(self, query, vector, top_k, mode, alpha, prefilter, rows=None):
+        lexical = self.lexical.scores(query)
+        if rows is not None:
+            # Scoring only the chosen sources' chunks replaces the index scan.
+            candidates = rows
+            if prefilter is not None:
+                candidates = rows[top_k_indices(lexical[rows], prefilter)]
+                candidates = candidates[lexical[candidates] > 0]
+                if candidates.size == 0:
+                    candidates = rows
+        elif prefilter is not None:
+            candidates = top_k_indices(lexical, prefilter)
+            candidates = candidates[lexical[candidates] > 0]
+        else:
+            dense_ids, _ = self.index.search(vector[np.newaxis, :], top_k * _HYBRID_OVERSAMPLE)[0]
+            lexical_ids = top_k_indices(lexical, top_k * _HYBRID_OVERSAMPLE)
+            candidates = np.union1d(dense_ids, lexical_ids[lexical[lexical_ids] > 0])
+        if candidates.size == 0:
+            # Nothing matched lexically; fall back to the dense index.
+            candidates, _ = self.index.search(vector[np.newaxis, :], top_k)[0]
+
+        candidates = np.sort(candidates)
+        scores = np.asarray(self.embeddings[candidates], dtype=np.float32) @ vector
+        if mode == "hybrid":
+            best = lexical.max()
+            if best > 0:
+                scores = alpha * scores + (1 - alpha) * lexical[candidates] / best
+            else:
+                scores = alpha * scores
+        best_ids = top_k_indices(scores, top_k)
+        return candidates[best_ids], scores[best_ids]
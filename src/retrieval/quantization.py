@@ -0,0 +1,71 @@
+"""Reduced-precision embedding storage for the index backends.
+
+"float16" halves memory with no scale. "int8" is symmetric scalar
+quantization with one float32 scale per dimension and quarters memory. Scores
+are computed block by block, so a compressed matrix is never expanded to
+float32 all at once.
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+
+PRECISIONS = {"float32": np.float32, "float16": np.float16, "int8": np.int8}
+
+# Rows dequantized per block while scoring.
+_BLOCK = 65536
+
+
+def check_precision(precision: str) -> str:
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown precision {precision!r}; choose from {tuple(PRECISIONS)}")
+    return precision
+
+
+def fit_scale(matrix: np.ndarray, precision: str) -> Optional[np.ndarray]:
+    """Per-dimension int8 scale (max |value| / 127); None for float formats."""
+    if check_precision(precision) != "int8":
+        return None
+    max_abs = np.zeros(matrix.shape[1], dtype=np.float32)
+    for start in range(0, matrix.shape[0], _BLOCK):
+        block = np.abs(np.asarray(matrix[start:start + _BLOCK], dtype=np.float32))
+        if block.size:
+            np.maximum(max_abs, block.max(axis=0), out=max_abs)
+    return np.where(max_abs > 0, max_abs / 127.0, 1.0).astype(np.float32)
+
+
+def encode(matrix: np.ndarray, precision: str, scale: Optional[np.ndarray] = None) -> np.ndarray:
+    """Convert float rows to the storage dtype of precision."""
+    if check_precision(precision) == "float32":
+        return np.asarray(matrix, dtype=np.float32)
+    if precision == "float16":
+        return np.asarray(matrix, dtype=np.float16)
+    codes = np.empty(matrix.shape, dtype=np.int8)
+    for start in range(0, matrix.shape[0], _BLOCK):
+        block = np.asarray(matrix[start:start + _BLOCK], dtype=np.float32) / scale
+        codes[start:start + _BLOCK] = np.clip(np.rint(block), -127, 127)
+    return codes
+
+
+def quantize(matrix: np.ndarray, precision: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """Compress a float matrix, returning (codes, per-dimension scale or None)."""
+    scale = fit_scale(matrix, precision)
+    return encode(matrix, precision, scale), scale
+
+
+def dequantize(codes: np.ndarray, scale: Optional[np.ndarray]) -> np.ndarray:
+    matrix = np.asarray(codes, dtype=np.float32)
+    return matrix * scale if scale is not None else matrix
+
+
+def score(codes: np.ndarray, scale: Optional[np.ndarray], queries: np.ndarray) -> np.ndarray:
+    """(q, n) inner products of queries with the rows encoded in codes."""
+    if codes.dtype == np.float32:
+        return queries @ codes.T
+    # Fold the int8 scale into the queries instead of the (much larger) matrix.
+    queries = queries * scale if scale is not None else queries
+    queries = queries.astype(np.float32, copy=False)
+    out = np.empty((queries.shape[0], codes.shape[0]), dtype=np.float32)
+    for start in range(0, codes.shape[0], _BLOCK):
+        block = codes[start:start + _BLOCK].astype(np.float32)
+        out[:, start:start + _BLOCK] = queries @ block.T
+    return out
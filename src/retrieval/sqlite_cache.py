@@ -0,0 +1,84 @@
+"""SQLite plumbing shared by the on-disk caches.
+
+Each cache keeps one table keyed by content address with a last_used column;
+this base opens it, evicts least recently used rows and counts hits and misses.
+"""
+import os
+import sqlite3
+import threading
+from typing import Dict, Optional
+
+
+class SQLiteCache:
+    """One SQLite table of (key, *columns, last_used) rows with LRU eviction.
+
+    Subclasses set table and columns (the column definitions between key and
+    last_used), and read and write rows under self._lock.
+    """
+
+    table = ""
+    columns = ""
+
+    def __init__(self, path: str, max_entries: Optional[int] = None):
+        """
+        path: SQLite file (":memory:" for a throwaway cache)
+        max_entries: evict least recently used rows beyond this many
+        """
+        if max_entries is not None and max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        if path != ":memory:":
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} ("
+            f" key TEXT PRIMARY KEY, {self.columns}, last_used INTEGER NOT NULL)"
+        )
+        self._conn.execute(
+            f"CREATE INDEX IF NOT EXISTS {self.table}_last_used ON {self.table} (last_used)"
+        )
+        self._conn.commit()
+
+    def _count(self) -> int:
+        (count,) = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()
+        return count
+
+    def _evict(self) -> None:
+        """Drop least recently used rows beyond max_entries (caller holds the lock)."""
+        if self.max_entries is None:
+            return
+        excess = self._count() - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN ("
+                f" SELECT key FROM {self.table} ORDER BY last_used, rowid LIMIT ?)",
+                (excess,),
+            )
+
+    def stats(self) -> Dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._count()
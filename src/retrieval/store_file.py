@@ -0,0 +1,189 @@
+"""Binary on-disk format for PathwayStore.
+
+Layout (all sections 64-byte aligned):
+
+    magic    8 bytes  b"CHRSTORE"
+    length   uint32   size of the JSON header that follows
+    header   JSON     version, model, fingerprint, shapes and section offsets
+    matrix   float32  n x dim embedding matrix, row-major
+    offsets  uint64   n + 1 byte offsets into the text section
+    text     UTF-8    chunk texts back to back
+
+The matrix and offsets are opened with ``np.memmap`` so every process that
+loads the same file shares one page-cached copy. Chunk source tags, if any,
+are kept in the header as runs of [source, count], since a document's
+chunks are stored together.
+"""
+import hashlib
+import json
+import os
+import struct
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+MAGIC = b"CHRSTORE"
+VERSION = 1
+_ALIGN = 64
+
+
+def chunks_fingerprint(chunks: List[str]) -> str:
+    """Hash of the chunk texts, used to tell whether a saved store is stale."""
+    h = hashlib.sha256()
+    for chunk in chunks:
+        data = chunk.encode("utf-8")
+        h.update(struct.pack("<Q", len(data)))
+        h.update(data)
+    return h.hexdigest()
+
+
+def _align(n: int) -> int:
+    return (n + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def write_store(
+    path: str,
+    chunks: List[str],
+    embeddings: np.ndarray,
+    model_name: str,
+    sources: Optional[List[Optional[str]]] = None,
+) -> None:
+    """Write chunks, their embedding matrix and source tags to path atomically."""
+    embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+    if embeddings.ndim != 2 or embeddings.shape[0] != len(chunks):
+        raise ValueError("embeddings must be a (len(chunks), dim) matrix")
+    if sources is not None and len(sources) != len(chunks):
+        raise ValueError("sources must give one tag per chunk")
+
+    encoded = [chunk.encode("utf-8") for chunk in chunks]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.uint64)
+    if encoded:
+        offsets[1:] = np.cumsum([len(data) for data in encoded])
+
+    header = {
+        "version": VERSION,
+        "model": model_name,
+        "fingerprint": chunks_fingerprint(chunks),
+        "count": embeddings.shape[0],
+        "dim": embeddings.shape[1],
+    }
+    if sources is not None and any(source is not None for source in sources):
+        runs = []
+        for source in sources:
+            if runs and runs[-1][0] == source:
+                runs[-1][1] += 1
+            else:
+                runs.append([source, 1])
+        header["sources"] = runs
+    # Offsets depend on the header length, so size the header with
+    # placeholders wide enough for any file we could write.
+    for field in ("matrix_offset", "offsets_offset", "text_offset"):
+        header[field] = 10 ** 15
+    prefix = _align(len(MAGIC) + 4 + len(json.dumps(header)))
+    header["matrix_offset"] = prefix
+    header["offsets_offset"] = _align(prefix + embeddings.nbytes)
+    header["text_offset"] = _align(header["offsets_offset"] + offsets.nbytes)
+    raw_header = json.dumps(header).encode("utf-8")
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(raw_header)))
+        f.write(raw_header)
+        f.seek(header["matrix_offset"])
+        f.write(embeddings.tobytes())
+        f.seek(header["offsets_offset"])
+        f.write(offsets.tobytes())
+        f.seek(header["text_offset"])
+        for data in encoded:
+            f.write(data)
+    os.replace(tmp_path, path)
+
+
+def read_header(path: str) -> Dict:
+    """Read and validate the JSON header of a store file.
+
+    Raises ValueError for foreign, truncated or corrupt files.
+    """
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a PathwayStore file")
+        try:
+            (length,) = struct.unpack("<I", f.read(4))
+            header = json.loads(f.read(length).decode("utf-8"))
+        except (struct.error, ValueError) as e:
+            raise ValueError(f"{path} has a corrupt header: {e}") from None
+        size = f.seek(0, os.SEEK_END)
+    if not isinstance(header, dict):
+        raise ValueError(f"{path} has a corrupt header")
+    if header.get("version") != VERSION:
+        raise ValueError(f"Unsupported PathwayStore file version: {header.get('version')}")
+    try:
+        sections_end = header["offsets_offset"] + 8 * (header["count"] + 1)
+    except (KeyError, TypeError):
+        raise ValueError(f"{path} has a corrupt header") from None
+    if size < sections_end:
+        raise ValueError(f"{path} is truncated")
+    return header
+
+
+def read_sources(header: Dict) -> List[Optional[str]]:
+    """Per-chunk source tags recorded in a header (None for untagged chunks)."""
+    runs = header.get("sources")
+    if runs is None:
+        return [None] * header["count"]
+    return [source for source, count in runs for _ in range(count)]
+
+
+def read_store(path: str) -> Tuple[List[str], np.ndarray, Dict]:
+    """Open a store file, returning (chunks, memory-mapped matrix, header)."""
+    header = read_header(path)
+    count, dim = header["count"], header["dim"]
+    if count == 0:
+        return [], np.empty((0, dim), dtype=np.float32), header
+
+    embeddings = np.memmap(
+        path, dtype=np.float32, mode="r",
+        offset=header["matrix_offset"], shape=(count, dim),
+    )
+    offsets = np.memmap(
+        path, dtype=np.uint64, mode="r",
+        offset=header["offsets_offset"], shape=(count + 1,),
+    )
+    with open(path, "rb") as f:
+        f.seek(header["text_offset"])
+        text = f.read(int(offsets[-1]))
+    if len(text) != int(offsets[-1]):
+        raise ValueError(f"{path} is truncated")
+    bounds = offsets.tolist()
+    chunks = [
+        text[bounds[i]:bounds[i + 1]].decode("utf-8") for i in range(count)
+    ]
+    return chunks, embeddings, header
+
+
+def prune_stores(directory: str, keep: int, suffix: str = ".store") -> List[str]:
+    """Delete all but the keep most recently used store files in directory.
+
+    "Used" is the modification time, so callers touch a file they reopen.
+    Files that cannot be removed (e.g. still mapped on Windows) are skipped.
+    Returns the paths deleted.
+    """
+    if keep < 0:
+        raise ValueError("keep must be non-negative")
+    try:
+        entries = [e for e in os.scandir(directory) if e.is_file() and e.name.endswith(suffix)]
+    except FileNotFoundError:
+        return []
+    entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+    removed = []
+    for entry in entries[keep:]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            continue
+        removed.append(entry.path)
+    return removed
@@ -0,0 +1,497 @@
+"""Nearest-neighbour index backends for PathwayStore.
+
+Every backend takes a (n, dim) matrix of normalized embeddings in build()
+and answers search() for a (q, dim) matrix of normalized queries with one
+(indices, scores) pair per query, best first. Scores are inner products, i.e.
+cosine similarity for normalized vectors. After the store changes its rows,
+refresh(embeddings, removed=..., changed=...) is called with the new matrix:
+rows past those indexed so far are new, removed are the positions of dropped
+rows before the change (later rows shift down) and changed are rows whose
+vectors were replaced in place. Exact and IVF encode only new and changed
+rows, so a small edit costs time in proportion to it, not to the corpus.
+"""
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .quantization import PRECISIONS, check_precision, encode, fit_scale, quantize, score
+
+# Rows scored per block when assigning vectors to IVF lists, so memory stays
+# bounded at block x n_lists floats for million-row corpora.
+_BLOCK = 65536
+
+# An int8 scale is refitted, re-encoding every row, only once new values
+# exceed the fitted range by more than this fraction; up to it they saturate.
+_SCALE_SLACK = 0.1
+
+# IVF appended and dead entries are folded back into the lists once they
+# reach this fraction of them.
+_MERGE_FRACTION = 0.25
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first, without a full sort."""
+    k = min(k, scores.shape[0])
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if k < scores.shape[0]:
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(scores.shape[0])
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+def append_rows(buffer: np.ndarray, size: int, rows: np.ndarray) -> np.ndarray:
+    """Write rows after buffer[:size]; returns the buffer, reallocated when full.
+
+    Capacity doubles like PathwayStore's matrix, so repeated appends copy
+    each row O(1) times on average. Read-only buffers are copied on first write.
+    """
+    needed = size + len(rows)
+    if needed > buffer.shape[0] or not buffer.flags.writeable:
+        capacity = max(needed, 2 * buffer.shape[0], 16)
+        grown = np.empty((capacity,) + buffer.shape[1:], dtype=buffer.dtype)
+        grown[:size] = buffer[:size]
+        buffer = grown
+    buffer[size:needed] = rows
+    return buffer
+
+
+class ExactIndex:
+    """Brute-force scan over every embedding; exact results at float32.
+
+    precision: "float32", "float16" or "int8" copy of the matrix to scan
+    rerank: if > 0, re-score the best rerank * top_k compressed hits with
+        the full-precision embeddings (read from the store's matrix, which
+        stays on disk when the store was memory-mapped with load()); at 0 a
+        compressed index keeps no reference to the float32 matrix at all
+    """
+
+    name = "exact"
+
+    def __init__(self, precision: str = "float32", rerank: int = 0):
+        self.precision = check_precision(precision)
+        self.rerank = rerank
+        self.embeddings = None
+        self.scale = None
+        self._codes = None  # with spare capacity for appended rows
+        self._size = 0
+
+    @property
+    def codes(self) -> np.ndarray:
+        """The scanned (n, dim) matrix; the embeddings themselves at float32."""
+        return self._codes[:self._size]
+
+    def build(self, embeddings: np.ndarray) -> None:
+        self.embeddings = embeddings if self.rerank else None
+        self._codes, self.scale = quantize(embeddings, self.precision)
+        self._size = embeddings.shape[0]
+
+    def refresh(
+        self,
+        embeddings: np.ndarray,
+        removed: Optional[np.ndarray] = None,
+        changed: Optional[np.ndarray] = None,
+    ) -> None:
+        """Encode only new and changed rows; removed rows' codes are compacted away."""
+        if self.precision == "float32":
+            self.build(embeddings)  # scans the store's matrix; nothing to encode
+            return
+        if removed is not None and len(removed):
+            keep = np.ones(self._size, dtype=bool)
+            keep[removed] = False
+            self._codes[:int(keep.sum())] = self.codes[keep]
+            self._size = int(keep.sum())
+        rows = np.arange(self._size, embeddings.shape[0])
+        if changed is not None:
+            rows = np.union1d(np.asarray(changed, dtype=np.int64), rows)
+        vectors = np.asarray(embeddings[rows], dtype=np.float32)
+        if _outgrown(self.scale, vectors):
+            self.build(embeddings)
+            return
+        fresh = rows >= self._size
+        self._codes[rows[~fresh]] = encode(vectors[~fresh], self.precision, self.scale)
+        codes = encode(vectors[fresh], self.precision, self.scale)
+        self._codes = append_rows(self._codes, self._size, codes)
+        self._size = embeddings.shape[0]
+        self.embeddings = embeddings if self.rerank else None
+
+    def search(self, queries: np.ndarray, top_k: int) -> List[Tuple[np.ndarray, np.ndarray]]:
+        scores = score(self.codes, self.scale, queries)
+        results = []
+        for q, row in zip(queries, scores):
+            ids = top_k_indices(row, _candidates(top_k, self.rerank))
+            results.append(_rescore(self.embeddings, q, ids, top_k) if self.rerank else (ids, row[ids]))
+        return results
+
+
+class IVFIndex:
+    """Inverted-file index: k-means clusters, search only the closest lists.
+
+    n_lists: number of clusters (default ~sqrt(n))
+    n_probe: clusters scanned per query; higher = better recall, slower
+    n_iter: k-means iterations
+    train_size: rows sampled to train the centroids
+    precision, rerank: storage of the list vectors and re-ranking, as for
+        ExactIndex; the float32 matrix is only kept when rerank > 0
+    """
+
+    name = "ivf"
+
+    def __init__(
+        self,
+        n_lists: Optional[int] = None,
+        n_probe: int = 8,
+        n_iter: int = 10,
+        train_size: int = 100_000,
+        seed: int = 0,
+        precision: str = "float32",
+        rerank: int = 0,
+    ):
+        if n_probe <= 0:
+            raise ValueError("n_probe must be positive")
+        if n_lists is not None and n_lists <= 0:
+            raise ValueError("n_lists must be positive")
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.n_iter = n_iter
+        self.train_size = train_size
+        self.seed = seed
+        self.precision = check_precision(precision)
+        self.rerank = rerank
+        self.scale = None
+        self.embeddings = None
+        self.n_rows = 0
+        self.centroids = None
+        self.list_offsets = None
+        self.list_rows = None
+        self.list_vectors = None
+        self.trained_size = 0
+        # Entries appended since the lists were last grouped, unsorted and
+        # with spare capacity: row, list and code of each.
+        self._tail_rows = None
+        self._tail_lists = None
+        self._tail_vectors = None
+        self._tail_size = 0
+
+    def build(self, embeddings: np.ndarray) -> None:
+        self.embeddings = embeddings if self.rerank else None
+        n = self.n_rows = embeddings.shape[0]
+        if n == 0:
+            self.centroids = np.empty((0, embeddings.shape[1]), dtype=np.float32)
+            self.list_offsets = np.zeros(1, dtype=np.int64)
+            self.list_rows = np.empty(0, dtype=np.int64)
+            self.list_vectors = np.empty((0, embeddings.shape[1]), dtype=PRECISIONS[self.precision])
+            self._clear_tail()
+            return
+
+        n_lists = self.n_lists or max(1, int(np.sqrt(n)))
+        n_lists = min(n_lists, n)
+        rng = np.random.default_rng(self.seed)
+        sample_ids = rng.choice(n, size=min(n, max(self.train_size, n_lists)), replace=False)
+        self.centroids = _spherical_kmeans(
+            np.asarray(embeddings[np.sort(sample_ids)], dtype=np.float32),
+            n_lists, self.n_iter, rng,
+        )
+        self.trained_size = n
+        self._fill_lists(embeddings)
+
+    def refresh(
+        self,
+        embeddings: np.ndarray,
+        removed: Optional[np.ndarray] = None,
+        changed: Optional[np.ndarray] = None,
+    ) -> None:
+        """Bucket only new and changed rows into the trained lists.
+
+        They are assigned, encoded and appended to a tail that search scans
+        with the lists. Entries of removed and changed rows are only marked
+        dead (row -1) and the others renumbered, and the tail and dead
+        entries are regrouped into the lists, without re-encoding, once they
+        reach _MERGE_FRACTION of them. The centroids are retrained only when
+        the corpus has doubled or shrunk to half since the last training, and
+        every row is re-encoded only when new values outgrow an int8 scale.
+        """
+        n = embeddings.shape[0]
+        if (self.centroids is None or self.centroids.shape[0] == 0 or n == 0
+                or not self.trained_size / 2 <= n <= self.trained_size * 2):
+            self.build(embeddings)
+            return
+        indexed = self.n_rows
+        tail = self._tail_rows[:self._tail_size]
+        if removed is not None and len(removed):
+            removed = np.asarray(removed, dtype=np.int64)
+            self.list_rows = _renumber(self.list_rows, removed)
+            tail[:] = _renumber(tail, removed)
+            indexed -= len(removed)
+        rows = np.arange(indexed, n)
+        if changed is not None and len(changed):
+            changed = np.asarray(changed, dtype=np.int64)
+            self.list_rows[np.isin(self.list_rows, changed)] = -1
+            tail[np.isin(tail, changed)] = -1
+            rows = np.union1d(changed, rows)
+        self.embeddings = embeddings if self.rerank else None
+        self.n_rows = n
+        vectors = np.asarray(embeddings[rows], dtype=np.float32)
+        if _outgrown(self.scale, vectors):
+            self._fill_lists(embeddings)
+            return
+        if len(rows):
+            size = self._tail_size
+            self._tail_rows = append_rows(self._tail_rows, size, rows)
+            self._tail_lists = append_rows(self._tail_lists, size, _assign(vectors, self.centroids))
+            codes = encode(vectors, self.precision, self.scale)
+            self._tail_vectors = append_rows(self._tail_vectors, size, codes)
+            self._tail_size += len(rows)
+        # Every live row has exactly one entry; the rest are dead.
+        dead = len(self.list_rows) + self._tail_size - n
+        if self._tail_size + dead > _MERGE_FRACTION * len(self.list_rows):
+            self._regroup()
+
+    def _clear_tail(self) -> None:
+        self._tail_rows = np.empty(0, dtype=np.int64)
+        self._tail_lists = np.empty(0, dtype=np.int64)
+        self._tail_vectors = np.empty_like(self.list_vectors, shape=(0,) + self.list_vectors.shape[1:])
+        self._tail_size = 0
+
+    def _regroup(self) -> None:
+        """Fold the tail into the lists and drop dead entries; codes are moved, not re-encoded."""
+        size = self._tail_size
+        n_lists = self.centroids.shape[0]
+        lists = np.concatenate([
+            np.repeat(np.arange(n_lists), np.diff(self.list_offsets)), self._tail_lists[:size]
+        ])
+        rows = np.concatenate([self.list_rows, self._tail_rows[:size]])
+        live = np.flatnonzero(rows >= 0)
+        order = live[np.argsort(lists[live], kind="stable")]
+        self.list_rows = rows[order]
+        self.list_vectors = np.concatenate([self.list_vectors, self._tail_vectors[:size]])[order]
+        self.list_offsets = _csr_offsets(lists[order], n_lists)
+        self._clear_tail()
+
+    def _fill_lists(self, embeddings: np.ndarray) -> None:
+        n = embeddings.shape[0]
+        n_lists = self.centroids.shape[0]
+        assignments = _assign(embeddings, self.centroids)
+        # CSR layout: rows of list j are list_rows[list_offsets[j]:list_offsets[j + 1]].
+        self.list_rows = np.argsort(assignments, kind="stable").astype(np.int64)
+        counts = np.bincount(assignments, minlength=n_lists)
+        self.list_offsets = np.zeros(n_lists + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.list_offsets[1:])
+        # Vectors regrouped by list so each probe scans one contiguous slice
+        # instead of gathering scattered rows.
+        self.scale = fit_scale(embeddings, self.precision)
+        self.list_vectors = np.empty(embeddings.shape, dtype=PRECISIONS[self.precision])
+        for start in range(0, n, _BLOCK):
+            rows = embeddings[self.list_rows[start:start + _BLOCK]]
+            self.list_vectors[start:start + _BLOCK] = encode(rows, self.precision, self.scale)
+        self._clear_tail()
+
+    def search(self, queries: np.ndarray, top_k: int) -> List[Tuple[np.ndarray, np.ndarray]]:
+        if self.n_rows == 0:
+            return [(np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float32)) for _ in queries]
+        n_probe = min(self.n_probe, self.centroids.shape[0])
+        centroid_scores = queries @ self.centroids.T
+        results = []
+        for q, row in zip(queries, centroid_scores):
+            probed = top_k_indices(row, n_probe)
+            spans = [(self.list_offsets[j], self.list_offsets[j + 1]) for j in probed]
+            positions = np.concatenate([np.arange(lo, hi) for lo, hi in spans])
+            scores = np.concatenate([
+                score(self.list_vectors[lo:hi], self.scale, q[np.newaxis, :])[0] for lo, hi in spans
+            ])
+            ids = self.list_rows[positions]
+            if self._tail_size:
+                at = np.flatnonzero(np.isin(self._tail_lists[:self._tail_size], probed))
+                ids = np.concatenate([ids, self._tail_rows[at]])
+                scores = np.concatenate([
+                    scores, score(self._tail_vectors[at], self.scale, q[np.newaxis, :])[0]
+                ])
+            live = ids >= 0
+            ids, scores = ids[live], scores[live]
+            best = top_k_indices(scores, _candidates(top_k, self.rerank))
+            ids = ids[best]
+            results.append(_rescore(self.embeddings, q, ids, top_k) if self.rerank else (ids, scores[best]))
+        return results
+
+
+class HierarchicalIndex:
+    """Coarse-to-fine search over rows grouped by the text's own structure.
+
+    levels: one group label per row for each level, coarsest first, e.g.
+        [table.chapters, table.paragraphs] of a ChunkTable built with
+        from_structure. Labels nest: a level's groups are split by every
+        coarser level, so paragraph numbers need only be unique per chapter.
+    beams: groups kept per query at each level (an int applies to all)
+
+    A group's vector is the normalized mean of its rows' embeddings, so no
+    text beyond the fine chunks is encoded. Search scores every top-level
+    group, keeps the best beams[0], scores only the next level's groups
+    inside those, and so on; the rows themselves are scored only within the
+    surviving groups of the last level. Rows past the end of the labels
+    (e.g. appended with PathwayStore.add_chunks) together form one more
+    group at every level; rows the store removes take their labels with them.
+    """
+
+    name = "hierarchical"
+
+    def __init__(self, levels: List, beams=4):
+        if not levels:
+            raise ValueError("levels must name at least one grouping")
+        self.levels = [np.asarray(labels, dtype=np.int64) for labels in levels]
+        self.beams = [beams] * len(self.levels) if np.isscalar(beams) else list(beams)
+        if len(self.beams) != len(self.levels):
+            raise ValueError("beams must give one width per level")
+        if min(self.beams) <= 0:
+            raise ValueError("beams must be positive")
+        self.embeddings = None
+        self.centroids = []  # per level: (groups, dim) unit vectors
+        self.sizes = []  # per level: rows in each group
+        self.children = []  # per level: CSR (offsets, ids) of next-level groups or rows
+        self.scored = 0  # vectors scored by search() so far
+
+    def build(self, embeddings: np.ndarray) -> None:
+        n = embeddings.shape[0]
+        if any(len(labels) > n for labels in self.levels):
+            raise ValueError(f"levels label more than the {n} rows indexed; rebuild with new labels")
+        self.embeddings = embeddings
+        self.centroids, self.sizes, self.children = [], [], []
+        if n == 0:
+            return
+        keys = np.empty((n, 0), dtype=np.int64)
+        groups = []
+        for labels in self.levels:
+            # Unlabelled trailing rows share the label -1, one group per level.
+            column = np.concatenate([labels, np.full(n - len(labels), -1, dtype=np.int64)])
+            keys = np.column_stack([keys, column])
+            _, inverse = np.unique(keys, axis=0, return_inverse=True)
+            groups.append(inverse.reshape(-1).astype(np.int64))
+
+        for level, group in enumerate(groups):
+            n_groups = int(group.max()) + 1
+            rows = np.argsort(group, kind="stable")
+            offsets = _csr_offsets(group, n_groups)
+            members = np.asarray(embeddings[rows], dtype=np.float32)
+            sums = np.add.reduceat(members, offsets[:-1], axis=0)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            self.centroids.append(sums / np.maximum(norms, 1e-12))
+            self.sizes.append(np.diff(offsets))
+            if level + 1 < len(groups):
+                # Each child group lies in one parent; map children to parents.
+                parent = np.empty(int(groups[level + 1].max()) + 1, dtype=np.int64)
+                parent[groups[level + 1]] = group
+                ids = np.argsort(parent, kind="stable")
+                self.children.append((_csr_offsets(parent, n_groups), ids))
+            else:
+                self.children.append((offsets, rows))
+
+    def refresh(
+        self,
+        embeddings: np.ndarray,
+        removed: Optional[np.ndarray] = None,
+        changed: Optional[np.ndarray] = None,
+    ) -> None:
+        """Regroup after a change; removed rows' labels are dropped, later labels shift down."""
+        if removed is not None and len(removed):
+            removed = np.asarray(removed, dtype=np.int64)
+            self.levels = [
+                np.delete(labels, removed[removed < len(labels)]) for labels in self.levels
+            ]
+        self.build(embeddings)
+
+    def search(self, queries: np.ndarray, top_k: int) -> List[Tuple[np.ndarray, np.ndarray]]:
+        if self.embeddings is None or self.embeddings.shape[0] == 0 or top_k <= 0:
+            return [(np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float32)) for _ in queries]
+        results = []
+        for q in queries:
+            groups = np.arange(self.centroids[0].shape[0])
+            for level, beam in enumerate(self.beams):
+                scores = self.centroids[level][groups] @ q
+                self.scored += groups.size
+                groups = groups[self._keep(scores, self.sizes[level][groups], beam, top_k)]
+                offsets, ids = self.children[level]
+                groups = np.concatenate([ids[offsets[g]:offsets[g + 1]] for g in groups])
+            rows = np.sort(groups)  # ascending rows read sequentially from a memmap
+            scores = np.asarray(self.embeddings[rows], dtype=np.float32) @ q
+            self.scored += rows.size
+            best = top_k_indices(scores, top_k)
+            results.append((rows[best], scores[best]))
+        return results
+
+    @staticmethod
+    def _keep(scores: np.ndarray, sizes: np.ndarray, beam: int, top_k: int) -> np.ndarray:
+        """Best beam groups, widened until they hold at least top_k rows."""
+        order = np.argsort(-scores, kind="stable")
+        enough = int(np.searchsorted(np.cumsum(sizes[order]), top_k)) + 1
+        return order[:max(beam, enough)]
+
+
+def _csr_offsets(labels: np.ndarray, n_groups: int) -> np.ndarray:
+    offsets = np.zeros(n_groups + 1, dtype=np.int64)
+    np.cumsum(np.bincount(labels, minlength=n_groups), out=offsets[1:])
+    return offsets
+
+
+def _renumber(rows: np.ndarray, removed: np.ndarray) -> np.ndarray:
+    """Row ids after the sorted removed rows are dropped; theirs (and dead ones) become -1."""
+    shifted = rows - np.searchsorted(removed, rows)
+    shifted[(rows < 0) | np.isin(rows, removed)] = -1
+    return shifted
+
+
+def _outgrown(scale: Optional[np.ndarray], vectors: np.ndarray) -> bool:
+    """Whether vectors exceed an int8 scale by more than _SCALE_SLACK."""
+    if scale is None or not len(vectors):
+        return False
+    return bool((np.abs(vectors).max(axis=0) > scale * 127 * (1 + _SCALE_SLACK)).any())
+
+
+def _candidates(top_k: int, rerank: int) -> int:
+    return top_k * rerank if rerank and top_k > 0 else top_k
+
+
+def _rescore(embeddings: np.ndarray, query: np.ndarray, ids: np.ndarray, top_k: int):
+    """Re-rank candidate rows with their full-precision embeddings."""
+    ids = np.sort(ids)  # ascending rows read sequentially from a memmap
+    exact = np.asarray(embeddings[ids], dtype=np.float32) @ query
+    best = top_k_indices(exact, top_k)
+    return ids[best], exact[best]
+
+
+def _spherical_kmeans(data: np.ndarray, k: int, n_iter: int, rng) -> np.ndarray:
+    centroids = data[rng.choice(data.shape[0], size=k, replace=False)].copy()
+    for _ in range(n_iter):
+        assignments = _assign(data, centroids)
+        counts = np.bincount(assignments, minlength=k)
+        order = np.argsort(assignments, kind="stable")
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        empty = counts == 0
+        sums = np.zeros_like(centroids)
+        sums[~empty] = np.add.reduceat(data[order], starts[~empty], axis=0)
+        # Re-seed empty clusters from random points so every list is used.
+        sums[empty] = data[rng.choice(data.shape[0], size=int(empty.sum()))]
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        centroids = sums / np.maximum(norms, 1e-12)
+    return centroids.astype(np.float32)
+
+
+def _assign(embeddings: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    assignments = np.empty(embeddings.shape[0], dtype=np.int64)
+    for start in range(0, embeddings.shape[0], _BLOCK):
+        block = np.asarray(embeddings[start:start + _BLOCK], dtype=np.float32)
+        assignments[start:start + _BLOCK] = np.argmax(block @ centroids.T, axis=1)
+    return assignments
+
+
+INDEXES = {
+    ExactIndex.name: ExactIndex,
+    IVFIndex.name: IVFIndex,
+}
+
+
+def make_index(kind: str = "exact", **params):
+    """Create an index backend by name ("exact" or "ivf")."""
+    try:
+        return INDEXES[kind](**params)
+    except KeyError:
+        raise ValueError(f"Unknown index backend {kind!r}; choose from {sorted(INDEXES)}") from None
@@ -1,14 +1,63 @@
 """Shared test fixtures and configuration."""
 import sys
 import os
+import re
+import zlib
+
+import numpy as np
 
 # Add src to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
+from retrieval.embedder import EmbeddingProvider, set_provider
+
+
+class StubEmbeddingProvider(EmbeddingProvider):
+    """Hashed bag-of-words embeddings: deterministic, instant, no torch."""
+
+    def __init__(self, dim=64, workers=1):
+        super().__init__(model_name="stub-hashing", batch_size=32, workers=workers)
+        self.dim = dim
+
+    def dimension(self):
+        return self.dim
+
+    def _encode_serial(self, texts, normalize):
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in zip(vectors, texts):
+            for word in re.findall(r"\w+", text.lower()):
+                row[zlib.crc32(word.encode("utf-8")) % self.dim] += 1.0
+            row[0] += 1e-3  # keep empty texts away from the zero vector
+        if normalize:
+            vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors
+
 
 # Fixtures for sample data
 import pytest
 
+
+@pytest.fixture(autouse=True)
+def stub_embedding_provider():
+    """Swap the sentence-transformers model for a stub unless asked not to.
+
+    Set CHRONOREASON_TEST_REAL_MODEL=1 to run the suite against the real model.
+    """
+    if os.getenv("CHRONOREASON_TEST_REAL_MODEL"):
+        yield None
+        return
+    provider = StubEmbeddingProvider()
+    previous = set_provider(provider)
+    yield provider
+    set_provider(previous)
+
+
+@pytest.fixture
+def stub_provider_class():
+    """The stub provider class, for tests that need their own instances."""
+    return StubEmbeddingProvider
+
+
 @pytest.fixture
 def sample_text():
     """Sample text for chunking tests."""
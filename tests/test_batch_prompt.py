@@ -0,0 +1,99 @@
+"""Unit tests for reasoning.batch_prompt module."""
+from reasoning.batch_prompt import (
+    build_batch_prompt,
+    group_claims,
+    parse_verdicts,
+)
+
+
+class TestGroupClaims:
+    """Test grouping claims by shared evidence."""
+
+    def test_shared_chunks_grouped(self):
+        """Test that claims sharing a chunk land in one group."""
+        evidence = [["a", "b"], ["c"], ["b", "d"], ["d"]]
+        assert group_claims(evidence, max_claims=10, max_chunks=10) == [[0, 2, 3], [1]]
+
+    def test_max_claims_splits_groups(self):
+        """Test that a component is split at max_claims."""
+        evidence = [["a"]] * 5
+        assert group_claims(evidence, max_claims=2, max_chunks=10) == [[0, 1], [2, 3], [4]]
+
+    def test_max_chunks_splits_groups(self):
+        """Test that pooled evidence stays within max_chunks."""
+        evidence = [["a", "b"], ["b", "c"], ["c", "d"]]
+        assert group_claims(evidence, max_claims=10, max_chunks=3) == [[0, 1], [2]]
+
+    def test_string_evidence_is_one_chunk(self):
+        """Test that identical evidence strings group, different ones do not."""
+        assert group_claims(["x", "y", "x"], max_claims=10, max_chunks=10) == [[0, 2], [1]]
+
+    def test_every_claim_once(self):
+        """Test that groups partition the claims."""
+        evidence = [[str(i % 3), str(i % 5)] for i in range(30)]
+        groups = group_claims(evidence, max_claims=4, max_chunks=4)
+        assert sorted(i for g in groups for i in g) == list(range(30))
+
+
+class TestBuildBatchPrompt:
+    """Test batch prompt rendering."""
+
+    def test_shared_evidence_sent_once(self):
+        """Test that a chunk shared by claims appears once."""
+        prompt = build_batch_prompt(["c1", "c2"], [["shared", "x"], ["shared"]])
+        assert prompt.count("shared") == 1
+        assert "[1] shared" in prompt and "[2] x" in prompt
+        assert "1. c1" in prompt and "2. c2" in prompt
+
+
+class TestParseVerdicts:
+    """Test lenient parsing of batch replies."""
+
+    def test_json_array_of_objects(self):
+        """Test the requested format."""
+        text = '[{"claim": 1, "label": "support"}, {"claim": 2, "label": "contradict"}]'
+        assert parse_verdicts(text, 2) == ["support", "contradict"]
+
+    def test_out_of_order_numbers(self):
+        """Test that claim numbers, not positions, decide the slot."""
+        text = '[{"claim": 2, "label": "neutral"}, {"claim": 1, "label": "support"}]'
+        assert parse_verdicts(text, 2) == ["support", "neutral"]
+
+    def test_fenced_with_prose(self):
+        """Test a fenced block surrounded by chatter."""
+        text = 'sure! here you go:\n```json\n[{"claim": 1, "label": "SUPPORTS"}]\n```\nhope it helps'
+        assert parse_verdicts(text, 1) == ["support"]
+
+    def test_wrapped_object(self):
+        """Test an object wrapping the verdict list."""
+        text = '{"verdicts": [{"claim": 1, "verdict": "Contradicted"}]}'
+        assert parse_verdicts(text, 1) == ["contradict"]
+
+    def test_keyed_by_number(self):
+        """Test an object keyed by claim number."""
+        assert parse_verdicts('{"1": "neutral", "2": "support"}', 2) == ["neutral", "support"]
+
+    def test_plain_label_list(self):
+        """Test a bare list of label strings."""
+        assert parse_verdicts('["support", "neutral"]', 2) == ["support", "neutral"]
+
+    def test_numbered_lines(self):
+        """Test the non-JSON '<n>: <label>' fallback."""
+        text = "1: Support\nClaim 2 - CONTRADICT\n3) neutral"
+        assert parse_verdicts(text, 3) == ["support", "contradict", "neutral"]
+
+    def test_missing_claims_are_none(self):
+        """Test that claims the reply skips come back as None."""
+        assert parse_verdicts('[{"claim": 1, "label": "support"}]', 3) == ["support", None, None]
+
+    def test_garbage(self):
+        """Test that an unusable reply yields no labels."""
+        assert parse_verdicts("neutral", 2) == [None, None]
+        assert parse_verdicts("", 1) == [None]
+
+    def test_confidence_carried(self):
+        """Test that per-claim confidences come through on the verdicts."""
+        text = '{"verdicts": [{"claim": 1, "label": "support", "confidence": 0.8}]}'
+        (verdict,) = parse_verdicts(text, 1)
+        assert verdict == "support"
+        assert verdict.confidence == 0.8
@@ -0,0 +1,95 @@
+"""Unit tests for ingestion.chunk_table module."""
+import pytest
+from ingestion.chunk_table import ChunkTable
+from ingestion.chunker import chunk_text
+
+
+class TestChunkTableFromText:
+    """Test building tables that match chunk_text."""
+
+    @pytest.mark.parametrize("chunk_size,overlap", [(50, 10), (7, 0), (10, 9), (5, 20), (1, 0)])
+    def test_matches_chunk_text(self, sample_text, chunk_size, overlap):
+        """Test identical chunks to chunk_text, tail chunks included."""
+        table = ChunkTable.from_text(sample_text, chunk_size=chunk_size, overlap=overlap)
+        assert list(table) == chunk_text(sample_text, chunk_size=chunk_size, overlap=overlap)
+        assert len(table) == len(chunk_text(sample_text, chunk_size, overlap))
+
+    def test_empty_text(self):
+        """Test that empty and blank text give an empty table."""
+        assert len(ChunkTable.from_text("")) == 0
+        assert list(ChunkTable.from_text(" \n\t ")) == []
+
+    def test_invalid_chunk_size(self):
+        """Test that a non-positive chunk size is rejected."""
+        with pytest.raises(ValueError):
+            ChunkTable.from_text("a b", chunk_size=0)
+
+    def test_from_file(self, tmp_path):
+        """Test that file offsets index the untranslated file text."""
+        path = tmp_path / "story.txt"
+        path.write_bytes("one two\r\nthree four\r\n".encode("utf-8"))
+        table = ChunkTable.from_file(str(path), chunk_size=2, overlap=0)
+        assert list(table) == ["one two", "three four"]
+        assert table.span(1) == (9, 19)
+
+
+class TestChunkTableAccess:
+    """Test lazy access by id and position."""
+
+    @pytest.fixture
+    def table(self):
+        text = "Glenarvan sailed\non the Duncan.  Grant was\tlost at sea."
+        return ChunkTable.from_text(text, chunk_size=3, overlap=1)
+
+    def test_spans_locate_chunks(self, table):
+        """Test that spans slice each chunk's words out of the source."""
+        for i, chunk in enumerate(table):
+            start, end = table.span(i)
+            assert " ".join(table.source[start:end].split()) == chunk
+
+    def test_raw_keeps_formatting(self, table):
+        """Test that raw() returns the original text with its line breaks."""
+        assert table.raw(0) == "Glenarvan sailed\non"
+        assert table[0] == "Glenarvan sailed on"
+
+    def test_negative_and_out_of_range(self, table):
+        """Test Python-style negative indices and IndexError past the end."""
+        assert table[-1] == list(table)[-1]
+        with pytest.raises(IndexError):
+            table[len(table)]
+
+    def test_slice_shares_source(self, table):
+        """Test that slicing returns a table over the same source string."""
+        part = table[1:3]
+        assert isinstance(part, ChunkTable)
+        assert part.source is table.source
+        assert list(part) == list(table)[1:3]
+
+    def test_offsets_are_compact(self, sample_text):
+        """Test that heavily overlapping chunks cost 16 bytes each, not copies."""
+        table = ChunkTable.from_text(sample_text, chunk_size=20, overlap=10)
+        assert table.nbytes == 16 * len(table)
+        assert sum(len(chunk) for chunk in table) > len(sample_text)
+
+
+class TestChunkTableStructure:
+    """Test tables built from structure-aware chunks."""
+
+    def test_from_structure_matches_chunker(self, sample_text):
+        """Test that table texts and chapters match chunk_structured."""
+        from ingestion.structured_chunker import chunk_structured
+
+        text = "CHAPTER I.\n\n" + sample_text + "\n\nCHAPTER II.\n\n" + sample_text
+        table = ChunkTable.from_structure(text, chunk_size=40, overlap=10)
+        chunks = chunk_structured(text, chunk_size=40, overlap=10)
+        assert list(table) == [c.text for c in chunks]
+        assert [table.chapter(i) for i in range(len(table))] == [c.chapter for c in chunks]
+        assert table[1:].chapters.tolist() == [c.chapter for c in chunks[1:]]
+        assert [table.paragraph(i) for i in range(len(table))] == [c.paragraph for c in chunks]
+        assert table[1:].paragraphs.tolist() == [c.paragraph for c in chunks[1:]]
+
+    def test_word_tables_have_no_chapters(self, sample_text):
+        """Test that plain word-window tables report no chapter."""
+        table = ChunkTable.from_text(sample_text, 20, 0)
+        assert table.chapter(0) is None
+        assert table.paragraph(0) is None
@@ -1,6 +1,8 @@
 """Unit tests for ingestion.chunker module."""
+import io
+
 import pytest
-from ingestion.chunker import chunk_text
+from ingestion.chunker import Chunk, chunk_text, iter_chunks
 
 
 class TestChunkTextBasic:
@@ -88,3 +90,52 @@ class TestChunkTextConsistency:
         chunked_words = " ".join(chunks).split()
         # Compare relevant parts (may have extra spaces)
         assert len(chunked_words) >= len(original_words) - 10
+
+
+class TestIterChunks:
+    """Test streaming chunks from files and handles."""
+
+    @pytest.mark.parametrize("chunk_size,overlap", [(50, 10), (7, 0), (10, 9), (5, 20), (1, 0)])
+    def test_matches_chunk_text(self, sample_text, chunk_size, overlap):
+        """Test identical output to chunk_text, tail chunks included."""
+        expected = chunk_text(sample_text, chunk_size=chunk_size, overlap=overlap)
+        chunks = iter_chunks(io.StringIO(sample_text), chunk_size, overlap, block_size=64)
+        assert [c.text for c in chunks] == expected
+
+    def test_offsets_locate_chunks(self, sample_text):
+        """Test that start/end slice each chunk's words out of the source."""
+        for chunk in iter_chunks(io.StringIO(sample_text), chunk_size=12, overlap=3):
+            assert " ".join(sample_text[chunk.start:chunk.end].split()) == chunk.text
+            assert not sample_text[chunk.start].isspace()
+
+    def test_words_split_across_blocks(self):
+        """Test that tiny reads do not break words at block boundaries."""
+        text = "alpha beta\tgamma\n\ndelta epsilon"
+        chunks = list(iter_chunks(io.StringIO(text), chunk_size=2, overlap=0, block_size=3))
+        assert [c.text for c in chunks] == chunk_text(text, chunk_size=2, overlap=0)
+
+    def test_file_path(self, tmp_path):
+        """Test reading a path, with offsets into the untranslated file text."""
+        text = "première ligne\r\nseconde  ligne\r\n"
+        path = tmp_path / "story.txt"
+        path.write_bytes(text.encode("utf-8"))
+        chunks = list(iter_chunks(str(path), chunk_size=2, overlap=0))
+        assert chunks == [
+            Chunk("première ligne", 0, 14),
+            Chunk("seconde ligne", 16, 30),
+        ]
+
+    def test_binary_handle(self):
+        """Test that multi-byte characters split between reads decode intact."""
+        text = "naïve café déjà vu"
+        chunks = iter_chunks(io.BytesIO(text.encode("utf-8")), chunk_size=3, overlap=1, block_size=1)
+        assert [c.text for c in chunks] == chunk_text(text, chunk_size=3, overlap=1)
+
+    def test_empty_source(self):
+        """Test that empty or blank input yields nothing."""
+        assert list(iter_chunks(io.StringIO(" \n\t "))) == []
+
+    def test_invalid_chunk_size(self):
+        """Test that a non-positive chunk size is rejected."""
+        with pytest.raises(ValueError):
+            next(iter_chunks(io.StringIO("a b"), chunk_size=0))
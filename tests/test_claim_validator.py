@@ -0,0 +1,741 @@
+"""Unit tests for reasoning.claim_validator module (against a local stub server)."""
+import asyncio
+import contextlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pytest
+
+from openai import AsyncOpenAI
+
+from reasoning.claim_validator import (
+    CascadeBackend,
+    NLIBackend,
+    OpenAIBackend,
+    get_scheduler,
+    make_backend,
+    run,
+    set_async_client,
+    set_cache,
+    set_client,
+    set_scheduler,
+    stream_claims,
+    stream_validations,
+    validate_claim,
+    validate_claims,
+)
+from reasoning.rate_limiter import RequestScheduler, completion_tokens
+from reasoning.validation_cache import ValidationCache
+
+
+class StubChatServer:
+    """Minimal OpenAI-compatible /chat/completions endpoint on localhost.
+
+    reply(prompt) returns (status, content) or (status, content, headers);
+    every request is recorded, and so is each client connection (keep-alive
+    is supported).
+    """
+
+    def __init__(self, reply, delay=0.0):
+        self.reply = reply
+        self.delay = delay
+        self.prompts = []
+        self.bodies = []
+        self.connections = set()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                prompt = body["messages"][-1]["content"]
+                with server._lock:
+                    server.connections.add(self.client_address)
+                    server.prompts.append(prompt)
+                    server.bodies.append(body)
+                    server.in_flight += 1
+                    server.max_in_flight = max(server.max_in_flight, server.in_flight)
+                try:
+                    time.sleep(server.delay)
+                    status, content, *extra = server.reply(prompt)
+                finally:
+                    with server._lock:
+                        server.in_flight -= 1
+                if status == 200:
+                    payload = {
+                        "id": "chatcmpl-stub", "object": "chat.completion", "created": 0,
+                        "model": body["model"],
+                        "choices": [{
+                            "index": 0, "finish_reason": "stop",
+                            "message": {"role": "assistant", "content": content},
+                        }],
+                        "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+                    }
+                else:
+                    payload = {"error": {"message": content, "type": "stub_error"}}
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (extra[0] if extra else {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}/v1"
+        self._thread = threading.Thread(
+            target=self.httpd.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+        )
+        self._thread.start()
+
+    def client(self):
+        return AsyncOpenAI(api_key="test-key", base_url=self.base_url, max_retries=0)
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def keyword_label(claim):
+    if "never" in claim:
+        return "contradict"
+    if "maybe" in claim:
+        return "neutral"
+    return "support"
+
+
+def keyword_reply(prompt):
+    """Label claims by keyword so results can be checked for order."""
+    if "Claims:" in prompt:
+        lines = prompt.split("Claims:")[1].split("\n\n")[0].strip().splitlines()
+        verdicts = [
+            {"claim": int(line.split(".")[0]), "label": keyword_label(line)} for line in lines
+        ]
+        return 200, json.dumps(verdicts)
+    claim = prompt.split("Claim:")[1].split("Evidence:")[0]
+    return 200, json.dumps({"label": keyword_label(claim).upper(), "confidence": 0.75})
+
+
+@pytest.fixture(autouse=True)
+def validation_cache():
+    """Fresh in-memory validation cache per test (never the on-disk default)."""
+    cache = ValidationCache(":memory:")
+    previous = set_cache(cache)
+    yield cache
+    set_cache(previous)
+
+
+@pytest.fixture(autouse=True)
+def scheduler():
+    """Fast-retrying scheduler per test so metrics start from zero."""
+    scheduler = RequestScheduler(max_retries=2, base_delay=0.01, seed=0)
+    previous = set_scheduler(scheduler)
+    yield scheduler
+    set_scheduler(previous)
+
+
+@pytest.fixture
+def no_api_key(monkeypatch):
+    """No API key or base URL, and no client built yet."""
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.delenv("CLAIM_VALIDATOR_BASE_URL", raising=False)
+    previous = set_client(None), set_async_client(None)
+    yield
+    set_client(previous[0])
+    set_async_client(previous[1])
+
+
+@pytest.fixture
+def stub_server():
+    servers = []
+
+    def start(reply=keyword_reply, delay=0.0):
+        server = StubChatServer(reply, delay)
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.close()
+
+
+class TestValidateClaimsAsync:
+    """Test concurrent validation against the stub server."""
+
+    def test_preserves_order(self, stub_server):
+        """Test that labels come back in claim order despite concurrency."""
+        server = stub_server(delay=0.01)
+        claims = ["he sailed", "he never sailed", "maybe he sailed"] * 4
+        labels = asyncio.run(validate_claims(claims, [["e"]] * len(claims), client=server.client()))
+        assert labels == ["support", "contradict", "neutral"] * 4
+
+    def test_bounded_concurrency(self, stub_server):
+        """Test that no more than `concurrency` requests are in flight."""
+        server = stub_server(delay=0.05)
+        claims = [f"claim {i}" for i in range(12)]
+        asyncio.run(validate_claims(claims, [[]] * 12, concurrency=3, client=server.client()))
+        assert len(server.prompts) == 12
+        assert server.max_in_flight <= 3
+
+    def test_runs_concurrently(self, stub_server):
+        """Test that requests overlap instead of running one at a time."""
+        server = stub_server(delay=0.1)
+        claims = [f"claim {i}" for i in range(20)]
+        asyncio.run(validate_claims(claims, [[]] * 20, concurrency=10, client=server.client()))
+        assert server.max_in_flight > 1
+
+    def test_api_error_returns_fallback(self, stub_server):
+        """Test that server errors become the fallback label."""
+        server = stub_server(reply=lambda prompt: (500, "boom"))
+        labels = asyncio.run(validate_claims(["a claim"], [[]], client=server.client()))
+        assert labels == ["neutral"]
+
+    def test_missing_api_key_returns_fallback(self, no_api_key, capsys):
+        """Test that a client that cannot be built gives the fallback label, not an error."""
+        labels = asyncio.run(validate_claims(["a claim", "another"], [[], []]))
+        assert labels == ["neutral", "neutral"]
+        assert validate_claim("a claim", []) == "neutral"
+        assert "client unavailable" in capsys.readouterr().err
+
+    def test_length_mismatch(self):
+        """Test that claims and evidence must align."""
+        with pytest.raises(ValueError):
+            asyncio.run(validate_claims(["a", "b"], [[]]))
+
+
+class TestValidationCaching:
+    """Test that cached and duplicate prompts skip the API."""
+
+    def test_repeat_run_makes_no_requests(self, stub_server, validation_cache):
+        """Test that a second identical analysis is served from the cache."""
+        server = stub_server()
+        claims = ["he sailed", "he never sailed"]
+        first = asyncio.run(validate_claims(claims, [["e"]] * 2, client=server.client()))
+        second = asyncio.run(validate_claims(claims, [["e"]] * 2, client=server.client()))
+        assert first == second == ["support", "contradict"]
+        assert len(server.prompts) == 2
+        assert validation_cache.stats()["hits"] == 2
+
+    def test_each_prompt_looked_up_once(self, stub_server, validation_cache):
+        """Test exact hit and miss counts, one lookup per prompt per run."""
+        server = stub_server()
+        claims = ["he sailed", "he never sailed", "he swam"]
+        asyncio.run(validate_claims(claims, [["e"]] * 3, client=server.client()))
+        assert validation_cache.stats()["hits"] == 0
+        assert validation_cache.stats()["misses"] == 3
+        asyncio.run(validate_claims(claims, [["e"]] * 3, client=server.client()))
+        assert validation_cache.stats()["hits"] == 3
+        assert validation_cache.stats()["misses"] == 3
+        assert validation_cache.stats()["hit_rate"] == 0.5
+
+    def test_batch_retry_looked_up_once(self, stub_server, validation_cache):
+        """Test that a claim a batch reply left out costs one more lookup, not two."""
+        def reply(prompt):
+            if "Claims:" in prompt:
+                return 200, '[{"claim": 1, "label": "contradict"}]'
+            return keyword_reply(prompt)
+
+        server = stub_server(reply=reply)
+        asyncio.run(
+            validate_claims(["a", "b"], [["ch"], ["ch"]], batch_size=8, client=server.client())
+        )
+        assert validation_cache.stats()["misses"] == 2  # the batch, then claim "b" alone
+
+    def test_duplicate_prompts_sent_once(self, stub_server):
+        """Test that identical claims in one call share a request."""
+        server = stub_server()
+        labels = asyncio.run(validate_claims(["x", "x", "x"], [["e"]] * 3, client=server.client()))
+        assert labels == ["support"] * 3
+        assert len(server.prompts) == 1
+
+    def test_evidence_changes_the_key(self, stub_server):
+        """Test that the same claim with new evidence is re-validated."""
+        server = stub_server()
+        asyncio.run(validate_claims(["x"], [["a"]], client=server.client()))
+        asyncio.run(validate_claims(["x"], [["b"]], client=server.client()))
+        assert len(server.prompts) == 2
+
+    def test_fallback_not_cached(self, stub_server, validation_cache):
+        """Test that failed requests are retried on the next run."""
+        server = stub_server(reply=lambda prompt: (500, "boom"))
+        asyncio.run(validate_claims(["x"], [[]], client=server.client()))
+        assert len(validation_cache) == 0
+
+    def test_all_cached_needs_no_client(self, stub_server):
+        """Test that a fully cached call never builds an API client."""
+        server = stub_server()
+        asyncio.run(validate_claims(["x"], [[]], client=server.client()))
+        # client=None would create a real AsyncOpenAI client on a miss.
+        assert asyncio.run(validate_claims(["x"], [[]])) == ["support"]
+
+
+def throttle_first(n, retry_after="0.05"):
+    """Reply 429 to the first n requests, then label as keyword_reply does."""
+    calls = []
+    lock = threading.Lock()
+
+    def reply(prompt):
+        with lock:
+            calls.append(prompt)
+            throttled = len(calls) <= n
+        if throttled:
+            return 429, "slow down", {"Retry-After": retry_after}
+        return keyword_reply(prompt)
+
+    return reply
+
+
+class TestRateLimitRetries:
+    """Test that throttled requests are retried instead of falling back."""
+
+    def test_rate_limit_is_retried(self, stub_server, scheduler):
+        """Test that a 429 then success yields the real label."""
+        server = stub_server(reply=throttle_first(1))
+        labels = asyncio.run(validate_claims(["he never sailed"], [[]], client=server.client()))
+        assert labels == ["contradict"]
+        stats = scheduler.stats()
+        assert stats["retries"] == 1
+        assert stats["rate_limited"] == 1
+        assert stats["fallbacks"] == 0
+
+    def test_retry_after_is_honored(self, stub_server, scheduler):
+        """Test that the backoff is at least the server's Retry-After."""
+        server = stub_server(reply=throttle_first(1, retry_after="0.2"))
+        start = time.perf_counter()
+        asyncio.run(validate_claims(["x"], [[]], client=server.client()))
+        assert time.perf_counter() - start >= 0.2
+        assert scheduler.stats()["backoff_wait_s"] >= 0.2
+
+    def test_gives_up_after_max_retries(self, stub_server, scheduler):
+        """Test that persistent throttling ends in the fallback label."""
+        server = stub_server(reply=throttle_first(100, retry_after="0"))
+        labels = asyncio.run(validate_claims(["x"], [[]], client=server.client()))
+        assert labels == ["neutral"]
+        assert len(server.prompts) == 3
+        assert scheduler.stats()["fallbacks"] == 1
+
+    def test_client_errors_are_not_retried(self, stub_server, scheduler):
+        """Test that a 400 falls back without retrying."""
+        server = stub_server(reply=lambda prompt: (400, "bad request"))
+        asyncio.run(validate_claims(["x"], [[]], client=server.client()))
+        assert len(server.prompts) == 1
+        assert scheduler.stats()["retries"] == 0
+
+    def test_sync_path_uses_scheduler(self, stub_server, scheduler, monkeypatch):
+        """Test that validate_claim retries through the shared scheduler."""
+        import reasoning.claim_validator as claim_validator
+        from openai import OpenAI
+
+        server = stub_server(reply=throttle_first(1, retry_after="0"))
+        monkeypatch.setattr(
+            claim_validator, "client",
+            OpenAI(api_key="test-key", base_url=server.base_url, max_retries=0),
+        )
+        assert validate_claim("he sailed", []) == "support"
+        assert get_scheduler().stats()["retries"] == 1
+
+
+class TestSharedClient:
+    """Test the lazily built clients shared across calls."""
+
+    @pytest.fixture
+    def local_server(self, stub_server, monkeypatch):
+        """Stub server configured as the endpoint; shared clients reset around the test."""
+        server = stub_server()
+        monkeypatch.setenv("CLAIM_VALIDATOR_BASE_URL", server.base_url)
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+        previous = set_client(None), set_async_client(None)
+        yield server
+        set_client(previous[0])
+        set_async_client(previous[1])
+
+    def test_sync_client_built_once(self, local_server):
+        """Test that validate_claim builds one client and reuses it."""
+        from reasoning.claim_validator import get_client
+
+        assert validate_claim("he sailed", ["e1"]) == "support"
+        client = get_client()
+        assert validate_claim("he never sailed", ["e2"]) == "contradict"
+        assert get_client() is client
+        assert len(local_server.connections) == 1
+
+    def test_connections_reused_across_runs(self, local_server):
+        """Test that run() reuses one pooled connection for separate validations."""
+        first = run(validate_claims(["he sailed"], [["e1"]], concurrency=1))
+        second = run(validate_claims(["he never sailed"], [["e2"]], concurrency=1))
+        assert (first, second) == (["support"], ["contradict"])
+        assert len(local_server.prompts) == 2
+        assert len(local_server.connections) == 1
+
+    def test_outside_run_uses_own_client(self, local_server):
+        """Test that asyncio.run() without a client still works via a per-call client."""
+        labels = asyncio.run(validate_claims(["he sailed"], [["e"]]))
+        assert labels == ["support"]
+
+    def test_configured_model(self, local_server, monkeypatch):
+        """Test that requests name the configured model."""
+        import reasoning.claim_validator as claim_validator
+
+        monkeypatch.setattr(claim_validator, "MODEL", "local-model")
+        run(validate_claims(["he sailed"], [["e"]]))
+        assert local_server.bodies[-1]["model"] == "local-model"
+
+
+class TestBatchMode:
+    """Test validating claims that share evidence in one request."""
+
+    def test_groups_shared_evidence(self, stub_server):
+        """Test that claims sharing chunks cost one request and keep order."""
+        server = stub_server()
+        claims = ["he sailed", "he never sailed", "maybe he sailed", "she rode"]
+        evidence = [["ch1", "ch2"], ["ch2", "ch3"], ["ch1"], ["ch9"]]
+        labels = asyncio.run(
+            validate_claims(claims, evidence, batch_size=8, client=server.client())
+        )
+        assert labels == ["support", "contradict", "neutral", "support"]
+        assert len(server.prompts) == 2
+        batch = next(p for p in server.prompts if "Claims:" in p)
+        assert batch.count("ch1") == 1 and batch.count("ch2") == 1
+
+    def test_missing_verdicts_fall_back_to_single(self, stub_server):
+        """Test that claims absent from a batch reply are validated alone."""
+        def reply(prompt):
+            if "Claims:" in prompt:
+                return 200, '[{"claim": 1, "label": "contradict"}]'
+            return keyword_reply(prompt)
+
+        server = stub_server(reply=reply)
+        labels = asyncio.run(
+            validate_claims(["a", "b"], [["ch"], ["ch"]], batch_size=8, client=server.client())
+        )
+        assert labels == ["contradict", "support"]
+        assert len(server.prompts) == 2
+
+    def test_failed_batch_retried_per_claim(self, stub_server):
+        """Test that a failed batch request does not spread one fallback label."""
+        def reply(prompt):
+            if "Claims:" in prompt:
+                return 400, "too long"
+            return keyword_reply(prompt)
+
+        server = stub_server(reply=reply)
+        labels = asyncio.run(validate_claims(
+            ["x", "never x"], [["ch"], ["ch"]], batch_size=8, client=server.client()
+        ))
+        assert labels == ["support", "contradict"]
+
+    def test_max_tokens_scale_with_batch(self, stub_server):
+        """Test that a batch request may answer every claim, a single one just one."""
+        server = stub_server()
+        claims = ["a", "b", "c", "d"]
+        evidence = [["ch"], ["ch"], ["ch"], ["other"]]
+        asyncio.run(validate_claims(claims, evidence, batch_size=8, client=server.client()))
+        caps = {
+            "Claims:" in body["messages"][-1]["content"]: body["max_tokens"]
+            for body in server.bodies
+        }
+        assert caps[True] == completion_tokens(3)
+        assert caps[False] == completion_tokens(1)
+
+    def test_batch_reply_is_cached(self, stub_server):
+        """Test that rerunning a batched analysis makes no requests."""
+        server = stub_server()
+        args = (["a", "b"], [["ch"], ["ch"]])
+        asyncio.run(validate_claims(*args, batch_size=8, client=server.client()))
+        asyncio.run(validate_claims(*args, batch_size=8, client=server.client()))
+        assert len(server.prompts) == 1
+
+
+class FakeNLIModel:
+    """Cross-encoder stand-in: contradiction if the premise says 'not', else
+    entailment when premise and hypothesis share words, else neutral."""
+
+    def __init__(self, id2label=None):
+        self.config = type("Config", (), {"id2label": id2label or {}})()
+        self.order = [id2label[i].lower() for i in sorted(id2label)] if id2label else [
+            "contradiction", "entailment", "neutral"
+        ]
+        self.calls = []
+
+    def predict(self, pairs, batch_size=32, convert_to_numpy=True):
+        self.calls.append(len(pairs))
+        logits = []
+        for premise, hypothesis in pairs:
+            shared = set(premise.lower().split()) & set(hypothesis.lower().split())
+            if "not" in premise.lower().split():
+                winner = "contradiction"
+            elif shared:
+                winner = "entailment"
+            else:
+                winner = "neutral"
+            logits.append([4.0 if name == winner else 0.0 for name in self.order])
+        return np.array(logits, dtype=np.float32)
+
+
+def nli_backend(**model_args):
+    backend = NLIBackend()
+    backend._model = FakeNLIModel(**model_args)
+    return backend
+
+
+class TestBackends:
+    """Test the validator backend interface."""
+
+    def test_nli_labels(self):
+        """Test that NLI classes map to our labels."""
+        backend = nli_backend()
+        labels = asyncio.run(backend.validate(
+            ["the ship sailed", "the ship sailed", "a horse ran"],
+            [["the ship sailed north"], ["it did not happen"], ["the sea was calm"]],
+        ))
+        assert labels == ["support", "contradict", "neutral"]
+
+    def test_nli_batches_all_pairs(self):
+        """Test that every claim-chunk pair goes through one predict call."""
+        backend = nli_backend()
+        asyncio.run(backend.validate(["a", "b"], [["x", "y", "z"], "w"]))
+        assert backend._model.calls == [4]
+
+    def test_nli_most_decisive_chunk_wins(self):
+        """Test that one contradicting chunk is not outvoted by neutral ones."""
+        backend = nli_backend()
+        labels = asyncio.run(backend.validate(
+            ["the ship sailed"], [["unrelated text", "it was not so", "more filler"]]
+        ))
+        assert labels == ["contradict"]
+
+    def test_nli_uses_model_label_order(self):
+        """Test that a model's own id2label order is respected."""
+        backend = nli_backend(id2label={0: "ENTAILMENT", 1: "NEUTRAL", 2: "CONTRADICTION"})
+        labels = asyncio.run(backend.validate(["the ship", "x"], [["the ship sank"], ["not"]]))
+        assert labels == ["support", "contradict"]
+
+    def test_nli_probabilities(self):
+        """Test that probabilities are normalized rows in LABEL_ORDER."""
+        probs = nli_backend().probabilities(["the ship"], [["the ship sank"]])
+        assert probs.shape == (1, 3)
+        assert probs.sum() == pytest.approx(1.0)
+        assert probs[0].argmax() == 0
+
+    def test_nli_empty_evidence(self):
+        """Test that a claim without evidence still gets a label."""
+        assert asyncio.run(nli_backend().validate(["a claim"], [[]])) == ["neutral"]
+
+    def test_openai_backend(self, stub_server):
+        """Test that the OpenAI backend delegates to validate_claims."""
+        server = stub_server()
+        backend = OpenAIBackend(client=server.client())
+        labels = asyncio.run(backend.validate(["he sailed", "he never sailed"], [["e"], ["e"]]))
+        assert labels == ["support", "contradict"]
+
+    def test_make_backend(self, monkeypatch):
+        """Test backend lookup by name and from the environment."""
+        assert isinstance(make_backend("nli"), NLIBackend)
+        monkeypatch.setenv("CLAIM_VALIDATOR_BACKEND", "nli")
+        assert isinstance(make_backend(), NLIBackend)
+        with pytest.raises(ValueError):
+            make_backend("nope")
+
+
+class FixedScreen:
+    """Screening backend returning preset probabilities per claim."""
+
+    def __init__(self, probs):
+        self.probs = probs
+
+    def probabilities(self, claims, evidence):
+        return np.array([self.probs[c] for c in claims], dtype=np.float32)
+
+
+class TestCascadeBackend:
+    """Test local screening with LLM escalation."""
+
+    PROBS = {
+        "sure yes": [0.97, 0.02, 0.01],
+        "sure no": [0.01, 0.99, 0.00],
+        "unsure": [0.5, 0.3, 0.2],
+        "maybe never": [0.1, 0.9, 0.0],
+    }
+
+    def test_only_uncertain_claims_escalate(self, stub_server):
+        """Test that confident claims skip the LLM and the rest go to it."""
+        server = stub_server()
+        cascade = CascadeBackend(
+            screen=FixedScreen(self.PROBS), escalate=OpenAIBackend(client=server.client())
+        )
+        claims = ["sure yes", "unsure", "sure no", "maybe never"]
+        labels = asyncio.run(cascade.validate(claims, [["e"]] * 4))
+        # "maybe never" is 0.9 contradict: below the stricter contradict bar.
+        assert labels == ["support", "support", "contradict", "contradict"]
+        assert len(server.prompts) == 2
+        stats = cascade.stats()
+        assert stats["screened"] == 2
+        assert stats["escalated"] == 2
+        assert stats["calls_avoided"] == 2
+        assert stats["avoided_rate"] == 0.5
+
+    def test_thresholds_configurable(self, stub_server):
+        """Test that raising a threshold to 1 forces escalation."""
+        server = stub_server()
+        cascade = CascadeBackend(
+            screen=FixedScreen(self.PROBS),
+            escalate=OpenAIBackend(client=server.client()),
+            thresholds={"support": 1.0},
+        )
+        asyncio.run(cascade.validate(["sure yes"], [["e"]]))
+        assert len(server.prompts) == 1
+
+    def test_similarity_prefilter(self, stub_server):
+        """Test that claims unrelated to their evidence are neutral without any model."""
+        server = stub_server()
+        screen = FixedScreen(self.PROBS)
+        vectors = {"unsure": [1.0, 0.0], "far": [0.0, 1.0], "near": [1.0, 0.0]}
+        cascade = CascadeBackend(
+            screen=screen,
+            escalate=OpenAIBackend(client=server.client()),
+            embed=lambda texts: np.array([vectors[t] for t in texts], dtype=np.float32),
+            min_similarity=0.5,
+        )
+        labels = asyncio.run(cascade.validate(["unsure", "unsure"], [["far"], ["near", "far"]]))
+        assert labels == ["neutral", "support"]
+        assert cascade.stats()["irrelevant"] == 1
+        assert len(server.prompts) == 1
+
+    def test_escalation_without_api_key(self, no_api_key):
+        """Test that escalating without an API key falls back instead of crashing."""
+        cascade = CascadeBackend(screen=FixedScreen(self.PROBS), escalate=OpenAIBackend())
+        labels = asyncio.run(cascade.validate(["sure yes", "unsure"], [["e"], ["e"]]))
+        assert labels == ["support", "neutral"]
+
+    def test_default_screen_is_nli(self):
+        """Test that the cascade screens with the NLI backend by default."""
+        assert isinstance(CascadeBackend().screen, NLIBackend)
+        assert isinstance(make_backend("cascade"), CascadeBackend)
+
+
+async def take(stream, n):
+    """First n pairs of a validation stream, then close it."""
+    pairs = []
+    async with contextlib.aclosing(stream):
+        async for pair in stream:
+            pairs.append(pair)
+            if len(pairs) == n:
+                break
+    return pairs
+
+
+async def collect(stream):
+    return [pair async for pair in stream]
+
+
+class TestStreaming:
+    """Test validations streamed as they complete."""
+
+    def test_yields_every_claim_once(self, stub_server):
+        """Test that each claim index arrives exactly once with its verdict."""
+        server = stub_server()
+        claims = [f"claim {i}" if i % 2 else f"never {i}" for i in range(6)]
+        pairs = asyncio.run(collect(stream_claims(claims, [["e"]] * 6, client=server.client())))
+        assert sorted(i for i, _ in pairs) == list(range(6))
+        assert all(verdict == keyword_label(claims[i]) for i, verdict in pairs)
+
+    def test_cached_claims_first(self, stub_server):
+        """Test that cached verdicts are yielded before any request completes."""
+        server = stub_server()
+        asyncio.run(validate_claims(["he sailed"], [["e"]], client=server.client()))
+        pairs = asyncio.run(collect(stream_claims(
+            ["he never sailed", "he sailed"], [["e"], ["e"]], client=server.client()
+        )))
+        assert [i for i, _ in pairs] == [1, 0]
+
+    def test_closing_cancels_outstanding(self, stub_server):
+        """Test that stopping early sends no further requests."""
+        server = stub_server(delay=0.05)
+        claims = [f"claim {i}" for i in range(10)]
+        pairs = asyncio.run(take(
+            stream_claims(claims, [["e"]] * 10, concurrency=2, client=server.client()), 1
+        ))
+        time.sleep(0.1)
+        assert len(pairs) == 1
+        assert len(server.prompts) <= 3
+
+    def test_batch_mode(self, stub_server):
+        """Test that batched claims are streamed per claim."""
+        server = stub_server()
+        claims = ["a", "never b", "c"]
+        pairs = asyncio.run(collect(stream_claims(
+            claims, [["shared"]] * 3, batch_size=8, client=server.client()
+        )))
+        assert dict(pairs) == {0: "support", 1: "contradict", 2: "support"}
+        assert len(server.prompts) == 1
+
+    def test_nli_streams_in_slices(self):
+        """Test that the NLI backend stops scoring when the stream is closed."""
+        backend = nli_backend()
+        backend.batch_size = 2
+        pairs = asyncio.run(take(backend.stream(["a", "b", "c", "d"], [["x"]] * 4), 2))
+        assert [i for i, _ in pairs] == [0, 1]
+        assert backend._model.calls == [2]
+
+    def test_cascade_screened_first(self, stub_server):
+        """Test that closing after the screened claims skips every LLM call."""
+        server = stub_server()
+        cascade = CascadeBackend(
+            screen=FixedScreen(TestCascadeBackend.PROBS),
+            escalate=OpenAIBackend(client=server.client()),
+        )
+        claims = ["unsure", "sure yes", "sure no"]
+        pairs = asyncio.run(take(cascade.stream(claims, [["e"]] * 3), 2))
+        assert dict(pairs) == {1: "support", 2: "contradict"}
+        assert server.prompts == []
+        assert cascade.stats()["calls_avoided"] == 3
+
+    def test_backend_without_stream(self):
+        """Test that a validate-only backend is streamed whole."""
+        class Fixed:
+            async def validate(self, claims, evidence):
+                return ["support"] * len(claims)
+
+        pairs = asyncio.run(collect(stream_validations(Fixed(), ["a", "b"], [[], []])))
+        assert pairs == [(0, "support"), (1, "support")]
+
+
+class TestStructuredOutput:
+    """Test normalized verdicts with confidence."""
+
+    def test_json_verdict_with_confidence(self, stub_server):
+        """Test that JSON replies become verdicts carrying confidence."""
+        server = stub_server()
+        (verdict,) = asyncio.run(validate_claims(["he never sailed"], [["e"]], client=server.client()))
+        assert verdict == "contradict"
+        assert verdict.confidence == 0.75
+        assert server.bodies[0]["response_format"] == {"type": "json_object"}
+
+    def test_plain_variants_normalized(self, stub_server):
+        """Test that free-text replies are mapped onto labels."""
+        server = stub_server(reply=lambda prompt: (200, "Supports."))
+        assert asyncio.run(validate_claims(["x"], [[]], client=server.client())) == ["support"]
+
+    def test_unparseable_reply_is_fallback(self, stub_server):
+        """Test that a reply naming no label is the fallback with zero confidence."""
+        server = stub_server(reply=lambda prompt: (200, "I cannot say."))
+        (verdict,) = asyncio.run(validate_claims(["x"], [[]], client=server.client()))
+        assert verdict == "neutral"
+        assert verdict.confidence == 0.0
+
+    def test_nli_confidence(self):
+        """Test that NLI verdicts carry the winning class probability."""
+        (verdict,) = asyncio.run(nli_backend().validate(["the ship"], [["the ship sank"]]))
+        assert verdict == "support"
+        assert 0.9 < verdict.confidence <= 1.0
@@ -99,3 +99,29 @@ class TestContradictionScoreConsistency:
         score1 = contradiction_score(validations1)
         score2 = contradiction_score(validations2)
         assert score1 == score2
+
+
+class TestContradictionScoreNormalization:
+    """Test scoring of unnormalized labels and code arrays."""
+
+    def test_variants_are_normalized(self):
+        """Test that label variants score like their normalized labels."""
+        assert contradiction_score(["Supports.", "CONTRADICTS", "Neutral"]) == 0.5
+
+    def test_unrecognised_counts_as_neutral(self):
+        """Test that malformed answers no longer count as support."""
+        assert contradiction_score(["I cannot answer that"]) == 0.5
+
+    def test_code_array(self):
+        """Test scoring a typed array of verdict codes."""
+        import numpy as np
+        from reasoning.verdict import CONTRADICT, NEUTRAL, SUPPORT
+
+        codes = np.array([SUPPORT, CONTRADICT, NEUTRAL, SUPPORT], dtype=np.int8)
+        assert contradiction_score(codes) == 0.375
+
+    def test_claim_scores(self):
+        """Test per-claim contributions averaged by contradiction_score."""
+        from reasoning.contradiction_score import claim_scores
+
+        assert claim_scores(["support", "contradict", "neutral"]).tolist() == [0.0, 1.0, 0.5]
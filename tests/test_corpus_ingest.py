@@ -0,0 +1,110 @@
+"""Unit tests for ingestion.corpus_ingest module."""
+import pytest
+
+from ingestion.corpus_ingest import find_files, ingest_corpus, normalize_text, prepare_file
+from ingestion.structured_chunker import chunk_structured
+from retrieval.pathway_store import PathwayStore
+
+
+@pytest.fixture
+def library(tmp_path, sample_text):
+    (tmp_path / "verne").mkdir()
+    (tmp_path / "verne" / "grant.txt").write_text(sample_text, encoding="utf-8")
+    (tmp_path / "nemo.txt").write_text(
+        "Captain Nemo steered the Nautilus.\n\nThe submarine dived under the ice.",
+        encoding="utf-8",
+    )
+    (tmp_path / "notes.md").write_text("not a book", encoding="utf-8")
+    return tmp_path
+
+
+class TestNormalizeText:
+    """Test text clean-up before chunking."""
+
+    def test_line_endings(self):
+        """Test that Windows and old Mac line endings become \\n."""
+        assert normalize_text("a\r\nb\rc\n") == "a\nb\nc\n"
+
+    def test_bom_and_composition(self):
+        """Test that a byte-order mark is dropped and accents are composed."""
+        assert normalize_text("\ufeffCafe\u0301") == "Caf\u00e9"
+
+
+class TestFindFiles:
+    """Test discovery of corpus files."""
+
+    def test_relative_sorted_paths(self, library):
+        """Test that matching files are found recursively, relative to the directory."""
+        assert find_files(str(library)) == ["nemo.txt", "verne/grant.txt"]
+
+    def test_pattern(self, library):
+        """Test that the glob pattern selects other files."""
+        assert find_files(str(library), "*.md") == ["notes.md"]
+
+
+class TestPrepareFile:
+    """Test the per-file read, normalize and chunk stage."""
+
+    def test_chunks_and_timings(self, library):
+        """Test that a file is chunked like chunk_structured, with stage timings."""
+        path = library / "verne" / "grant.txt"
+        chunks, timings = prepare_file(str(path), chunk_size=20, overlap=5)
+        expected = chunk_structured(path.read_text(encoding="utf-8"), 20, 5)
+        assert chunks == [chunk.text for chunk in expected]
+        assert set(timings) == {"read", "normalize", "chunk"}
+        assert all(seconds >= 0 and megabytes > 0 for seconds, megabytes in timings.values())
+
+    def test_invalid_utf8(self, tmp_path):
+        """Test that undecodable bytes are replaced instead of failing the corpus."""
+        path = tmp_path / "bad.txt"
+        path.write_bytes(b"Caf\xe9 au lait.")
+        chunks, _ = prepare_file(str(path), structured=False)
+        assert chunks == ["Caf\ufffd au lait."]
+
+
+class TestIngestCorpus:
+    """Test the pipelined ingestion into a store."""
+
+    def test_chunks_tagged_by_source(self, library):
+        """Test that every file's chunks are added in file order, tagged by path."""
+        store = PathwayStore([])
+        report = ingest_corpus(str(library), store, chunk_size=20, overlap=5, workers=1)
+        assert report["files"] == 2
+        assert report["chunks"] == len(store.chunks)
+        assert store.sources[0] == "nemo.txt"
+        assert set(store.sources) == {"nemo.txt", "verne/grant.txt"}
+        nemo = "Captain Nemo steered the Nautilus. The submarine dived under the ice."
+        assert store.search("submarine ice", top_k=1, sources="nemo.txt") == [nemo]
+        assert nemo not in store.search("submarine ice", top_k=3, sources=["verne/grant.txt"])
+
+    def test_process_pool_matches_serial(self, library):
+        """Test that worker processes produce the same store as one thread."""
+        serial, parallel = PathwayStore([]), PathwayStore([])
+        ingest_corpus(str(library), serial, chunk_size=20, overlap=5, workers=1)
+        ingest_corpus(str(library), parallel, chunk_size=20, overlap=5, workers=2, queue_size=1)
+        assert parallel.chunks == serial.chunks
+        assert parallel.sources == serial.sources
+
+    def test_persisted_with_report(self, library, tmp_path):
+        """Test that the store is saved with its tags and every stage is reported."""
+        out = str(tmp_path / "out" / "library.store")
+        report = ingest_corpus(str(library), PathwayStore([]), out=out, workers=1)
+        assert list(report["stages"]) == ["read", "normalize", "chunk", "embed", "write"]
+        assert report["stages"]["embed"]["unit"] == "chunks/s"
+        assert report["stages"]["embed"]["amount"] == report["chunks"]
+        loaded = PathwayStore.load(out)
+        assert set(loaded.sources) == {"nemo.txt", "verne/grant.txt"}
+
+    def test_error_stops_pipeline(self, library):
+        """Test that a failing stage propagates and leaves no worker behind."""
+        class Broken(PathwayStore):
+            def add_chunks(self, chunks, source=None):
+                raise RuntimeError("disk full")
+
+        with pytest.raises(RuntimeError, match="disk full"):
+            ingest_corpus(str(library), Broken([]), workers=1, queue_size=1)
+
+    def test_invalid_queue_size(self, library):
+        """Test that the queue must hold at least one file."""
+        with pytest.raises(ValueError):
+            ingest_corpus(str(library), PathwayStore([]), queue_size=0)
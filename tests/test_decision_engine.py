@@ -1,6 +1,9 @@
 """Unit tests for reasoning.decision_engine module."""
+import asyncio
+
 import pytest
-from reasoning.decision_engine import final_decision
+from reasoning.contradiction_score import contradiction_score
+from reasoning.decision_engine import StreamingDecision, decide_streaming, final_decision
 
 
 class TestFinalDecisionBasic:
@@ -89,3 +92,89 @@ class TestFinalDecisionConsistency:
         # Higher scores should be inconsistent
         assert final_decision(0.7) == 0
         assert final_decision(0.9) == 0
+
+
+class TestStreamingDecision:
+    """Test the decision tracked while validations arrive."""
+
+    def test_bounds_narrow_as_claims_arrive(self):
+        """Test that bounds span all outcomes and tighten with each claim."""
+        tracker = StreamingDecision(4)
+        assert tracker.bounds() == (0.0, 1.0)
+        tracker.add(2, "neutral")
+        assert tracker.bounds() == (0.125, 0.875)
+
+    def test_settles_consistent_early(self):
+        """Test that enough support settles CONSISTENT before all claims are in."""
+        tracker = StreamingDecision(5)
+        for i in range(2):
+            tracker.add(i, "support")
+            assert tracker.decision is None
+        tracker.add(2, "support")
+        assert tracker.decision == 1
+        assert tracker.decided_after == 3
+        assert not tracker.complete
+
+    def test_settles_inconsistent_early(self):
+        """Test that enough contradictions settle INCONSISTENT."""
+        tracker = StreamingDecision(5)
+        for i in range(3):
+            tracker.add(i, "contradict")
+        assert tracker.decision == 0
+        assert tracker.score() is None
+
+    def test_matches_batch_decision(self):
+        """Test that the settled decision equals final_decision on the full list."""
+        labels = ["support", "neutral", "contradict", "contradict", "neutral", "support"]
+        tracker = StreamingDecision(len(labels))
+        for i in reversed(range(len(labels))):
+            tracker.add(i, labels[i])
+        assert tracker.complete
+        assert tracker.decision == final_decision(contradiction_score(labels))
+        assert tracker.score() == contradiction_score(labels)
+
+    def test_no_claims(self):
+        """Test that an empty claim set is decided immediately, as in batch mode."""
+        assert StreamingDecision(0).decision == final_decision(contradiction_score([]))
+
+    def test_duplicate_rejected(self):
+        """Test that a claim cannot be counted twice."""
+        tracker = StreamingDecision(2)
+        tracker.add(0, "support")
+        with pytest.raises(ValueError):
+            tracker.add(0, "support")
+
+
+class TestDecideStreaming:
+    """Test consuming a validation stream until the decision settles."""
+
+    @staticmethod
+    def stream(labels, log):
+        async def generate():
+            try:
+                for i, label in enumerate(labels):
+                    log.append(i)
+                    yield i, label
+            finally:
+                log.append("closed")
+        return generate()
+
+    def test_stops_and_closes_stream(self):
+        """Test that the stream is closed as soon as the decision is settled."""
+        log = []
+        labels = ["contradict"] * 3 + ["support"] * 2
+        tracker = asyncio.run(decide_streaming(self.stream(labels, log), len(labels)))
+        assert tracker.decision == 0
+        assert log == [0, 1, 2, "closed"]
+        assert tracker.validations[3:] == [None, None]
+
+    def test_finish_consumes_everything(self):
+        """Test that finish=True validates every claim but records when it settled."""
+        log = []
+        labels = ["contradict"] * 3 + ["support"] * 2
+        tracker = asyncio.run(
+            decide_streaming(self.stream(labels, log), len(labels), finish=True)
+        )
+        assert tracker.complete
+        assert tracker.decided_after == 3
+        assert tracker.decision == final_decision(contradiction_score(labels))
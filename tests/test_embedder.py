@@ -0,0 +1,170 @@
+"""Unit tests for retrieval.embedder module."""
+import os
+import pickle
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+from retrieval.embedder import DEFAULT_MODEL, EmbeddingProvider, get_provider, set_provider
+
+
+class TestEmbeddingProviderConfig:
+    """Test provider configuration."""
+
+    def test_defaults(self, monkeypatch):
+        """Test default model name and batch size."""
+        monkeypatch.delenv("CHRONOREASON_EMBEDDING_MODEL", raising=False)
+        monkeypatch.delenv("CHRONOREASON_EMBEDDING_BATCH_SIZE", raising=False)
+        provider = EmbeddingProvider()
+        assert provider.model_name == DEFAULT_MODEL
+        assert provider.batch_size == 32
+
+    def test_env_overrides(self, monkeypatch):
+        """Test configuration through environment variables."""
+        monkeypatch.setenv("CHRONOREASON_EMBEDDING_MODEL", "other-model")
+        monkeypatch.setenv("CHRONOREASON_EMBEDDING_DEVICE", "cpu")
+        monkeypatch.setenv("CHRONOREASON_EMBEDDING_BATCH_SIZE", "8")
+        provider = EmbeddingProvider()
+        assert provider.model_name == "other-model"
+        assert provider.device == "cpu"
+        assert provider.batch_size == 8
+
+    def test_arguments_beat_env(self, monkeypatch):
+        """Test that explicit arguments take precedence."""
+        monkeypatch.setenv("CHRONOREASON_EMBEDDING_MODEL", "other-model")
+        assert EmbeddingProvider(model_name="mine").model_name == "mine"
+
+    def test_invalid_batch_size(self, monkeypatch):
+        """Test that a non-positive batch size is rejected."""
+        monkeypatch.setenv("CHRONOREASON_EMBEDDING_BATCH_SIZE", "-1")
+        with pytest.raises(ValueError):
+            EmbeddingProvider()
+
+    @pytest.mark.parametrize("argument", ["batch_size", "workers"])
+    def test_explicit_zero_is_rejected(self, monkeypatch, argument):
+        """Test that an explicit 0 raises instead of falling back to the environment."""
+        monkeypatch.setenv("CHRONOREASON_EMBEDDING_BATCH_SIZE", "32")
+        monkeypatch.setenv("CHRONOREASON_EMBEDDING_WORKERS", "2")
+        with pytest.raises(ValueError):
+            EmbeddingProvider(**{argument: 0})
+
+
+class TestEmbeddingProviderLaziness:
+    """Test that nothing heavy happens before first use."""
+
+    def test_model_not_loaded_on_construction(self):
+        """Test that constructing a provider does not load the model."""
+        assert not EmbeddingProvider().loaded
+
+    def test_import_does_not_load_torch(self):
+        """Test that importing the store does not import sentence-transformers."""
+        src = os.path.join(os.path.dirname(__file__), "..", "src")
+        code = (
+            "import sys; sys.path.insert(0, %r); "
+            "import retrieval.pathway_store; "
+            "print('sentence_transformers' in sys.modules)" % src
+        )
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        assert out.stdout.strip() == "False"
+
+
+class TestSharedProvider:
+    """Test the process-wide provider."""
+
+    def test_stub_is_installed(self, stub_embedding_provider):
+        """Test that tests run against the stub provider."""
+        if stub_embedding_provider is None:
+            pytest.skip("running against the real model")
+        assert get_provider() is stub_embedding_provider
+
+    def test_set_provider_returns_previous(self):
+        """Test swapping the shared provider and restoring it."""
+        original = get_provider()
+        replacement = EmbeddingProvider(model_name="x")
+        previous = set_provider(replacement)
+        assert previous is original
+        try:
+            assert get_provider() is replacement
+        finally:
+            set_provider(previous)
+        assert get_provider() is previous
+
+
+class TestParallelEncoding:
+    """Test sharding encode calls across worker processes."""
+
+    def test_parallel_matches_serial(self, stub_provider_class):
+        """Test that the process pool returns the serial result, in order."""
+        texts = [f"chunk number {i} about the voyage" for i in range(300)]
+        serial = stub_provider_class().encode(texts)
+        provider = stub_provider_class(workers=2)
+        try:
+            parallel = provider.encode(texts)
+        finally:
+            provider.close()
+        assert parallel.shape == serial.shape
+        assert np.array_equal(parallel, serial)
+
+    def test_small_calls_stay_serial(self, stub_provider_class):
+        """Test that short inputs do not start a pool."""
+        provider = stub_provider_class(workers=4)
+        provider.encode(["one", "two"])
+        assert provider._pool is None
+
+    def test_provider_pickles_without_model(self):
+        """Test that pickling ships configuration, not model weights."""
+        provider = EmbeddingProvider(model_name="m", batch_size=8, workers=3)
+        provider._model = object()
+        clone = pickle.loads(pickle.dumps(provider))
+        assert clone.model_name == "m" and clone.batch_size == 8 and clone.workers == 3
+        assert not clone.loaded
+
+    def test_script_build_with_workers(self, tmp_path):
+        """Test that a guarded script builds a store through a spawned pool."""
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        script = tmp_path / "build.py"
+        script.write_text(
+            "import sys\n"
+            f"sys.path[:0] = [{root!r}, {os.path.join(root, 'src')!r}]\n"
+            "from tests.conftest import StubEmbeddingProvider\n"
+            "from retrieval.embedder import set_provider\n"
+            "from retrieval.pathway_store import PathwayStore\n"
+            "\n"
+            "def main():\n"
+            "    provider = StubEmbeddingProvider(workers=2)\n"
+            "    set_provider(provider)\n"
+            "    store = PathwayStore([f'chunk {i} of the voyage' for i in range(200)])\n"
+            "    assert provider._pool is not None\n"
+            "    provider.close()\n"
+            "    print(store.embeddings.shape[0])\n"
+            "\n"
+            "if __name__ == '__main__':\n"
+            "    main()\n"
+        )
+        result = subprocess.run(
+            [sys.executable, str(script)], capture_output=True, text=True, timeout=120
+        )
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == "200"
+
+    def test_main_is_safe_to_spawn(self):
+        """Test that importing main.py, as spawned workers do, runs nothing."""
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        code = (
+            "import runpy, sys\n"
+            "sys.argv = ['main.py']\n"
+            "runpy.run_path('main.py', run_name='__mp_main__')\n"
+            "print('imported')\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], cwd=root, capture_output=True, text=True, timeout=120
+        )
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == "imported"
+
+    def test_invalid_workers(self, monkeypatch):
+        """Test that a non-positive worker count is rejected."""
+        monkeypatch.setenv("CHRONOREASON_EMBEDDING_WORKERS", "0")
+        with pytest.raises(ValueError):
+            EmbeddingProvider(workers=None)
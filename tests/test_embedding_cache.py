@@ -0,0 +1,84 @@
+"""Unit tests for retrieval.embedding_cache module."""
+import numpy as np
+import pytest
+from retrieval.embedding_cache import EmbeddingCache, embedding_key
+
+
+class TestEmbeddingKey:
+    """Test content addressing."""
+
+    def test_key_is_deterministic(self):
+        """Test that the same inputs give the same key."""
+        assert embedding_key("m", True, "text") == embedding_key("m", True, "text")
+
+    def test_key_depends_on_model_flag_and_text(self):
+        """Test that model, normalization flag and text all change the key."""
+        base = embedding_key("m", True, "text")
+        assert embedding_key("other", True, "text") != base
+        assert embedding_key("m", False, "text") != base
+        assert embedding_key("m", True, "text!") != base
+
+
+class TestEmbeddingCacheBasic:
+    """Test storing and retrieving vectors."""
+
+    def test_roundtrip(self, tmp_path):
+        """Test that stored vectors come back unchanged."""
+        cache = EmbeddingCache(str(tmp_path / "emb.sqlite"))
+        vec = np.arange(4, dtype=np.float32)
+        cache.put_many({"a": vec})
+        found = cache.get_many(["a"])
+        assert np.array_equal(found["a"], vec)
+        assert found["a"].dtype == np.float32
+
+    def test_hit_miss_counts(self):
+        """Test that lookups are counted as hits and misses."""
+        cache = EmbeddingCache(":memory:")
+        cache.put_many({"a": np.ones(3, dtype=np.float32)})
+        cache.get_many(["a", "b", "c"])
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 2
+        assert abs(stats["hit_rate"] - 1 / 3) < 1e-9
+
+    def test_persists_across_instances(self, tmp_path):
+        """Test that a reopened cache still has its vectors."""
+        path = str(tmp_path / "emb.sqlite")
+        first = EmbeddingCache(path)
+        first.put_many({"a": np.ones(3, dtype=np.float32)})
+        first.close()
+        second = EmbeddingCache(path)
+        assert "a" in second.get_many(["a"])
+
+    def test_clear(self):
+        """Test that clear empties the cache."""
+        cache = EmbeddingCache(":memory:")
+        cache.put_many({"a": np.ones(3, dtype=np.float32)})
+        cache.clear()
+        assert len(cache) == 0
+
+
+class TestEmbeddingCacheEviction:
+    """Test size-bounded eviction."""
+
+    def test_evicts_beyond_max_entries(self):
+        """Test that the cache never grows past max_entries."""
+        cache = EmbeddingCache(":memory:", max_entries=2)
+        for key in "abcd":
+            cache.put_many({key: np.ones(3, dtype=np.float32)})
+        assert len(cache) == 2
+
+    def test_evicts_least_recently_used(self):
+        """Test that recently read entries survive eviction."""
+        cache = EmbeddingCache(":memory:", max_entries=2)
+        cache.put_many({"a": np.ones(3, dtype=np.float32)})
+        cache.put_many({"b": np.ones(3, dtype=np.float32)})
+        cache.get_many(["a"])
+        cache.put_many({"c": np.ones(3, dtype=np.float32)})
+        found = cache.get_many(["a", "b", "c"])
+        assert set(found) == {"a", "c"}
+
+    def test_invalid_max_entries(self):
+        """Test that a non-positive bound is rejected."""
+        with pytest.raises(ValueError):
+            EmbeddingCache(":memory:", max_entries=0)
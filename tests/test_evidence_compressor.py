@@ -0,0 +1,99 @@
+"""Unit tests for reasoning.evidence_compressor module."""
+import numpy as np
+import pytest
+
+from reasoning.evidence_compressor import compress_evidence, split_sentences
+
+
+def keyword_embed(texts):
+    """Embed by keyword presence so relevance is predictable."""
+    keywords = ["ship", "island", "letter", "horse"]
+    vectors = np.array(
+        [[1.0 if k in t.lower() else 0.0 for k in keywords] + [0.1] for t in texts],
+        dtype=np.float32,
+    )
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def word_count(text):
+    return len(text.split())
+
+
+class TestSplitSentences:
+    """Test sentence splitting."""
+
+    def test_terminal_punctuation(self):
+        """Test splitting on . ! and ?."""
+        assert split_sentences("One. Two! Three? Four") == ["One.", "Two!", "Three?", "Four"]
+
+    def test_closing_quotes_stay(self):
+        """Test that a closing quote stays with its sentence."""
+        assert split_sentences('"Who?" she asked.') == ['"Who?"', "she asked."]
+
+
+class TestCompressEvidence:
+    """Test sentence selection under a token budget."""
+
+    CHUNKS = [
+        "The ship left port. The weather was calm. A horse stood on the quay.",
+        "They found a letter. The island was far. The ship sank.",
+    ]
+
+    def test_keeps_relevant_sentences_in_order(self):
+        """Test that the claim's best sentences are kept in reading order."""
+        result = compress_evidence(["the ship"], [self.CHUNKS], keyword_embed, budget=8, count=word_count)
+        assert result == [["The ship left port.", "The ship sank."]]
+
+    def test_respects_budget(self):
+        """Test that kept sentences fit in the budget."""
+        result = compress_evidence(["island letter"], [self.CHUNKS], keyword_embed, budget=9, count=word_count)
+        assert sum(word_count(s) for s in result[0]) <= 9
+        assert "The island was far." in result[0]
+
+    def test_small_evidence_untouched(self):
+        """Test that evidence within budget is returned as its chunks."""
+        result = compress_evidence(["ship"], [self.CHUNKS], keyword_embed, budget=1000, count=word_count)
+        assert result == [self.CHUNKS]
+
+    def test_best_sentence_always_kept(self):
+        """Test that a too-small budget still keeps one sentence."""
+        result = compress_evidence(["horse"], [self.CHUNKS], keyword_embed, budget=1, count=word_count)
+        assert result == [["A horse stood on the quay."]]
+
+    def test_string_evidence_and_batching(self):
+        """Test several claims with string evidence in one call."""
+        calls = []
+
+        def embed(texts):
+            calls.append(len(texts))
+            return keyword_embed(texts)
+
+        result = compress_evidence(
+            ["ship", "letter"], [" ".join(self.CHUNKS)] * 2, embed, budget=4, count=word_count
+        )
+        assert result == [["The ship left port."], ["They found a letter."]]
+        assert len(calls) == 1
+
+    def test_only_over_budget_evidence_embedded(self):
+        """Test that sentences of claims already under budget are not encoded."""
+        embedded = []
+
+        def embed(texts):
+            embedded.extend(texts)
+            return keyword_embed(texts)
+
+        result = compress_evidence(
+            ["ship", "horse"],
+            [self.CHUNKS, ["A horse stood still."]],
+            embed, budget=8, count=word_count,
+        )
+        assert result[1] == ["A horse stood still."]
+        assert "A horse stood still." not in embedded
+        assert "horse" not in embedded
+
+    def test_invalid_arguments(self):
+        """Test budget and length validation."""
+        with pytest.raises(ValueError):
+            compress_evidence(["a"], [["b"]], keyword_embed, budget=0)
+        with pytest.raises(ValueError):
+            compress_evidence(["a", "b"], [["c"]], keyword_embed, budget=10)
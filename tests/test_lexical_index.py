@@ -0,0 +1,126 @@
+"""Unit tests for retrieval.lexical_index module."""
+import numpy as np
+import pytest
+from retrieval.lexical_index import BM25Index, tokenize
+
+
+@pytest.fixture
+def index():
+    """BM25 index over a few story-like chunks."""
+    bm25 = BM25Index()
+    bm25.build([
+        "Glenarvan commanded the Duncan across the sea.",
+        "The Duncan was a fine yacht.",
+        "They crossed Patagonia on horseback.",
+        "The sea was calm and the sky was clear.",
+    ])
+    return bm25
+
+
+class TestTokenize:
+    """Test tokenization."""
+
+    def test_lowercases_and_strips_punctuation(self):
+        """Test that tokens are lowercase words."""
+        assert tokenize("Glenarvan's DUNCAN, at sea!") == ["glenarvan", "s", "duncan", "at", "sea"]
+
+
+class TestBM25Index:
+    """Test BM25 scoring over array-backed postings."""
+
+    def test_proper_noun_ranks_its_chunk_first(self, index):
+        """Test that a rare proper noun finds its chunk."""
+        scores = index.scores("Patagonia")
+        assert int(np.argmax(scores)) == 2
+        assert np.count_nonzero(scores) == 1
+
+    def test_rare_terms_weigh_more(self, index):
+        """Test that IDF favours the rarer term."""
+        scores = index.scores("Glenarvan the")
+        assert int(np.argmax(scores)) == 0
+
+    def test_unknown_terms_score_zero(self, index):
+        """Test that out-of-vocabulary queries match nothing."""
+        assert not index.scores("zeppelin").any()
+
+    def test_postings_are_csr(self, index):
+        """Test that offsets delimit every posting exactly once."""
+        assert index.term_offsets[-1] == len(index.doc_ids) == len(index.tfs)
+        assert index.doc_ids.dtype == np.int32
+
+    def test_matches_reference_formula(self):
+        """Test one score against the textbook BM25 formula."""
+        bm25 = BM25Index(k1=1.2, b=0.75)
+        docs = ["a b b", "a c", "d"]
+        bm25.build(docs)
+        n, df, tf, dl, avgdl = 3, 2, 2, 3, 2.0
+        idf = np.log1p((n - df + 0.5) / (df + 0.5))
+        idf_b = np.log1p((n - 1 + 0.5) / (1 + 0.5))
+        expected = idf * 1 * 2.2 / (1 + 1.2 * (1 - 0.75 + 0.75 * dl / avgdl))
+        expected += idf_b * tf * 2.2 / (tf + 1.2 * (1 - 0.75 + 0.75 * dl / avgdl))
+        assert bm25.scores("a b")[0] == pytest.approx(expected, rel=1e-5)
+
+    def test_empty(self):
+        """Test that an empty index scores nothing."""
+        bm25 = BM25Index()
+        bm25.build([])
+        assert bm25.scores("anything").shape == (0,)
+
+
+class TestBM25IndexUpdates:
+    """Test adding, removing and replacing chunks in place."""
+
+    DOCS = [
+        "Glenarvan commanded the Duncan across the sea.",
+        "The Duncan was a fine yacht.",
+        "They crossed Patagonia on horseback.",
+        "The sea was calm and the sky was clear.",
+        "Paganel studied the map of Patagonia.",
+        "Captain Grant was found on Tabor island.",
+    ]
+    QUERIES = ["the sea", "Patagonia", "Duncan yacht", "Tabor island", "Grant map sky"]
+
+    def _assert_matches_fresh(self, bm25, docs):
+        fresh = BM25Index()
+        fresh.build(docs)
+        for query in self.QUERIES:
+            assert np.allclose(bm25.scores(query), fresh.scores(query), rtol=1e-5)
+
+    def test_edits_match_a_fresh_build(self):
+        """Test that scores after add, remove and update equal a rebuild's."""
+        bm25 = BM25Index()
+        bm25.build(self.DOCS[:3])
+        bm25.add(self.DOCS[3:])
+        self._assert_matches_fresh(bm25, self.DOCS)
+        bm25.remove([1, 4])
+        docs = [d for i, d in enumerate(self.DOCS) if i not in (1, 4)]
+        self._assert_matches_fresh(bm25, docs)
+        bm25.update(0, "The sea off Tabor island was rough.")
+        docs[0] = "The sea off Tabor island was rough."
+        self._assert_matches_fresh(bm25, docs)
+
+    def test_many_edits_merge_postings(self):
+        """Test that tail and dead postings are folded back into the CSR arrays."""
+        bm25 = BM25Index()
+        bm25.build(self.DOCS)
+        for doc in self.DOCS:
+            bm25.remove([0])
+            bm25.add([doc])
+        self._assert_matches_fresh(bm25, self.DOCS)
+        assert bm25.term_offsets[-1] == len(bm25.doc_ids)
+        assert (bm25.doc_ids >= 0).all()
+
+    def test_edits_tokenize_only_changed_chunks(self, monkeypatch):
+        """Test that an edit tokenizes only the chunks it touches."""
+        import retrieval.lexical_index as lexical_index
+
+        bm25 = BM25Index()
+        bm25.build(self.DOCS * 20)
+        calls = []
+        monkeypatch.setattr(
+            lexical_index, "tokenize", lambda text: calls.append(text) or tokenize(text)
+        )
+        bm25.add(["A new chunk."])
+        bm25.update(3, "A changed chunk.")
+        bm25.remove([7, 8])
+        assert calls == ["A new chunk.", "A changed chunk."]
@@ -0,0 +1,75 @@
+"""Unit tests for ingestion.live_corpus module."""
+import time
+
+import pytest
+
+pw = pytest.importorskip("pathway")
+
+from ingestion.live_corpus import LiveCorpus
+from retrieval.pathway_store import PathwayStore
+
+
+@pytest.fixture(autouse=True)
+def fresh_pathway_graph():
+    """Each test builds its own dataflow in the process-wide Pathway graph."""
+    from pathway.internals.parse_graph import G
+    G.clear()
+    yield
+    G.clear()
+
+
+@pytest.fixture
+def library(tmp_path):
+    """Directory with two small books and one non-text file."""
+    (tmp_path / "sea.txt").write_text("The Duncan sailed across the ocean towards Patagonia.")
+    (tmp_path / "land.txt").write_text("Glenarvan crossed the mountains on horseback.")
+    (tmp_path / "notes.md").write_text("Not a book.")
+    return tmp_path
+
+
+class TestLiveCorpusStatic:
+    """Test one-shot ingestion through the dataflow."""
+
+    def test_run_indexes_every_text_file(self, library):
+        """Test that all .txt files are chunked, tagged and searchable."""
+        store = PathwayStore([])
+        corpus = LiveCorpus(str(library), store, chunk_size=5, overlap=1)
+        corpus.run()
+        assert set(store.sources) == {str(library / "sea.txt"), str(library / "land.txt")}
+        assert all(chunk != "Not a book." for chunk in store.chunks)
+        hits = corpus.search_many(["Glenarvan mountains horseback"], top_k=1)
+        assert "Glenarvan" in hits[0][0][0]
+
+    def test_chunks_match_chunk_text(self, library):
+        """Test that the dataflow chunks files exactly like chunk_text."""
+        from ingestion.chunker import chunk_text
+        store = PathwayStore([])
+        LiveCorpus(str(library), store, chunk_size=4, overlap=1).run()
+        expected = chunk_text((library / "sea.txt").read_text(), chunk_size=4, overlap=1)
+        sea = [c for c, s in zip(store.chunks, store.sources) if s.endswith("sea.txt")]
+        assert sea == expected
+
+
+class TestLiveCorpusStreaming:
+    """Test that edits to the watched directory reach the index."""
+
+    def test_new_edited_and_deleted_files(self, library):
+        """Test additions, edits and deletions without restarting."""
+        store = PathwayStore([])
+        corpus = LiveCorpus(str(library), store, chunk_size=50, overlap=0, commit_ms=50)
+        corpus.start()
+        deadline = time.time() + 30
+
+        def wait_until(condition):
+            while not condition():
+                assert corpus.wait_for_update(corpus.version, timeout=max(0, deadline - time.time()))
+
+        wait_until(lambda: len(store.chunks) == 2)
+        (library / "river.txt").write_text("They followed the river to the sea.")
+        wait_until(lambda: str(library / "river.txt") in store.sources)
+        (library / "sea.txt").write_text("The yacht was repaired in the harbour.")
+        wait_until(lambda: "The yacht was repaired in the harbour." in store.chunks)
+        assert all("Duncan" not in chunk for chunk in store.chunks)
+        (library / "land.txt").unlink()
+        wait_until(lambda: str(library / "land.txt") not in store.sources)
+        assert len(store.chunks) == 2
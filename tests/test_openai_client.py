@@ -0,0 +1,137 @@
+"""Unit tests for reasoning.openai_client module."""
+import asyncio
+
+import pytest
+
+from reasoning.openai_client import (
+    EventLoopThread,
+    build_async_client,
+    build_client,
+    client_options,
+)
+
+_ENV = (
+    "CLAIM_VALIDATOR_BASE_URL", "CLAIM_VALIDATOR_TIMEOUT", "CLAIM_VALIDATOR_CONNECT_TIMEOUT",
+    "CLAIM_VALIDATOR_MAX_CONNECTIONS", "CLAIM_VALIDATOR_KEEPALIVE",
+    "CLAIM_VALIDATOR_KEEPALIVE_EXPIRY", "OPENAI_API_KEY",
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_env(monkeypatch):
+    for name in _ENV:
+        monkeypatch.delenv(name, raising=False)
+
+
+class TestClientOptions:
+    """Test client settings read from the environment."""
+
+    def test_defaults(self):
+        """Test the default timeout and pool limits."""
+        options = client_options()
+        assert options["base_url"] is None
+        assert options["timeout"].read == 60
+        assert options["timeout"].connect == 10
+        assert options["limits"].max_connections == 16
+        assert options["limits"].max_keepalive_connections == 16
+        assert options["limits"].keepalive_expiry == 60
+
+    def test_overrides(self, monkeypatch):
+        """Test that every setting can be changed."""
+        monkeypatch.setenv("CLAIM_VALIDATOR_TIMEOUT", "5")
+        monkeypatch.setenv("CLAIM_VALIDATOR_CONNECT_TIMEOUT", "1")
+        monkeypatch.setenv("CLAIM_VALIDATOR_MAX_CONNECTIONS", "4")
+        monkeypatch.setenv("CLAIM_VALIDATOR_KEEPALIVE", "2")
+        monkeypatch.setenv("CLAIM_VALIDATOR_KEEPALIVE_EXPIRY", "30")
+        options = client_options()
+        assert (options["timeout"].read, options["timeout"].connect) == (5, 1)
+        limits = options["limits"]
+        assert (limits.max_connections, limits.max_keepalive_connections) == (4, 2)
+        assert limits.keepalive_expiry == 30
+
+    def test_local_server_needs_no_key(self, monkeypatch):
+        """Test that a base URL without an API key still gives a usable client."""
+        monkeypatch.setenv("CLAIM_VALIDATOR_BASE_URL", "http://127.0.0.1:9/v1")
+        client = build_client()
+        assert str(client.base_url).startswith("http://127.0.0.1:9/v1")
+        assert client.api_key
+
+    def test_real_key_is_kept(self, monkeypatch):
+        """Test that a configured API key is used against a custom endpoint."""
+        monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+        monkeypatch.setenv("CLAIM_VALIDATOR_BASE_URL", "http://127.0.0.1:9/v1")
+        assert build_client().api_key == "sk-test"
+
+
+class TestBuildClient:
+    """Test clients built from options."""
+
+    def test_sync_client_settings(self, monkeypatch):
+        """Test that the sync client gets the timeout and no SDK retries."""
+        monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+        monkeypatch.setenv("CLAIM_VALIDATOR_TIMEOUT", "7")
+        client = build_client()
+        assert client.timeout.read == 7
+        assert client.max_retries == 0
+
+    def test_async_client_settings(self, monkeypatch):
+        """Test that the async client gets the same settings."""
+        monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+        monkeypatch.setenv("CLAIM_VALIDATOR_TIMEOUT", "7")
+        client = build_async_client()
+        assert client.timeout.read == 7
+        assert client.max_retries == 0
+
+
+class TestEventLoopThread:
+    """Test the long-lived background event loop."""
+
+    def test_runs_coroutines_on_one_loop(self):
+        """Test that successive runs share one loop."""
+        runner = EventLoopThread()
+        try:
+            async def current_loop():
+                return asyncio.get_running_loop()
+
+            assert runner.run(current_loop()) is runner.run(current_loop()) is runner.loop
+        finally:
+            runner.close()
+
+    def test_propagates_exceptions(self):
+        """Test that an exception in the coroutine reaches the caller."""
+        runner = EventLoopThread()
+        try:
+            async def fail():
+                raise ValueError("boom")
+
+            with pytest.raises(ValueError, match="boom"):
+                runner.run(fail())
+        finally:
+            runner.close()
+
+    def test_rejects_reentrant_run(self):
+        """Test that run() from the loop's own thread fails instead of deadlocking."""
+        runner = EventLoopThread()
+        try:
+            async def nested():
+                async def inner():
+                    return 1
+                return runner.run(inner())
+
+            with pytest.raises(RuntimeError, match="await instead"):
+                runner.run(nested())
+        finally:
+            runner.close()
+
+    def test_closed_runner(self):
+        """Test that a closed runner refuses new work."""
+        runner = EventLoopThread()
+        runner.close()
+
+        async def noop():
+            return None
+
+        coro = noop()
+        with pytest.raises(RuntimeError):
+            runner.run(coro)
+        coro.close()
@@ -1,6 +1,9 @@
 """Unit tests for retrieval.pathway_store module."""
+import numpy as np
 import pytest
+from retrieval.embedding_cache import EmbeddingCache
 from retrieval.pathway_store import PathwayStore
+from retrieval.vector_index import ExactIndex, HierarchicalIndex, IVFIndex
 
 
 class TestPathwayStoreBasic:
@@ -128,3 +131,422 @@ class TestPathwayStoreDocumentation:
         results = store.search("sky", top_k=2)
         assert len(results) > 0
         assert isinstance(results[0], str)
+
+
+class TestPathwayStoreCache:
+    """Test the on-disk embedding cache integration."""
+
+    def test_cached_embeddings_match_fresh(self, tmp_path):
+        """Test that a warm cache yields the same embeddings."""
+        chunks = ["The sky is blue", "The ocean is vast", "The sky is blue"]
+        cache = EmbeddingCache(str(tmp_path / "emb.sqlite"))
+        cold = PathwayStore(chunks, cache=cache)
+        assert cache.misses == 2
+        warm = PathwayStore(chunks, cache=cache)
+        assert cache.hits == 2
+        assert np.allclose(cold.embeddings, warm.embeddings)
+
+    def test_only_new_chunks_are_missed(self):
+        """Test that changed chunks are the only cache misses."""
+        cache = EmbeddingCache(":memory:")
+        PathwayStore(["one", "two"], cache=cache)
+        PathwayStore(["one", "three"], cache=cache)
+        assert cache.hits == 1
+        assert cache.misses == 3
+
+    def test_query_embeddings_are_reused(self):
+        """Test that embed() hits vectors cached by an earlier search."""
+        cache = EmbeddingCache(":memory:")
+        store = PathwayStore(["one", "two"], cache=cache)
+        store.search_many(["a query"])
+        hits = cache.hits
+        vector = store.embed(["a query"])
+        assert cache.hits == hits + 1
+        assert vector.shape == (1, store.embeddings.shape[1])
+
+
+class TestPathwayStorePersistence:
+    """Test saving and memory-mapping stores."""
+
+    def test_save_load_roundtrip(self, tmp_path):
+        """Test that a loaded store searches like the original."""
+        chunks = ["The sky is blue", "The ocean is vast", "Birds fly in the air"]
+        store = PathwayStore(chunks)
+        path = str(tmp_path / "book.store")
+        store.save(path)
+        loaded = PathwayStore.load(path)
+        assert loaded.chunks == chunks
+        assert np.allclose(loaded.embeddings, store.embeddings)
+        assert loaded.search("sky", top_k=2) == store.search("sky", top_k=2)
+
+    def test_load_skips_lexical_until_needed(self, tmp_path, monkeypatch):
+        """Test that loading and dense search never tokenize the corpus."""
+        import retrieval.lexical_index as lexical_index
+
+        path = str(tmp_path / "book.store")
+        PathwayStore(["The sky is blue", "The ocean is vast"]).save(path)
+        tokenized = []
+        tokenize = lexical_index.tokenize
+        monkeypatch.setattr(
+            lexical_index, "tokenize", lambda text: tokenized.append(text) or tokenize(text)
+        )
+        store = PathwayStore.load(path)
+        store.search("sky", top_k=1)
+        store.add_chunks(["Birds fly in the air"])
+        assert tokenized == []
+        assert store.search("birds", top_k=1, mode="lexical") == ["Birds fly in the air"]
+        assert len(tokenized) == 4  # three chunks, then the query
+
+    def test_load_or_build_reuses_matching_file(self, tmp_path):
+        """Test that a matching saved store is memory-mapped, not rebuilt."""
+        chunks = ["one", "two"]
+        path = str(tmp_path / "book.store")
+        PathwayStore.load_or_build(path, chunks)
+        reopened = PathwayStore.load_or_build(path, chunks)
+        assert isinstance(reopened.embeddings, np.memmap)
+
+    def test_load_or_build_maps_fresh_build(self, tmp_path):
+        """Test that a store just built is reopened memory-mapped with the given index."""
+        path = str(tmp_path / "book.store")
+        store = PathwayStore.load_or_build(
+            path, ["one", "two"], index_options={"precision": "int8", "rerank": 2}
+        )
+        assert isinstance(store.embeddings, np.memmap)
+        assert (store.index.precision, store.index.rerank) == ("int8", 2)
+        assert store.search("one", top_k=1) == ["one"]
+
+    def test_load_or_build_rebuilds_stale_file(self, tmp_path):
+        """Test that different chunks replace the saved store."""
+        path = str(tmp_path / "book.store")
+        PathwayStore.load_or_build(path, ["one", "two"])
+        rebuilt = PathwayStore.load_or_build(path, ["three"])
+        assert rebuilt.chunks == ["three"]
+        assert PathwayStore.load(path).chunks == ["three"]
+
+    @pytest.mark.parametrize("size", [6, 10, 40, -3])
+    def test_load_or_build_rebuilds_damaged_file(self, tmp_path, size):
+        """Test that a truncated store file is rebuilt instead of crashing."""
+        path = tmp_path / "book.store"
+        PathwayStore.load_or_build(str(path), ["one", "two"])
+        data = path.read_bytes()
+        path.write_bytes(data[:size])
+        rebuilt = PathwayStore.load_or_build(str(path), ["one", "two"])
+        assert rebuilt.chunks == ["one", "two"]
+        assert PathwayStore.load(str(path)).chunks == ["one", "two"]
+
+
+class TestPathwayStoreSearchMany:
+    """Test batched multi-query search."""
+
+    def test_matches_single_search(self):
+        """Test that batched results match one-at-a-time search."""
+        chunks = [
+            "The quick brown fox jumps over the lazy dog.",
+            "Cooking recipes often mention ingredients, steps, and timings.",
+            "Artificial intelligence improves search and retrieval effectiveness.",
+            "The ocean is vast and deep.",
+        ]
+        store = PathwayStore(chunks)
+        queries = ["fox", "search and retrieval", "ocean"]
+        batched = store.search_many(queries, top_k=2)
+        assert len(batched) == len(queries)
+        for query, hits in zip(queries, batched):
+            assert [chunk for chunk, _ in hits] == store.search(query, top_k=2)
+
+    def test_scores_are_descending(self):
+        """Test that each result list is sorted best first."""
+        store = PathwayStore([f"chunk {i}" for i in range(10)])
+        for hits in store.search_many(["chunk 3", "chunk 7"], top_k=5):
+            scores = [score for _, score in hits]
+            assert scores == sorted(scores, reverse=True)
+            assert all(isinstance(score, float) for score in scores)
+
+    def test_empty_inputs(self):
+        """Test empty query lists, empty stores and top_k=0."""
+        store = PathwayStore(["one", "two"])
+        assert store.search_many([]) == []
+        assert store.search_many(["q"], top_k=0) == [[]]
+        assert PathwayStore([]).search_many(["q", "r"]) == [[], []]
+
+
+class TestPathwayStoreIndexBackends:
+    """Test selecting the nearest-neighbour backend."""
+
+    def test_default_index_is_exact(self):
+        """Test that stores scan exactly by default."""
+        assert isinstance(PathwayStore(["one"]).index, ExactIndex)
+
+    def test_ivf_full_probe_matches_exact(self):
+        """Test that an IVF store probing every list matches the exact store."""
+        chunks = [f"chunk about topic {i}" for i in range(20)]
+        exact = PathwayStore(chunks)
+        ivf = PathwayStore(chunks, index=IVFIndex(n_lists=4, n_probe=4))
+        assert ivf.search("topic 3", top_k=3) == exact.search("topic 3", top_k=3)
+
+    def test_ivf_by_name(self):
+        """Test that the backend can be chosen by name."""
+        store = PathwayStore(["one", "two", "three"], index="ivf")
+        assert len(store.search("two", top_k=2)) == 2
+
+    def test_hierarchical_over_structured_table(self, sample_text):
+        """Test coarse-to-fine search over a table's chapters and paragraphs."""
+        from ingestion.chunk_table import ChunkTable
+
+        text = "\n\n".join(
+            f"CHAPTER {n}.\n\n" + sample_text.replace(". ", ".\n\n", n) for n in range(1, 4)
+        )
+        table = ChunkTable.from_structure(text, chunk_size=15, overlap=0)
+        index = HierarchicalIndex([table.chapters, table.paragraphs], beams=[3, 100])
+        store = PathwayStore(table, index=index)
+        assert store.search("maritime travel", top_k=3) == PathwayStore(table).search(
+            "maritime travel", top_k=3
+        )
+
+
+class TestPathwayStoreIncremental:
+    """Test adding, removing and updating chunks in place."""
+
+    def test_add_chunks_matches_full_build(self):
+        """Test that appending gives the same store as building at once."""
+        store = PathwayStore(["The sky is blue"])
+        positions = store.add_chunks(["The ocean is vast", "Birds fly in the air"])
+        full = PathwayStore(["The sky is blue", "The ocean is vast", "Birds fly in the air"])
+        assert positions == [1, 2]
+        assert store.chunks == full.chunks
+        assert np.allclose(store.embeddings, full.embeddings)
+        assert store.search("ocean", top_k=1) == ["The ocean is vast"]
+
+    def test_add_grows_capacity_geometrically(self):
+        """Test that appends reuse spare capacity instead of reallocating."""
+        store = PathwayStore(["seed"])
+        reallocations = 0
+        buffer = store._buffer
+        for i in range(100):
+            store.add_chunks([f"chunk {i}"])
+            if store._buffer is not buffer:
+                reallocations += 1
+                buffer = store._buffer
+        assert len(store.embeddings) == 101
+        assert reallocations <= 8
+
+    def test_add_embeds_only_new_chunks(self):
+        """Test that only the appended chunks are encoded."""
+        cache = EmbeddingCache(":memory:")
+        store = PathwayStore(["one", "two"], cache=cache)
+        store.add_chunks(["three"])
+        assert cache.misses == 3
+
+    def test_remove_chunks(self):
+        """Test that removed chunks disappear from search results."""
+        store = PathwayStore(["The sky is blue", "The ocean is vast", "Birds fly in the air"])
+        store.remove_chunks([1])
+        assert store.chunks == ["The sky is blue", "Birds fly in the air"]
+        assert len(store.embeddings) == 2
+        assert "The ocean is vast" not in store.search("ocean", top_k=2)
+
+    def test_remove_out_of_range(self):
+        """Test that bad positions raise IndexError."""
+        store = PathwayStore(["one"])
+        with pytest.raises(IndexError):
+            store.remove_chunks([5])
+
+    def test_update_chunk(self):
+        """Test that an updated chunk is re-embedded."""
+        store = PathwayStore(["The sky is blue", "The ocean is vast"])
+        store.update_chunk(0, "Birds fly in the air")
+        fresh = PathwayStore(["Birds fly in the air", "The ocean is vast"])
+        assert store.chunks[0] == "Birds fly in the air"
+        assert np.allclose(store.embeddings, fresh.embeddings)
+
+    def test_loaded_store_becomes_writable(self, tmp_path):
+        """Test that a memory-mapped store can still be extended."""
+        path = str(tmp_path / "book.store")
+        PathwayStore(["one", "two"]).save(path)
+        store = PathwayStore.load(path)
+        store.add_chunks(["three"])
+        store.update_chunk(0, "zero")
+        assert store.chunks == ["zero", "two", "three"]
+        assert PathwayStore.load(path).chunks == ["one", "two"]
+
+    def test_ivf_index_follows_changes(self):
+        """Test that the IVF backend sees added and removed chunks."""
+        chunks = [f"chunk about topic {i}" for i in range(20)]
+        store = PathwayStore(chunks, index=IVFIndex(n_lists=4, n_probe=4))
+        store.add_chunks(["a completely different sentence"])
+        assert store.search("completely different sentence", top_k=1) == [
+            "a completely different sentence"
+        ]
+        store.remove_chunks([20])
+        assert "a completely different sentence" not in store.search("different", top_k=3)
+
+    def test_lexical_index_updated_in_place(self):
+        """Test that edits update the BM25 index rather than rebuilding it."""
+        store = PathwayStore(["The sky is blue", "The ocean is vast", "Birds fly in the air"])
+        lexical = store.lexical
+        store.add_chunks(["The ocean is deep"])
+        store.update_chunk(0, "The sky is grey")
+        store.remove_chunks([1])
+        fresh = PathwayStore(store.chunks)
+        assert store.lexical is lexical
+        for query in ["ocean", "sky grey", "birds air"]:
+            assert np.allclose(store.lexical.scores(query), fresh.lexical.scores(query))
+
+    def test_hierarchical_index_follows_removals(self):
+        """Test that removing chunks drops their labels instead of failing."""
+        chunks = [f"chapter {c} sentence {s}" for c in range(3) for s in range(4)]
+        chapters = [c for c in range(3) for _ in range(4)]
+        index = HierarchicalIndex([chapters], beams=3)
+        store = PathwayStore(chunks, index=index)
+        store.remove_chunks([0, 5])
+        assert index.levels[0].tolist() == [0, 0, 0, 1, 1, 1, 2, 2, 2, 2]
+        store.add_chunks(["an appended sentence"])
+        store.remove_source(None)
+        assert store.chunks == []
+        assert index.levels[0].tolist() == []
+
+
+class TestPathwayStoreSources:
+    """Test source tagging of chunks."""
+
+    def test_chunks_start_untagged(self):
+        """Test that constructor chunks have no source."""
+        assert PathwayStore(["one", "two"]).sources == [None, None]
+
+    def test_remove_source(self):
+        """Test that removing a source drops exactly its chunks."""
+        store = PathwayStore(["base"])
+        store.add_chunks(["a1", "a2"], source="a.txt")
+        store.add_chunks(["b1"], source="b.txt")
+        assert store.remove_source("a.txt") == 2
+        assert store.chunks == ["base", "b1"]
+        assert store.sources == [None, "b.txt"]
+        assert len(store.embeddings) == 2
+
+    @pytest.fixture
+    def library(self):
+        store = PathwayStore([])
+        store.add_chunks(["The Duncan sailed to Patagonia.", "Glenarvan read the note."], "grant.txt")
+        store.add_chunks(["The Nautilus sailed under the sea.", "Nemo read the chart."], "nemo.txt")
+        return store
+
+    @pytest.mark.parametrize("mode", ["dense", "lexical", "hybrid"])
+    def test_search_filtered_by_source(self, library, mode):
+        """Test that a source filter only returns that book's chunks."""
+        hits = library.search("sailed the sea", top_k=3, mode=mode, sources=["grant.txt"])
+        assert hits and all(hit in library.chunks[:2] for hit in hits)
+
+    def test_single_source_string(self, library):
+        """Test that one tag may be given as a plain string."""
+        assert library.search("read", top_k=5, sources="nemo.txt") == [
+            chunk for chunk in library.search("read", top_k=5) if chunk in library.chunks[2:]
+        ]
+
+    def test_prefilter_within_source(self, library):
+        """Test that the lexical prefilter is applied inside the chosen sources."""
+        (ids, _), = library.search_ids(["Nemo chart"], top_k=2, prefilter=1, sources=["nemo.txt"])
+        assert list(ids) == [3]
+
+    def test_unknown_source(self, library):
+        """Test that filtering on an absent source finds nothing."""
+        assert library.search("sailed", sources=["missing.txt"]) == []
+
+    def test_sources_persist(self, library, tmp_path):
+        """Test that saved stores keep their source tags."""
+        path = str(tmp_path / "library.store")
+        library.save(path)
+        loaded = PathwayStore.load(path)
+        assert loaded.sources == library.sources
+        assert loaded.search("sailed", top_k=1, sources=["nemo.txt"]) == [
+            "The Nautilus sailed under the sea."
+        ]
+
+
+class TestPathwayStoreHybrid:
+    """Test lexical and hybrid search modes."""
+
+    @pytest.fixture
+    def store(self):
+        return PathwayStore([
+            "Glenarvan commanded the Duncan across the sea.",
+            "The yacht was fine and fast.",
+            "They crossed Patagonia on horseback.",
+            "The sea was calm and the sky was clear.",
+        ])
+
+    def test_lexical_mode(self, store):
+        """Test BM25-only search on a proper noun."""
+        assert store.search("Patagonia", top_k=1, mode="lexical") == [
+            "They crossed Patagonia on horseback."
+        ]
+
+    def test_hybrid_mode_scores(self, store):
+        """Test that hybrid results are sorted fused scores."""
+        hits = store.search_many(["Glenarvan at sea"], top_k=3, mode="hybrid")[0]
+        assert hits[0][0] == "Glenarvan commanded the Duncan across the sea."
+        scores = [score for _, score in hits]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_prefilter_limits_candidates(self, store):
+        """Test that the lexical pre-filter only returns matching chunks."""
+        hits = store.search_many(["Duncan"], top_k=3, prefilter=2)[0]
+        assert [chunk for chunk, _ in hits] == ["Glenarvan commanded the Duncan across the sea."]
+
+    def test_prefilter_falls_back_to_dense(self, store):
+        """Test that queries without lexical matches still get dense results."""
+        assert len(store.search("zeppelin", top_k=2, prefilter=2)) == 2
+
+    def test_lexical_index_follows_changes(self, store):
+        """Test that added chunks are lexically searchable."""
+        store.add_chunks(["Captain Grant was found on Tabor island."])
+        assert store.search("Tabor", top_k=1, mode="lexical") == [
+            "Captain Grant was found on Tabor island."
+        ]
+
+    def test_unknown_mode(self, store):
+        """Test that unknown modes raise ValueError."""
+        with pytest.raises(ValueError):
+            store.search("sea", mode="sparse")
+
+
+class TestPathwayStoreChunkTable:
+    """Test stores over offset-based chunk tables."""
+
+    @pytest.fixture
+    def table(self, sample_text):
+        from ingestion.chunk_table import ChunkTable
+
+        return ChunkTable.from_text(sample_text, chunk_size=20, overlap=5)
+
+    def test_table_kept_without_copy(self, table):
+        """Test that the store keeps the table itself and searches it."""
+        store = PathwayStore(table)
+        assert store.chunks is table
+        assert store.search("maritime travel", top_k=1)[0] in list(table)
+
+    def test_search_ids_locate_chunks(self, table):
+        """Test that search_ids positions index the chunks search_many returns."""
+        store = PathwayStore(table)
+        (ids, scores), = store.search_ids(["maritime travel"], top_k=2)
+        hits = store.search_many(["maritime travel"], top_k=2)[0]
+        assert [table[i] for i in ids] == [chunk for chunk, _ in hits]
+        assert all(isinstance(table.span(i), tuple) for i in ids)
+
+    def test_search_ids_empty(self):
+        """Test that empty stores give empty id arrays."""
+        ids, scores = PathwayStore([]).search_ids(["q"])[0]
+        assert ids.size == 0 and scores.size == 0
+
+    def test_changes_copy_to_list(self, table):
+        """Test that adding chunks converts the table to a list, leaving it intact."""
+        store = PathwayStore(table)
+        store.add_chunks(["extra chunk"])
+        assert store.chunks == list(table) + ["extra chunk"]
+        assert len(table) == len(store.chunks) - 1
+
+    def test_load_or_build_keeps_table(self, table, tmp_path):
+        """Test that reopening a matching store keeps the caller's table."""
+        path = str(tmp_path / "book.store")
+        PathwayStore.load_or_build(path, table)
+        reopened = PathwayStore.load_or_build(path, table)
+        assert isinstance(reopened.embeddings, np.memmap)
+        assert reopened.chunks is table
@@ -0,0 +1,56 @@
+"""Unit tests for retrieval.quantization module."""
+import numpy as np
+import pytest
+from retrieval.quantization import dequantize, quantize, score
+
+
+def _unit_rows(n, dim=32, seed=0):
+    rows = np.random.default_rng(seed).standard_normal((n, dim)).astype(np.float32)
+    return rows / np.linalg.norm(rows, axis=1, keepdims=True)
+
+
+class TestQuantize:
+    """Test compression of embedding matrices."""
+
+    @pytest.mark.parametrize("precision,dtype,itemsize", [
+        ("float32", np.float32, 4), ("float16", np.float16, 2), ("int8", np.int8, 1),
+    ])
+    def test_storage_dtype(self, precision, dtype, itemsize):
+        """Test that each precision stores the expected dtype and size."""
+        codes, _ = quantize(_unit_rows(10), precision)
+        assert codes.dtype == dtype
+        assert codes.nbytes == 10 * 32 * itemsize
+
+    def test_int8_roundtrip_error_is_small(self):
+        """Test that int8 reconstruction error is within half a step."""
+        data = _unit_rows(100)
+        codes, scale = quantize(data, "int8")
+        assert np.all(np.abs(dequantize(codes, scale) - data) <= scale / 2 + 1e-6)
+
+    def test_zero_column(self):
+        """Test that an all-zero dimension does not divide by zero."""
+        data = _unit_rows(5)
+        data[:, 0] = 0
+        codes, scale = quantize(data, "int8")
+        assert np.all(codes[:, 0] == 0)
+        assert np.all(np.isfinite(scale))
+
+    def test_unknown_precision(self):
+        """Test that unsupported precisions are rejected."""
+        with pytest.raises(ValueError):
+            quantize(_unit_rows(2), "int4")
+
+
+class TestScore:
+    """Test scoring against compressed matrices."""
+
+    @pytest.mark.parametrize("precision,tolerance", [
+        ("float32", 1e-6), ("float16", 1e-2), ("int8", 5e-2),
+    ])
+    def test_scores_close_to_float32(self, precision, tolerance):
+        """Test that compressed scores approximate exact inner products."""
+        data, queries = _unit_rows(200), _unit_rows(5, seed=1)
+        codes, scale = quantize(data, precision)
+        approx = score(codes, scale, queries)
+        assert approx.dtype == np.float32
+        assert np.max(np.abs(approx - queries @ data.T)) < tolerance
@@ -0,0 +1,192 @@
+"""Unit tests for reasoning.rate_limiter module."""
+import httpx
+import pytest
+from openai import APIConnectionError, BadRequestError, InternalServerError, RateLimitError
+
+from reasoning.rate_limiter import (
+    RequestScheduler,
+    TokenBucket,
+    completion_tokens,
+    estimate_tokens,
+    is_retryable,
+    retry_after,
+)
+
+_REQUEST = httpx.Request("POST", "http://test/v1/chat/completions")
+
+
+def status_error(cls, status, headers=None):
+    response = httpx.Response(status, headers=headers or {}, request=_REQUEST)
+    return cls("error", response=response, body=None)
+
+
+class FakeClock:
+    """Manually advanced monotonic clock; sleep() advances it."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestTokenBucket:
+    """Test pacing arithmetic."""
+
+    def test_burst_then_wait(self):
+        """Test that requests beyond capacity wait for the refill rate."""
+        clock = FakeClock()
+        bucket = TokenBucket(60, capacity=2, clock=clock)  # 1 per second
+        assert bucket.reserve(1) == 0
+        assert bucket.reserve(1) == 0
+        assert bucket.reserve(1) == pytest.approx(1.0)
+        assert bucket.reserve(1) == pytest.approx(2.0)
+
+    def test_refills_over_time(self):
+        """Test that elapsed time restores capacity, capped at capacity."""
+        clock = FakeClock()
+        bucket = TokenBucket(60, capacity=2, clock=clock)
+        bucket.reserve(2)
+        clock.now = 100.0
+        assert bucket.reserve(2) == 0
+        assert bucket.reserve(1) == pytest.approx(1.0)
+
+    def test_rejects_non_positive_rate(self):
+        """Test that a zero rate is rejected."""
+        with pytest.raises(ValueError):
+            TokenBucket(0)
+
+
+class TestErrorClassification:
+    """Test Retry-After parsing and retryability."""
+
+    def test_retry_after_seconds(self):
+        """Test the plain seconds form."""
+        assert retry_after(status_error(RateLimitError, 429, {"retry-after": "3"})) == 3.0
+
+    def test_retry_after_ms_preferred(self):
+        """Test that retry-after-ms wins over retry-after."""
+        err = status_error(RateLimitError, 429, {"retry-after-ms": "250", "retry-after": "3"})
+        assert retry_after(err) == 0.25
+
+    def test_retry_after_missing(self):
+        """Test that no header gives None."""
+        assert retry_after(status_error(RateLimitError, 429)) is None
+
+    def test_retryable(self):
+        """Test which errors are retried."""
+        assert is_retryable(status_error(RateLimitError, 429))
+        assert is_retryable(status_error(InternalServerError, 503))
+        assert is_retryable(APIConnectionError(request=_REQUEST))
+        assert not is_retryable(status_error(BadRequestError, 400))
+
+    def test_estimate_tokens(self):
+        """Test that the estimate grows with prompt length."""
+        assert estimate_tokens("word " * 100) > estimate_tokens("word " * 10) > 0
+
+    def test_completion_scales_with_verdicts(self):
+        """Test that batched replies reserve room for every verdict."""
+        assert completion_tokens(1) >= 32
+        assert completion_tokens(8) - completion_tokens(1) == 7 * (
+            completion_tokens(2) - completion_tokens(1)
+        )
+        assert estimate_tokens("word", max_tokens=500) == estimate_tokens("word", 0) + 500
+
+
+class TestRequestScheduler:
+    """Test retries, budget and metrics with a fake clock."""
+
+    def failing(self, errors, result="ok"):
+        errors = list(errors)
+
+        def fn():
+            if errors:
+                raise errors.pop(0)
+            return result
+
+        return fn
+
+    def test_retries_until_success(self):
+        """Test that transient errors are retried and counted."""
+        clock = FakeClock()
+        scheduler = RequestScheduler(base_delay=1, clock=clock, seed=0)
+        fn = self.failing([status_error(InternalServerError, 500)] * 2)
+        assert scheduler.call(fn, sleep=clock.sleep) == "ok"
+        stats = scheduler.stats()
+        assert stats["requests"] == 3
+        assert stats["retries"] == 2
+        assert stats["fallbacks"] == 0
+
+    def test_backoff_is_capped_exponential(self):
+        """Test that each backoff stays within base * 2**n and max_delay."""
+        clock = FakeClock()
+        scheduler = RequestScheduler(base_delay=1, max_delay=3, max_retries=4, clock=clock, seed=1)
+        fn = self.failing([status_error(InternalServerError, 500)] * 4)
+        scheduler.call(fn, sleep=clock.sleep)
+        for attempt, slept in enumerate(clock.sleeps):
+            assert 0 <= slept <= min(3, 2 ** attempt)
+
+    def test_retry_after_sets_floor_and_pauses(self):
+        """Test that Retry-After is a lower bound and holds off other callers."""
+        clock = FakeClock()
+        scheduler = RequestScheduler(base_delay=0.001, clock=clock, seed=0)
+        fn = self.failing([status_error(RateLimitError, 429, {"retry-after": "5"})])
+        scheduler.call(fn, sleep=clock.sleep)
+        assert clock.sleeps[0] >= 5
+        assert scheduler.stats()["rate_limited"] == 1
+        clock.now = 1.0  # another caller arriving during the pause
+        assert scheduler._admission_delay(0) == pytest.approx(clock.sleeps[0] - 1.0)
+
+    def test_gives_up_and_reraises(self):
+        """Test that exhausting max_retries re-raises and counts a fallback."""
+        clock = FakeClock()
+        scheduler = RequestScheduler(max_retries=1, clock=clock, seed=0)
+        fn = self.failing([status_error(RateLimitError, 429)] * 5)
+        with pytest.raises(RateLimitError):
+            scheduler.call(fn, sleep=clock.sleep)
+        assert scheduler.stats()["fallbacks"] == 1
+        assert scheduler.stats()["requests"] == 2
+
+    def test_retry_budget_shared_across_calls(self):
+        """Test that the retry budget caps retries over all calls."""
+        clock = FakeClock()
+        scheduler = RequestScheduler(retry_budget=2, clock=clock, seed=0)
+        for _ in range(3):
+            fn = self.failing([status_error(InternalServerError, 500)] * 2)
+            try:
+                scheduler.call(fn, sleep=clock.sleep)
+            except InternalServerError:
+                pass
+        stats = scheduler.stats()
+        assert stats["retries"] == 2
+        assert stats["budget_exhausted"] == 2
+
+    def test_non_retryable_raises_immediately(self):
+        """Test that client errors are not retried."""
+        clock = FakeClock()
+        scheduler = RequestScheduler(clock=clock)
+        with pytest.raises(BadRequestError):
+            scheduler.call(self.failing([status_error(BadRequestError, 400)]), sleep=clock.sleep)
+        assert clock.sleeps == []
+
+    def test_pacing_spreads_requests(self):
+        """Test that the requests/min bucket delays bursts."""
+        clock = FakeClock()
+        scheduler = RequestScheduler(requests_per_minute=60, clock=clock)
+        for _ in range(3):
+            scheduler.call(lambda: "ok", sleep=clock.sleep)
+        assert clock.now == pytest.approx(2.0)
+        assert scheduler.stats()["pacing_wait_s"] == pytest.approx(2.0)
+
+    def test_token_pacing(self):
+        """Test that the tokens/min bucket delays large prompts."""
+        clock = FakeClock()
+        scheduler = RequestScheduler(tokens_per_minute=600, clock=clock)  # 10/s, burst 50
+        scheduler.call(lambda: "ok", tokens=50, sleep=clock.sleep)
+        scheduler.call(lambda: "ok", tokens=20, sleep=clock.sleep)
+        assert clock.now == pytest.approx(2.0)
@@ -0,0 +1,56 @@
+"""Unit tests for retrieval.sqlite_cache module."""
+import sqlite3
+
+import pytest
+from retrieval.sqlite_cache import SQLiteCache
+
+
+class NoteCache(SQLiteCache):
+    """Smallest subclass: a text note per key."""
+
+    table = "notes"
+    columns = "note TEXT NOT NULL"
+
+    def put(self, key, note, used):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO notes (key, note, last_used) VALUES (?, ?, ?)",
+                (key, note, used),
+            )
+            self._evict()
+            self._conn.commit()
+
+
+class TestSQLiteCache:
+    """Test the table setup, eviction and bookkeeping shared by the caches."""
+
+    def test_creates_directory_and_table(self, tmp_path):
+        """Test that the file's directory and table are created."""
+        path = tmp_path / "nested" / "notes.sqlite"
+        cache = NoteCache(str(path))
+        cache.put("a", "x", 1)
+        cache.close()
+        assert sqlite3.connect(path).execute("SELECT note FROM notes").fetchall() == [("x",)]
+
+    def test_evicts_least_recently_used(self):
+        """Test that rows beyond max_entries go oldest last_used first."""
+        cache = NoteCache(":memory:", max_entries=2)
+        for used, key in enumerate("abc"):
+            cache.put(key, key, used)
+        assert len(cache) == 2
+        keys = cache._conn.execute("SELECT key FROM notes ORDER BY key").fetchall()
+        assert keys == [("b",), ("c",)]
+
+    def test_stats_and_clear(self):
+        """Test that stats report the entries and counters, and clear empties the table."""
+        cache = NoteCache(":memory:")
+        cache.put("a", "x", 1)
+        cache.hits, cache.misses = 3, 1
+        assert cache.stats() == {"entries": 1, "hits": 3, "misses": 1, "hit_rate": 0.75}
+        cache.clear()
+        assert len(cache) == 0
+
+    def test_rejects_non_positive_max_entries(self):
+        """Test that max_entries must be positive."""
+        with pytest.raises(ValueError):
+            NoteCache(":memory:", max_entries=0)
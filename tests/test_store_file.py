@@ -0,0 +1,140 @@
+"""Unit tests for retrieval.store_file module."""
+import os
+
+import numpy as np
+import pytest
+from retrieval.store_file import (
+    chunks_fingerprint,
+    prune_stores,
+    read_header,
+    read_sources,
+    read_store,
+    write_store,
+)
+
+
+class TestStoreFileRoundtrip:
+    """Test writing and memory-mapping store files."""
+
+    def test_roundtrip(self, tmp_path):
+        """Test that chunks and embeddings survive a save/load cycle."""
+        path = str(tmp_path / "book.store")
+        chunks = ["first chunk", "second chunk — with ünïcode", ""]
+        embeddings = np.random.default_rng(0).random((3, 8), dtype=np.float32)
+        write_store(path, chunks, embeddings, "model-x")
+        loaded_chunks, loaded, header = read_store(path)
+        assert loaded_chunks == chunks
+        assert np.array_equal(loaded, embeddings)
+        assert header["model"] == "model-x"
+
+    def test_matrix_is_memory_mapped(self, tmp_path):
+        """Test that the matrix is a read-only memmap."""
+        path = str(tmp_path / "book.store")
+        write_store(path, ["a", "b"], np.ones((2, 4), dtype=np.float32), "m")
+        _, loaded, _ = read_store(path)
+        assert isinstance(loaded, np.memmap)
+        assert not loaded.flags.writeable
+
+    def test_matrix_is_aligned(self, tmp_path):
+        """Test that the matrix section starts on an aligned offset."""
+        path = str(tmp_path / "book.store")
+        write_store(path, ["a"], np.ones((1, 4), dtype=np.float32), "m")
+        assert read_header(path)["matrix_offset"] % 64 == 0
+
+    def test_empty_store(self, tmp_path):
+        """Test that an empty store round-trips."""
+        path = str(tmp_path / "empty.store")
+        write_store(path, [], np.empty((0, 4), dtype=np.float32), "m")
+        chunks, loaded, _ = read_store(path)
+        assert chunks == []
+        assert loaded.shape == (0, 4)
+
+
+class TestStoreFileSources:
+    """Test source tags saved with the chunks."""
+
+    def test_sources_roundtrip(self, tmp_path):
+        """Test that per-chunk tags come back in order, runs compressed."""
+        path = str(tmp_path / "corpus.store")
+        sources = ["a.txt", "a.txt", None, "b.txt", "a.txt"]
+        write_store(path, list("vwxyz"), np.ones((5, 4), dtype=np.float32), "m", sources)
+        header = read_header(path)
+        assert len(header["sources"]) == 4
+        assert read_sources(header) == sources
+
+    def test_untagged_store(self, tmp_path):
+        """Test that stores without tags read back as untagged chunks."""
+        path = str(tmp_path / "book.store")
+        write_store(path, ["a", "b"], np.ones((2, 4), dtype=np.float32), "m", [None, None])
+        header = read_header(path)
+        assert "sources" not in header
+        assert read_sources(header) == [None, None]
+
+    def test_sources_length_mismatch(self, tmp_path):
+        """Test that a tag list of the wrong length is rejected."""
+        with pytest.raises(ValueError):
+            write_store(str(tmp_path / "x.store"), ["a"], np.ones((1, 4)), "m", ["s", "t"])
+
+
+class TestStoreFileErrors:
+    """Test rejection of bad input."""
+
+    def test_shape_mismatch(self, tmp_path):
+        """Test that a matrix with the wrong row count is rejected."""
+        with pytest.raises(ValueError):
+            write_store(str(tmp_path / "x.store"), ["a"], np.ones((2, 4)), "m")
+
+    def test_truncated_header(self, tmp_path):
+        """Test that a file cut inside its header raises ValueError."""
+        path = str(tmp_path / "book.store")
+        write_store(path, ["a"], np.ones((1, 4), dtype=np.float32), "m")
+        with open(path, "r+b") as f:
+            f.truncate(10)
+        with pytest.raises(ValueError):
+            read_header(path)
+
+    def test_truncated_text(self, tmp_path):
+        """Test that a file missing chunk text raises ValueError."""
+        path = tmp_path / "book.store"
+        write_store(str(path), ["some text"], np.ones((1, 4), dtype=np.float32), "m")
+        path.write_bytes(path.read_bytes()[:-3])
+        with pytest.raises(ValueError):
+            read_store(str(path))
+
+    def test_not_a_store_file(self, tmp_path):
+        """Test that foreign files are rejected."""
+        path = tmp_path / "other.bin"
+        path.write_bytes(b"not a store at all")
+        with pytest.raises(ValueError):
+            read_header(str(path))
+
+
+class TestChunksFingerprint:
+    """Test chunk fingerprinting."""
+
+    def test_boundaries_matter(self):
+        """Test that moving a chunk boundary changes the fingerprint."""
+        assert chunks_fingerprint(["ab", "c"]) != chunks_fingerprint(["a", "bc"])
+
+    def test_deterministic(self):
+        """Test that equal chunk lists share a fingerprint."""
+        assert chunks_fingerprint(["a", "b"]) == chunks_fingerprint(["a", "b"])
+
+
+class TestPruneStores:
+    """Test capping a directory of store files."""
+
+    def test_keeps_most_recent(self, tmp_path):
+        """Test that only the newest keep store files survive, other files untouched."""
+        for age, name in enumerate(["new.store", "mid.store", "old.store"]):
+            path = tmp_path / name
+            path.write_bytes(b"x")
+            os.utime(path, (1000 - age, 1000 - age))
+        (tmp_path / "notes.txt").write_text("keep me")
+        removed = prune_stores(str(tmp_path), keep=2)
+        assert removed == [str(tmp_path / "old.store")]
+        assert sorted(os.listdir(tmp_path)) == ["mid.store", "new.store", "notes.txt"]
+
+    def test_missing_directory(self, tmp_path):
+        """Test that a directory not created yet prunes nothing."""
+        assert prune_stores(str(tmp_path / "absent"), keep=1) == []
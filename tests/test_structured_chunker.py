@@ -0,0 +1,140 @@
+"""Unit tests for ingestion.structured_chunker module."""
+import pytest
+from ingestion.structured_chunker import StructuredChunk, chunk_structured
+
+BOOK = """Front matter of the book.
+
+CHAPTER I.
+
+THE SHARK.
+
+On the 26th of July, 1864, a yacht was steaming through the waves. The flag
+of England fluttered at her yard-arm, bearing the initials E. G. in gold.
+
+Lord Glenarvan was on board. "Is it a shark?" he asked.
+
+CHAPTER II.
+
+THE THREE DOCUMENTS.
+
+Mr. Grant was lost at sea. Nobody knew where.
+"""
+
+
+class TestChunkStructuredBasic:
+    """Test sentence packing."""
+
+    def test_whole_sentences_only(self):
+        """Test that every chunk starts and ends on a sentence boundary."""
+        for chunk in chunk_structured(BOOK, chunk_size=15, overlap=0):
+            assert chunk.text[0].isupper() or chunk.text[0] in "\"["
+            assert chunk.text.endswith((".", "?", '"'))
+
+    def test_respects_chunk_size(self):
+        """Test that no chunk exceeds the token budget."""
+        for chunk in chunk_structured(BOOK, chunk_size=12, overlap=0):
+            assert len(chunk.text.split()) <= 12
+
+    def test_offsets_locate_chunks(self):
+        """Test that start/end slice each chunk's text out of the source."""
+        for chunk in chunk_structured(BOOK, chunk_size=20, overlap=5):
+            assert " ".join(BOOK[chunk.start:chunk.end].split()) == chunk.text
+
+    def test_abbreviations_do_not_split(self):
+        """Test that initials and titles stay inside their sentence."""
+        texts = [c.text for c in chunk_structured(BOOK, chunk_size=1000, overlap=0)]
+        assert any("initials E. G. in gold." in t for t in texts)
+        assert any(t.startswith("THE THREE DOCUMENTS. Mr. Grant") for t in texts)
+
+    def test_custom_counter(self):
+        """Test that a token counter other than words sets the budget."""
+        # Characters plus the space that joins a sentence to the next.
+        chunks = chunk_structured(BOOK, chunk_size=60, overlap=0, count=lambda s: len(s) + 1)
+        assert all(len(c.text) < 60 for c in chunks)
+
+
+class TestChunkStructuredStructure:
+    """Test chapter and paragraph tracking."""
+
+    def test_chapters_recorded(self):
+        """Test chapter indices, with 0 before the first heading."""
+        chunks = chunk_structured(BOOK, chunk_size=1000, overlap=0)
+        assert [c.chapter for c in chunks] == [0, 1, 2]
+        assert chunks[0].text == "Front matter of the book."
+
+    def test_headings_dropped_and_never_crossed(self):
+        """Test that headings are not chunk text and chunks stay in one chapter."""
+        chunks = chunk_structured(BOOK, chunk_size=1000, overlap=50)
+        assert not any("CHAPTER" in c.text for c in chunks)
+        assert chunks[1].text.startswith("THE SHARK.")
+        assert chunks[2].text.startswith("THE THREE DOCUMENTS.")
+
+    def test_paragraph_index(self):
+        """Test that each chunk records the paragraph it starts in."""
+        chunks = chunk_structured(BOOK, chunk_size=1000, overlap=0)
+        assert [c.paragraph for c in chunks] == [0, 2, 6]
+
+    @pytest.mark.parametrize(
+        "heading", ["CHAPTER IV.", "Chapter 4", "Part II: The Voyage", "BOOK 3 - Home"]
+    )
+    def test_heading_shapes(self, heading):
+        """Test that each accepted heading form starts a chapter."""
+        chunks = chunk_structured(f"Before.\n\n{heading}\n\nAfter.", chunk_size=100)
+        assert [(c.text, c.chapter) for c in chunks] == [("Before.", 0), ("After.", 1)]
+
+    @pytest.mark.parametrize(
+        "line",
+        [
+            "Part I did not go well.",
+            "Book it now.",
+            "Chapter in her life was over.",
+            "chapter iv",
+            "Volume 2 of the letters was lost.",
+        ],
+    )
+    def test_prose_is_not_a_heading(self, line):
+        """Test that a paragraph starting with a heading keyword stays text."""
+        chunks = chunk_structured(f"Before.\n\n{line}\n\nAfter.", chunk_size=100)
+        assert [c.chapter for c in chunks] == [0]
+        assert line in chunks[0].text
+
+    def test_returns_named_tuples(self):
+        """Test the chunk record type."""
+        chunk = chunk_structured("One sentence here.")[0]
+        assert chunk == StructuredChunk("One sentence here.", 0, 18, 0, 0)
+
+
+class TestChunkStructuredEdgeCases:
+    """Test overlap, oversized sentences and empty input."""
+
+    def test_overlap_repeats_trailing_sentences(self):
+        """Test that the next chunk starts with the previous chunk's last sentence."""
+        text = " ".join(f"Sentence number {i} is here." for i in range(10))
+        chunks = chunk_structured(text, chunk_size=10, overlap=5)
+        for previous, chunk in zip(chunks, chunks[1:]):
+            last = previous.text.rsplit(". ", 1)[-1]
+            assert chunk.text.startswith(last.rstrip(".") + ".")
+        assert chunks[-1].text.endswith("Sentence number 9 is here.")
+
+    def test_overlap_never_stalls(self):
+        """Test that overlap as large as the chunk still makes progress."""
+        text = " ".join(f"Word {i} ends." for i in range(20))
+        chunks = chunk_structured(text, chunk_size=6, overlap=6)
+        assert chunks[-1].text.endswith("Word 19 ends.")
+        assert len(chunks) < 20
+
+    def test_oversized_sentence_split(self):
+        """Test that a sentence longer than the budget is cut between words."""
+        text = " ".join(["word"] * 25) + "."
+        chunks = chunk_structured(text, chunk_size=10, overlap=0)
+        assert [len(c.text.split()) for c in chunks] == [10, 10, 5]
+
+    def test_empty_text(self):
+        """Test that blank input gives no chunks."""
+        assert chunk_structured("") == []
+        assert chunk_structured(" \n\n\t ") == []
+
+    def test_invalid_chunk_size(self):
+        """Test that a non-positive chunk size is rejected."""
+        with pytest.raises(ValueError):
+            chunk_structured("a b", chunk_size=0)
@@ -90,3 +90,19 @@ class TestBuildTimelineConsistency:
         timeline = build_timeline(evidence)
         for i, entry in enumerate(timeline):
             assert entry["event"] == evidence[i]
+
+
+class TestBuildTimelinePositions:
+    """Test ordering events by their place in the story."""
+
+    def test_ordered_by_position(self):
+        """Test that events are sorted by story offset and keep it."""
+        timeline = build_timeline(["late", "early", "middle"], positions=[900, 10, 450])
+        assert [e["event"] for e in timeline] == ["early", "middle", "late"]
+        assert [e["position"] for e in timeline] == [10, 450, 900]
+        assert [e["time"] for e in timeline] == ["event_0", "event_1", "event_2"]
+
+    def test_misaligned_positions(self):
+        """Test that positions must match the evidence."""
+        with pytest.raises(ValueError):
+            build_timeline(["a", "b"], positions=[1])
@@ -0,0 +1,26 @@
+"""Unit tests for reasoning.token_counter module."""
+from reasoning.token_counter import count_tokens
+
+
+class TestCountTokens:
+    """Test token counting."""
+
+    def test_empty(self):
+        """Test that empty text has no tokens."""
+        assert count_tokens("") == 0
+
+    def test_grows_with_text(self):
+        """Test that more text means more tokens."""
+        assert count_tokens("one two three four") > count_tokens("one two") > 0
+
+    def test_heuristic_counts_words_and_punctuation(self):
+        """Test the fallback estimate on a known sentence."""
+        # 10 words * 1.3 rounds to 13, plus one full stop.
+        text = "The quick brown fox jumps over the lazy sleeping dog."
+        assert count_tokens(text, model=None) == 14
+
+    def test_close_to_words_for_prose(self):
+        """Test that counts stay in the usual tokens-per-word range."""
+        text = "Captain Grant was lost at sea with the Britannia in eighteen sixty-two. " * 20
+        words = len(text.split())
+        assert words <= count_tokens(text) <= 2 * words
@@ -0,0 +1,90 @@
+"""Unit tests for reasoning.validation_cache module."""
+import time
+
+import pytest
+from reasoning.validation_cache import ValidationCache, validation_key
+
+
+class TestValidationKey:
+    """Test content addressing."""
+
+    def test_key_is_deterministic(self):
+        """Test that the same inputs give the same key."""
+        assert validation_key("m", 0, "prompt") == validation_key("m", 0, "prompt")
+
+    def test_key_depends_on_model_temperature_and_prompt(self):
+        """Test that model, temperature and prompt all change the key."""
+        base = validation_key("m", 0, "prompt")
+        assert validation_key("other", 0, "prompt") != base
+        assert validation_key("m", 0.7, "prompt") != base
+        assert validation_key("m", 0, "prompt!") != base
+
+    def test_int_and_float_temperature_match(self):
+        """Test that 0 and 0.0 address the same entry."""
+        assert validation_key("m", 0, "p") == validation_key("m", 0.0, "p")
+
+
+class TestValidationCacheBasic:
+    """Test storing and retrieving labels."""
+
+    def test_roundtrip(self, tmp_path):
+        """Test that a stored label survives reopening the file."""
+        path = str(tmp_path / "val.sqlite")
+        cache = ValidationCache(path)
+        cache.put("k", "support")
+        cache.close()
+        assert ValidationCache(path).get("k") == "support"
+
+    def test_missing_key(self):
+        """Test that an unknown key returns None."""
+        assert ValidationCache(":memory:").get("nope") is None
+
+    def test_hit_miss_counts(self):
+        """Test that lookups are counted as hits and misses."""
+        cache = ValidationCache(":memory:")
+        cache.put("a", "neutral")
+        cache.get("a")
+        cache.get("b")
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+        assert stats["entries"] == 1
+
+    def test_clear(self):
+        """Test that clear empties the cache."""
+        cache = ValidationCache(":memory:")
+        cache.put("a", "support")
+        cache.clear()
+        assert len(cache) == 0
+
+
+class TestValidationCacheEviction:
+    """Test size and age limits."""
+
+    def test_lru_eviction(self):
+        """Test that the least recently used label is evicted first."""
+        cache = ValidationCache(":memory:", max_entries=2)
+        cache.put("a", "support")
+        cache.put("b", "support")
+        cache.get("a")
+        cache.put("c", "support")
+        assert len(cache) == 2
+        assert cache.get("b") is None
+        assert cache.get("a") == "support"
+
+    def test_ttl_expiry(self):
+        """Test that labels older than ttl are treated as misses."""
+        cache = ValidationCache(":memory:", ttl=0.05)
+        cache.put("a", "support")
+        assert cache.get("a") == "support"
+        time.sleep(0.1)
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_invalid_limits(self):
+        """Test that non-positive limits are rejected."""
+        with pytest.raises(ValueError):
+            ValidationCache(":memory:", max_entries=0)
+        with pytest.raises(ValueError):
+            ValidationCache(":memory:", ttl=0)
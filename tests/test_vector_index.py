@@ -0,0 +1,366 @@
+"""Unit tests for retrieval.vector_index module."""
+import numpy as np
+import pytest
+from retrieval.quantization import fit_scale
+from retrieval.vector_index import ExactIndex, HierarchicalIndex, IVFIndex, make_index, top_k_indices
+
+
+def _unit_rows(n, dim=16, seed=0):
+    rows = np.random.default_rng(seed).standard_normal((n, dim)).astype(np.float32)
+    return rows / np.linalg.norm(rows, axis=1, keepdims=True)
+
+
+class TestTopKIndices:
+    """Test partial top-k selection."""
+
+    def test_matches_full_sort(self):
+        """Test that partial selection equals a full argsort prefix."""
+        scores = np.random.default_rng(1).random(100)
+        assert list(top_k_indices(scores, 7)) == list(np.argsort(-scores)[:7])
+
+    def test_k_larger_than_n(self):
+        """Test that k is capped at the number of scores."""
+        assert len(top_k_indices(np.array([0.1, 0.2]), 5)) == 2
+
+    def test_k_zero(self):
+        """Test that k=0 selects nothing."""
+        assert len(top_k_indices(np.array([0.1, 0.2]), 0)) == 0
+
+
+class TestExactIndex:
+    """Test the brute-force backend."""
+
+    def test_finds_itself(self):
+        """Test that each vector is its own nearest neighbour."""
+        data = _unit_rows(50)
+        index = ExactIndex()
+        index.build(data)
+        for i, (ids, scores) in enumerate(index.search(data[:5], 3)):
+            assert ids[0] == i
+            assert scores[0] == pytest.approx(1.0, abs=1e-5)
+
+
+class TestIVFIndex:
+    """Test the approximate inverted-file backend."""
+
+    def test_full_probe_equals_exact(self):
+        """Test that probing every list gives exact results."""
+        data, queries = _unit_rows(300), _unit_rows(10, seed=2)
+        exact = ExactIndex()
+        exact.build(data)
+        ivf = IVFIndex(n_lists=8, n_probe=8)
+        ivf.build(data)
+        for (e_ids, _), (a_ids, _) in zip(exact.search(queries, 5), ivf.search(queries, 5)):
+            assert list(e_ids) == list(a_ids)
+
+    def test_lists_cover_every_row_once(self):
+        """Test that the inverted lists partition the rows."""
+        ivf = IVFIndex(n_lists=10)
+        ivf.build(_unit_rows(200))
+        assert sorted(ivf.list_rows.tolist()) == list(range(200))
+        assert ivf.list_offsets[-1] == 200
+
+    def test_reasonable_recall(self):
+        """Test that a partial probe still finds most true neighbours."""
+        data, queries = _unit_rows(1000), _unit_rows(20, seed=3)
+        exact = ExactIndex()
+        exact.build(data)
+        ivf = IVFIndex(n_lists=16, n_probe=8)
+        ivf.build(data)
+        hits = sum(
+            len(set(e_ids) & set(a_ids))
+            for (e_ids, _), (a_ids, _) in zip(exact.search(queries, 10), ivf.search(queries, 10))
+        )
+        assert hits / (20 * 10) > 0.5
+
+    def test_empty(self):
+        """Test that an empty index returns empty results."""
+        ivf = IVFIndex()
+        ivf.build(np.empty((0, 4), dtype=np.float32))
+        ids, scores = ivf.search(_unit_rows(1, dim=4), 3)[0]
+        assert len(ids) == 0
+
+    def test_invalid_params(self):
+        """Test that non-positive parameters are rejected."""
+        with pytest.raises(ValueError):
+            IVFIndex(n_probe=0)
+        with pytest.raises(ValueError):
+            IVFIndex(n_lists=0)
+
+
+class TestHierarchicalIndex:
+    """Test coarse-to-fine search over labelled groups of rows."""
+
+    @staticmethod
+    def _clustered(chapters=8, paragraphs=5, rows=6, dim=32, seed=0):
+        """Rows near their paragraph's centre, paragraphs near their chapter's."""
+        rng = np.random.default_rng(seed)
+        data, chapter_ids, paragraph_ids = [], [], []
+        for c, centre in enumerate(rng.standard_normal((chapters, dim))):
+            for p in range(paragraphs):
+                middle = centre + 0.5 * rng.standard_normal(dim)
+                data.append(middle + 0.3 * rng.standard_normal((rows, dim)))
+                chapter_ids += [c] * rows
+                paragraph_ids += [p] * rows  # numbered within each chapter
+        data = np.vstack(data).astype(np.float32)
+        return data / np.linalg.norm(data, axis=1, keepdims=True), chapter_ids, paragraph_ids
+
+    def test_full_beam_equals_exact(self):
+        """Test that keeping every group gives exact results."""
+        data, chapters, paragraphs = self._clustered()
+        queries = _unit_rows(10, dim=32, seed=2)
+        exact = ExactIndex()
+        exact.build(data)
+        index = HierarchicalIndex([chapters, paragraphs], beams=[8, 40])
+        index.build(data)
+        for (e_ids, e_scores), (h_ids, h_scores) in zip(exact.search(queries, 5), index.search(queries, 5)):
+            assert list(h_ids) == list(e_ids)
+            assert np.allclose(h_scores, e_scores)
+
+    def test_narrow_beam_scans_less(self):
+        """Test that a narrow beam still finds each row while scoring fewer vectors."""
+        data, chapters, paragraphs = self._clustered()
+        index = HierarchicalIndex([chapters, paragraphs], beams=[2, 2])
+        index.build(data)
+        results = index.search(data[::7], 1)
+        assert [ids[0] for ids, _ in results] == list(range(0, len(data), 7))
+        assert index.scored < len(results) * len(data) / 4
+
+    def test_paragraph_labels_nest_in_chapters(self):
+        """Test that equal paragraph numbers in different chapters are different groups."""
+        data, chapters, paragraphs = self._clustered(chapters=3, paragraphs=2)
+        index = HierarchicalIndex([chapters, paragraphs])
+        index.build(data)
+        assert [c.shape[0] for c in index.centroids] == [3, 6]
+
+    def test_beam_widens_to_top_k(self):
+        """Test that small groups are added until top_k rows are reachable."""
+        data, chapters, paragraphs = self._clustered(rows=2)
+        index = HierarchicalIndex([chapters, paragraphs], beams=1)
+        index.build(data)
+        ids, _ = index.search(data[:1], 7)[0]
+        assert len(set(ids.tolist())) == 7
+
+    def test_unlabelled_rows_are_searchable(self):
+        """Test that rows appended after the labels still get found."""
+        data, chapters, paragraphs = self._clustered()
+        extra = _unit_rows(3, dim=32, seed=9)
+        index = HierarchicalIndex([chapters, paragraphs], beams=2)
+        index.refresh(np.vstack([data, extra]))
+        ids, _ = index.search(extra[1:2], 1)[0]
+        assert ids[0] == len(data) + 1
+
+    def test_unlabelled_rows_share_one_group(self):
+        """Test that rows past the labels form a single extra group per level."""
+        data, chapters, paragraphs = self._clustered(chapters=3, paragraphs=2)
+        index = HierarchicalIndex([chapters, paragraphs])
+        index.build(np.vstack([data, _unit_rows(5, dim=32, seed=9)]))
+        assert [c.shape[0] for c in index.centroids] == [4, 7]
+        assert index.sizes[0][0] == 5  # label -1 sorts first
+
+    def test_refresh_drops_removed_labels(self):
+        """Test that removing rows keeps every later row in its own group."""
+        data, chapters, paragraphs = self._clustered(chapters=3, paragraphs=2, rows=2)
+        index = HierarchicalIndex([chapters, paragraphs], beams=1)
+        index.build(data)
+        removed = np.array([0, 1, 5])  # all of chapter 0, paragraph 0, and one more row
+        keep = np.setdiff1d(np.arange(len(data)), removed)
+        index.refresh(data[keep], removed=removed)
+        assert index.levels[0].tolist() == [chapters[i] for i in keep]
+        assert index.levels[1].tolist() == [paragraphs[i] for i in keep]
+        fresh = HierarchicalIndex(
+            [[chapters[i] for i in keep], [paragraphs[i] for i in keep]], beams=1
+        )
+        fresh.build(data[keep])
+        for mine, theirs in zip(index.search(data[keep], 2), fresh.search(data[keep], 2)):
+            assert mine[0].tolist() == theirs[0].tolist()
+
+    def test_too_many_labels(self):
+        """Test that labels for more rows than the matrix holds are rejected."""
+        index = HierarchicalIndex([[0, 0, 1]])
+        with pytest.raises(ValueError):
+            index.build(_unit_rows(2))
+
+    def test_empty(self):
+        """Test that an empty index returns empty results."""
+        index = HierarchicalIndex([[]])
+        index.build(np.empty((0, 4), dtype=np.float32))
+        ids, _ = index.search(_unit_rows(1, dim=4), 3)[0]
+        assert len(ids) == 0
+
+    def test_invalid_params(self):
+        """Test that missing levels and bad beams are rejected."""
+        with pytest.raises(ValueError):
+            HierarchicalIndex([])
+        with pytest.raises(ValueError):
+            HierarchicalIndex([[0], [0]], beams=[2])
+        with pytest.raises(ValueError):
+            HierarchicalIndex([[0]], beams=0)
+
+
+class TestMakeIndex:
+    """Test backend selection by name."""
+
+    def test_known_names(self):
+        """Test that registered names build the right backend."""
+        assert isinstance(make_index("exact"), ExactIndex)
+        assert isinstance(make_index("ivf", n_probe=2), IVFIndex)
+
+    def test_unknown_name(self):
+        """Test that unknown names raise ValueError."""
+        with pytest.raises(ValueError):
+            make_index("hnsw")
+
+
+class TestIVFIndexRefresh:
+    """Test re-bucketing after corpus changes."""
+
+    def test_refresh_keeps_centroids_for_small_changes(self):
+        """Test that small edits reuse the trained centroids."""
+        data = _unit_rows(200)
+        ivf = IVFIndex(n_lists=8, n_probe=8)
+        ivf.build(data)
+        centroids = ivf.centroids
+        ivf.refresh(np.vstack([data, _unit_rows(10, seed=5)]))
+        assert ivf.centroids is centroids
+        ids, _ = ivf.search(data[:1], 300)[0]
+        assert sorted(ids.tolist()) == list(range(210))
+
+    @pytest.mark.parametrize("precision", ["float32", "int8"])
+    def test_refresh_assigns_only_changed_rows(self, precision, monkeypatch):
+        """Test that edits assign and encode only new and changed rows, matching a full scan."""
+        import retrieval.vector_index as vector_index
+
+        data = _unit_rows(400)
+        ivf = IVFIndex(n_lists=8, n_probe=8, precision=precision, rerank=4)
+        ivf.build(data)
+        assigned, encoded = [], []
+        assign, encode = vector_index._assign, vector_index.encode
+        monkeypatch.setattr(
+            vector_index, "_assign", lambda m, c: assigned.append(len(m)) or assign(m, c)
+        )
+        monkeypatch.setattr(
+            vector_index, "encode", lambda m, *a: encoded.append(len(m)) or encode(m, *a)
+        )
+        data = np.vstack([data, data[:5][:, ::-1]])  # new rows within the int8 range
+        ivf.refresh(data)
+        keep = np.setdiff1d(np.arange(len(data)), [3, 100, 402])
+        data = data[keep]
+        ivf.refresh(data, removed=np.array([3, 100, 402]))
+        data = data.copy()
+        data[7] = data[8]
+        ivf.refresh(data, changed=np.array([7]))
+        assert assigned == [5, 1] and encoded == [5, 1]
+
+        exact = ExactIndex()
+        exact.build(data)
+        queries = _unit_rows(10, seed=3)
+        for (e_ids, _), (i_ids, _) in zip(exact.search(queries, 5), ivf.search(queries, 5)):
+            assert set(i_ids.tolist()) == set(e_ids.tolist())
+        ids, _ = ivf.search(data[:1], 1000)[0]
+        assert sorted(ids.tolist()) == list(range(len(data)))
+
+    def test_regroup_drops_dead_entries(self):
+        """Test that many edits are folded back into the lists."""
+        data = _unit_rows(100)
+        ivf = IVFIndex(n_lists=4, n_probe=4)
+        ivf.build(data)
+        for _ in range(3):  # the third leaves 30 dead entries, over a quarter of 100
+            data = data[10:]
+            ivf.refresh(data, removed=np.arange(10))
+        assert len(ivf.list_rows) == ivf.list_offsets[-1] == 70
+        assert sorted(ivf.list_rows.tolist()) == list(range(70))
+
+    def test_refresh_retrains_after_doubling(self):
+        """Test that a doubled corpus retrains the centroids."""
+        ivf = IVFIndex(n_lists=8)
+        ivf.build(_unit_rows(100))
+        centroids = ivf.centroids
+        ivf.refresh(_unit_rows(300, seed=6))
+        assert ivf.centroids is not centroids
+        assert ivf.trained_size == 300
+
+
+class TestReducedPrecision:
+    """Test compressed storage in the index backends."""
+
+    @pytest.mark.parametrize("precision", ["float16", "int8"])
+    def test_exact_top1_agrees_with_float32(self, precision):
+        """Test that compressed scans still find each vector itself."""
+        data = _unit_rows(300, dim=64)
+        index = ExactIndex(precision=precision)
+        index.build(data)
+        assert index.codes.itemsize < 4
+        for i, (ids, _) in enumerate(index.search(data[:20], 1)):
+            assert ids[0] == i
+
+    def test_rerank_returns_exact_scores(self):
+        """Test that re-ranked results carry full-precision scores."""
+        data, queries = _unit_rows(500, dim=64), _unit_rows(10, seed=4, dim=64)
+        exact = ExactIndex()
+        exact.build(data)
+        index = ExactIndex(precision="int8", rerank=4)
+        index.build(data)
+        for (e_ids, e_scores), (r_ids, r_scores) in zip(exact.search(queries, 5), index.search(queries, 5)):
+            assert list(r_ids) == list(e_ids)
+            assert np.allclose(r_scores, e_scores)
+
+    @pytest.mark.parametrize("precision", ["float16", "int8"])
+    def test_exact_refresh_encodes_only_changes(self, precision, monkeypatch):
+        """Test that edits re-encode only new and changed rows and match a fresh build."""
+        import retrieval.vector_index as vector_index
+
+        data = _unit_rows(300, dim=64)
+        index = ExactIndex(precision=precision)
+        index.build(data)
+        encoded = []
+        encode = vector_index.encode
+        monkeypatch.setattr(
+            vector_index, "encode", lambda m, *a: encoded.append(len(m)) or encode(m, *a)
+        )
+        data = np.vstack([data, -data[:4]])  # new rows within the int8 range
+        index.refresh(data)
+        data = np.delete(data, [0, 150], axis=0)
+        index.refresh(data, removed=np.array([0, 150]))
+        data[10] = data[20]
+        index.refresh(data, changed=np.array([10]))
+        assert sum(encoded) == 5
+
+        assert np.array_equal(index.codes, encode(data, precision, index.scale))
+
+    def test_exact_refresh_refits_outgrown_scale(self):
+        """Test that values far past the int8 range re-quantize every row."""
+        data = _unit_rows(50, dim=8) * 0.1
+        index = ExactIndex(precision="int8")
+        index.build(data)
+        data = np.vstack([data, _unit_rows(1, dim=8, seed=3)])
+        index.refresh(data)
+        assert index.codes.shape == (51, 8)
+        assert np.array_equal(index.scale, fit_scale(data, "int8"))
+
+    @pytest.mark.parametrize("backend", [ExactIndex, IVFIndex])
+    def test_float32_matrix_kept_only_for_rerank(self, backend):
+        """Test that a compressed index without re-ranking holds no float32 rows."""
+        data = _unit_rows(200)
+        plain, reranked = backend(precision="int8"), backend(precision="int8", rerank=2)
+        for index in (plain, reranked):
+            index.build(data)
+            index.refresh(np.vstack([data, -data[:3]]))
+        assert plain.embeddings is None
+        assert reranked.embeddings.shape == (203, 16)
+        ids, _ = plain.search(data[:1], 1)[0]
+        assert ids[0] == 0
+
+    def test_ivf_int8(self):
+        """Test that IVF stores int8 list vectors and still searches."""
+        data = _unit_rows(300)
+        ivf = IVFIndex(n_lists=8, n_probe=8, precision="int8", rerank=2)
+        ivf.build(data)
+        assert ivf.list_vectors.dtype == np.int8
+        ids, _ = ivf.search(data[:1], 1)[0]
+        assert ids[0] == 0
+
+    def test_unknown_precision(self):
+        """Test that unsupported precisions are rejected."""
+        with pytest.raises(ValueError):
+            ExactIndex(precision="bfloat16")
@@ -0,0 +1,131 @@
+"""Unit tests for reasoning.verdict module."""
+import pickle
+
+import numpy as np
+import pytest
+
+from reasoning.verdict import (
+    CONTRADICT,
+    NEUTRAL,
+    SUPPORT,
+    Verdict,
+    confidences,
+    label_codes,
+    parse_confidence,
+    parse_label,
+    parse_verdict,
+)
+
+
+class TestParseLabel:
+    """Test deterministic label normalization."""
+
+    @pytest.mark.parametrize("text, label", [
+        ("support", "support"),
+        ("Supports.", "support"),
+        ("SUPPORTED", "support"),
+        ("entailment", "support"),
+        ("Contradicts", "contradict"),
+        ("contradiction", "contradict"),
+        ("Refuted.", "contradict"),
+        ("inconsistent", "contradict"),
+        ("NEUTRAL", "neutral"),
+        ("Insufficient information", "neutral"),
+        ("The evidence does not support the claim", "neutral"),
+        ("Contradict - it does not support it", "contradict"),
+        ("The evidence does not contradict the claim", "neutral"),
+        ("No contradiction.", "neutral"),
+        ("The claim is not contradicted", "neutral"),
+        ("It doesn't contradict anything", "neutral"),
+        ("I cannot support this claim", "neutral"),
+        ("The passage can't support it", "neutral"),
+    ])
+    def test_variants(self, text, label):
+        """Test that common variants map to their label."""
+        assert parse_label(text) == label
+
+    def test_unknown(self):
+        """Test that text naming no label gives None."""
+        assert parse_label("I am not sure") is None
+        assert parse_label("unsupported") is None
+        assert parse_label(None) is None
+
+
+class TestParseVerdict:
+    """Test parsing replies into verdicts."""
+
+    def test_json_with_confidence(self):
+        """Test the structured reply format."""
+        verdict = parse_verdict('{"label": "CONTRADICT", "confidence": 0.8}')
+        assert verdict == "contradict"
+        assert verdict.confidence == 0.8
+
+    def test_json_percentage(self):
+        """Test that a percentage confidence is scaled to 0-1."""
+        assert parse_verdict('{"label": "support", "confidence": "85%"}').confidence == 0.85
+
+    def test_plain_text(self):
+        """Test that a plain word still parses, without confidence."""
+        verdict = parse_verdict("Supports.")
+        assert verdict == "support"
+        assert verdict.confidence is None
+
+    def test_fallback(self):
+        """Test that unusable or missing replies give the fallback with zero confidence."""
+        for reply in ("no idea", None, ""):
+            verdict = parse_verdict(reply, fallback="neutral")
+            assert verdict == "neutral"
+            assert verdict.confidence == 0.0
+
+    def test_parse_confidence(self):
+        """Test confidence coercion and rejection."""
+        assert parse_confidence(0.5) == 0.5
+        assert parse_confidence("70") == 0.7
+        assert parse_confidence("high") is None
+        assert parse_confidence(True) is None
+        assert parse_confidence(-1) is None
+
+
+class TestVerdict:
+    """Test the Verdict type."""
+
+    def test_behaves_like_label(self):
+        """Test that a verdict equals and hashes like its label."""
+        verdict = Verdict("contradict", 0.9)
+        assert verdict == "contradict"
+        assert {"contradict": 1}[verdict] == 1
+        assert verdict.code == CONTRADICT
+
+    def test_confidence_clamped(self):
+        """Test that confidence is clamped to 0-1."""
+        assert Verdict("support", 1.5).confidence == 1.0
+
+    def test_rejects_unknown_label(self):
+        """Test that only the three labels are allowed."""
+        with pytest.raises(ValueError):
+            Verdict("maybe")
+
+    def test_pickle_roundtrip(self):
+        """Test that verdicts survive pickling with their confidence."""
+        verdict = pickle.loads(pickle.dumps(Verdict("neutral", 0.4)))
+        assert verdict == "neutral" and verdict.confidence == pytest.approx(0.4)
+
+
+class TestArrays:
+    """Test conversion to typed arrays."""
+
+    def test_label_codes(self):
+        """Test codes for labels, verdicts, variants and junk."""
+        codes = label_codes(["support", Verdict("contradict"), "Neutral.", "???"])
+        assert codes.dtype == np.int8
+        assert codes.tolist() == [SUPPORT, CONTRADICT, NEUTRAL, NEUTRAL]
+
+    def test_label_codes_passthrough(self):
+        """Test that an integer code array is returned as int8."""
+        assert label_codes(np.array([1, 0])).dtype == np.int8
+
+    def test_confidences(self):
+        """Test that missing confidences are NaN."""
+        values = confidences([Verdict("support", 0.5), "neutral"])
+        assert values[0] == 0.5
+        assert np.isnan(values[1])